@@ -1,2 +1,7 @@
+from .cycle_states import CycleStates
+from .dump_diagnostics import DumpDiagnostics
+from .link_health import LinkHealth
+from .play_sequence import PlaySequence
+from .select_state_dial import SelectStateDial
 from .set_state import SetState
 from .toggle_state import ToggleState
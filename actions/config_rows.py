@@ -0,0 +1,213 @@
+"""
+GTK config rows for the actions' settings panels.
+
+Kept out of the action modules, and only imported from `get_config_rows`, so
+that loading the plugin doesn't pay for `gi`/GTK/Adwaita until a user actually
+opens a settings panel.
+"""
+
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import gi
+from loguru import logger as log
+
+from gg_kekemui_veadosc.actions.play_sequence import format_steps, parse_steps
+from gg_kekemui_veadosc.data import VeadoSCConnectionConfig
+
+gi.require_version("Gtk", "4.0")
+gi.require_version("Adw", "1")
+from gi.repository import Adw, Gio, Gtk  # noqa: E402, F401
+
+if TYPE_CHECKING:
+    from gg_kekemui_veadosc.actions.action_bases import StateActionBase, VeadoSCActionBase
+    from gg_kekemui_veadosc.actions.cycle_states import CycleStates
+    from gg_kekemui_veadosc.actions.play_sequence import PlaySequence
+
+
+class VeadoGtk:
+
+    def __init__(self, action: "VeadoSCActionBase", config: VeadoSCConnectionConfig, is_connected: bool, lm):
+        self.action = action
+        self.lm = lm
+
+        self.expander = Adw.ExpanderRow(title=self.lm.get("actions.base.gtk.expando.title"))
+
+        self.mode_switch = Adw.SwitchRow(
+            title=self.lm.get("actions.base.gtk.mode_switch.title"),
+            subtitle=self.lm.get("actions.base.gtk.mode_switch.subtitle"),
+        )
+
+        self.last_selected_dir = str(config.instances_dir.expanduser())
+
+        self.instances_expando = Adw.ExpanderRow(title=self.lm.get("actions.base.gtk.smart_expando.title"))
+
+        self.instances_path = Adw.ActionRow()
+        self.instances_path.set_title(self.lm.get("actions.base.gtk.instance_path.title"))
+        self.instances_path.add_css_class("property")
+
+        b = Gtk.Button()
+        b.set_icon_name("folder")
+        b.add_css_class("suggested-action")
+        self.instances_path.add_suffix(b)
+        b.connect("clicked", self.launch_chooser)
+
+        self.instances_expando.add_row(self.instances_path)
+
+        self.direct_expando = Adw.ExpanderRow(title=self.lm.get("actions.base.gtk.direct_expando.title"))
+        self.ip_entry = Adw.EntryRow(title=self.lm.get("actions.base.gtk.ip_entry.title"))
+        self.port_spinner = Adw.SpinRow.new_with_range(0, 65535, 1)
+        self.port_spinner.set_title(self.lm.get("actions.base.gtk.port_spinner.title"))
+
+        self.direct_expando.add_row(self.ip_entry)
+        self.direct_expando.add_row(self.port_spinner)
+
+        self.offline_switch = Adw.SwitchRow(
+            title=self.lm.get("actions.base.gtk.offline_switch.title"),
+            subtitle=self.lm.get("actions.base.gtk.offline_switch.subtitle"),
+        )
+        self.offline_ttl_spinner = Adw.SpinRow.new_with_range(1, 300, 1)
+        self.offline_ttl_spinner.set_title(self.lm.get("actions.base.gtk.offline_ttl_spinner.title"))
+
+        self.expander.add_row(self.mode_switch)
+        self.expander.add_row(self.instances_expando)
+        self.expander.add_row(self.direct_expando)
+        self.expander.add_row(self.offline_switch)
+        self.expander.add_row(self.offline_ttl_spinner)
+
+        self.set_initial_values(config, is_connected)
+        self.connect_signals()
+
+    def launch_chooser(self, *args):
+        dialog = Gtk.FileDialog(title=self.lm.get("actions.base.gtk.filedialog.title"), modal=True)
+        dialog.set_initial_folder(Gio.File.parse_name(self.last_selected_dir))
+
+        dialog.select_folder(parent=None, cancellable=None, callback=self.select_callback)
+
+    def select_callback(self, dialog, result):
+        try:
+            selected_file = dialog.select_folder_finish(result)
+            self.last_selected_dir = selected_file.get_path()
+            self.on_gtk_update()
+            log.error(f"{selected_file.get_path()}")
+            log.error(f"{list(Path(self.last_selected_dir).iterdir())}")
+        except gi.repository.GLib.GError:
+            pass
+
+    def get_config_rows(self) -> list[Adw.PreferencesRow]:
+        return [self.expander]
+
+    def set_initial_values(self, config: VeadoSCConnectionConfig, is_connected: bool):
+        self.expander.set_expanded(not is_connected)
+
+        self.mode_switch.set_active(config.smart_connect)
+
+        self.ip_entry.set_text(config.hostname)
+        self.port_spinner.set_value(config.port)
+
+        self.offline_switch.set_active(config.offline_buffer)
+        self.offline_ttl_spinner.set_value(config.offline_ttl)
+
+        self.update_gtk_model(config)
+
+    def update_gtk_model(self, config: VeadoSCConnectionConfig):
+        self.instances_expando.set_enable_expansion(config.smart_connect)
+        self.instances_expando.set_expanded(config.smart_connect)
+
+        self.instances_path.set_subtitle(self.last_selected_dir)
+
+        self.direct_expando.set_expanded(not config.smart_connect)
+        self.direct_expando.set_enable_expansion(not config.smart_connect)
+
+        self.offline_ttl_spinner.set_sensitive(config.offline_buffer)
+
+    def connect_signals(self):
+        self.mode_switch.connect("notify::active", self.on_gtk_update)
+        self.ip_entry.connect("notify::text", self.on_gtk_update)
+        self.port_spinner.connect("notify::value", self.on_gtk_update)
+        self.offline_switch.connect("notify::active", self.on_gtk_update)
+        self.offline_ttl_spinner.connect("notify::value", self.on_gtk_update)
+
+    def on_gtk_update(self, *args):
+        should_use_smart = self.mode_switch.get_active()
+        path = self.last_selected_dir
+        hostname = self.ip_entry.get_text().strip()
+        port = int(self.port_spinner.get_value())
+
+        config = VeadoSCConnectionConfig(
+            smart_connect=should_use_smart,
+            instances_dir=path,
+            hostname=hostname,
+            port=port,
+            offline_buffer=self.offline_switch.get_active(),
+            offline_ttl=self.offline_ttl_spinner.get_value(),
+        )
+
+        self.action.plugin_base.conn_conf = config
+        self.update_gtk_model(config)
+
+
+class StateGtk:
+    def __init__(self, action: "StateActionBase", lm):
+        self.parent = action
+        self.lm = lm
+
+        self.state_id_entry = Adw.EntryRow(title=self.lm.get("actions.state.gtk.state_id_entry.title"))
+        self.update_states()
+
+    def get_config_rows(self):
+        return [self.state_id_entry]
+
+    def update_states(self):
+        self.state_id_entry.set_text(self.parent.state_id)
+        self.connect_signals()
+
+    def on_gtk_update(self, *args):
+        self.parent.state_id = self.state_id_entry.get_text().strip()
+
+    def disconnect_signals(self):
+        try:
+            self.state_id_entry.disconnect_by_func(self.on_gtk_update)
+        except TypeError:
+            pass
+
+    def connect_signals(self):
+        self.state_id_entry.connect("notify::text", self.on_gtk_update)
+
+
+class CycleGtk:
+    def __init__(self, action: "CycleStates", lm):
+        self.parent = action
+        self.lm = lm
+
+        self.state_ids_entry = Adw.EntryRow(title=self.lm.get("actions.cycle.gtk.state_ids_entry.title"))
+        self.state_ids_entry.set_text(", ".join(self.parent.state_ids))
+        self.state_ids_entry.connect("notify::text", self.on_gtk_update)
+
+    def get_config_rows(self):
+        return [self.state_ids_entry]
+
+    def on_gtk_update(self, *args):
+        self.parent.state_ids = [s.strip() for s in self.state_ids_entry.get_text().split(",") if s.strip()]
+
+
+class SequenceGtk:
+    def __init__(self, action: "PlaySequence", lm):
+        self.parent = action
+        self.lm = lm
+
+        self.steps_entry = Adw.EntryRow(title=self.lm.get("actions.sequence.gtk.steps_entry.title"))
+        self.steps_entry.set_text(format_steps(self.parent.steps))
+
+        self.loop_switch = Adw.SwitchRow(title=self.lm.get("actions.sequence.gtk.loop_switch.title"))
+        self.loop_switch.set_active(self.parent.loop)
+
+        self.steps_entry.connect("notify::text", self.on_gtk_update)
+        self.loop_switch.connect("notify::active", self.on_gtk_update)
+
+    def get_config_rows(self):
+        return [self.steps_entry, self.loop_switch]
+
+    def on_gtk_update(self, *args):
+        self.parent.steps = parse_steps(self.steps_entry.get_text())
+        self.parent.loop = self.loop_switch.get_active()
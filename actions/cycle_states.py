@@ -0,0 +1,116 @@
+import threading
+import time
+
+from loguru import logger as log  # noqa: F401
+
+from gg_kekemui_veadosc.actions.action_bases import StateActionBase
+from gg_kekemui_veadosc.constants import REV_DNS
+from gg_kekemui_veadosc.controller.types import SetActiveStateRequest
+from gg_kekemui_veadosc.diagnostics import tracer
+from gg_kekemui_veadosc.model import ModelEvent
+
+PENDING_TIMEOUT = 2
+
+
+class CycleStates(StateActionBase):
+    """
+    Steps through an ordered list of states, one per press.
+
+    The next state is computed from the model's `active_state`, so a press
+    costs a single `SetActiveStateRequest` and no round trip. Until veadotube
+    confirms it, the requested state is kept as a pending state and used as the
+    starting point for the next press; otherwise a quick second press would
+    resend the same target, because the peek hasn't arrived yet.
+    """
+
+    action_id = f"{REV_DNS}::CycleStates"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        self._lock = threading.Lock()
+        self._pending: str | None = None
+        self._pending_since = 0.0
+
+    @property
+    def state_ids(self) -> list[str]:
+        return list(self.get_settings().get("state_ids", []))
+
+    @state_ids.setter
+    def state_ids(self, value: list[str]):
+        settings = self.get_settings()
+
+        dirty = settings.get("state_ids", []) != value
+        settings["state_ids"] = value
+        self.set_settings(settings)
+
+        if dirty:
+            self.render()
+
+    @property
+    def state_id(self) -> str:
+        """
+        The state shown on the key: the pending state if there is one,
+        otherwise veadotube's active state.
+        """
+        return self._current() or ""
+
+    def _current(self) -> str | None:
+        # Give up on a pending state that was never confirmed (e.g., a dropped
+        # request, or another client changed state in the meantime).
+        if self._pending and time.monotonic() - self._pending_since < PENDING_TIMEOUT:
+            return self._pending
+        return self.model.active_state
+
+    def next_state(self) -> str | None:
+        """
+        :returns: The state after the current one in `state_ids`, or the first
+            entry if the current state isn't part of the cycle.
+        """
+        cycle = self.state_ids
+        if not cycle:
+            return None
+
+        current = self._current()
+        if current not in cycle:
+            return cycle[0]
+        return cycle[(cycle.index(current) + 1) % len(cycle)]
+
+    def on_key_down(self):
+        with self._lock:
+            target = self.next_state()
+            if not target:
+                self.show_error(5)
+                return
+            self._pending = target
+            self._pending_since = time.monotonic()
+
+        request = SetActiveStateRequest(target)
+        request.correlation_id = tracer.new_correlation_id()
+        with tracer.span("CycleStates.on_key_down", request.correlation_id):
+            self.plugin_base.send_request_async(request, callback=self.on_request_result)
+        self.render()
+
+    def on_request_result(self, success: bool):
+        if not success:
+            with self._lock:
+                self._pending = None
+            self.render()
+        super().on_request_result(success)
+
+    def update(self, event: ModelEvent):
+        with self._lock:
+            if self._pending and self._pending == self.model.active_state:
+                self._pending = None
+        super().update(event)
+
+    def draw(self):
+        self.set_top_label("Cycle", update=False)
+        super().draw()
+
+    def get_config_rows(self):
+        from gg_kekemui_veadosc.actions.config_rows import CycleGtk
+
+        self.cycle_gtk = CycleGtk(self, self.lm)
+        # Skip StateActionBase's single state entry.
+        return super(StateActionBase, self).get_config_rows() + self.cycle_gtk.get_config_rows()
@@ -0,0 +1,53 @@
+from loguru import logger as log  # noqa: F401
+
+from gg_kekemui_veadosc.actions.action_bases import VeadoSCActionBase
+from gg_kekemui_veadosc.constants import REV_DNS
+
+
+class DumpDiagnostics(VeadoSCActionBase):
+    """
+    Writes the backend journal, observer stats (and trace, if tracing is
+    enabled) to disk, for post-mortems of "the keys froze for a bit" reports.
+    """
+
+    action_id = f"{REV_DNS}::DumpDiagnostics"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        self._status: str | None = None
+
+    def update(self, event):
+        pass
+
+    def on_ready(self):
+        self.render()
+
+    def on_remove(self):
+        self.model.unsubscribe(self)
+        self.plugin_base.render_scheduler.discard(self)
+
+    def draw(self):
+        self.set_top_label(self.lm.get(self._status) if self._status else "", update=False)
+        self.set_bottom_label(self.lm.get("actions.dump.label"), update=False)
+
+    def on_key_down(self):
+        # Fetching the journal is a backend call and the dump writes files; keep both off the input thread.
+        self._status = "actions.dump.running.label"
+        self.render()
+        self.plugin_base.request_dispatcher.submit_call(self._dump, self.on_request_result)
+
+    def _dump(self) -> bool:
+        try:
+            paths = self.plugin_base.dump_diagnostics()
+        except Exception as e:
+            log.warning(f"Unable to dump diagnostics: {e}")
+            return False
+
+        log.info(f"Diagnostics written to {paths}")
+        return True
+
+    def on_request_result(self, success: bool):
+        self._status = "actions.dump.done.label" if success else None
+        self.render()
+        super().on_request_result(success)
@@ -0,0 +1,68 @@
+from loguru import logger as log  # noqa: F401
+
+from gg_kekemui_veadosc.actions.action_bases import VeadoSCActionBase
+from gg_kekemui_veadosc.constants import REV_DNS
+from gg_kekemui_veadosc.controller.types import ControllerConnectedEvent, LinkQualityEvent
+from gg_kekemui_veadosc.model.impl import BG_ACTIVE, BG_DEGRADED_ACTIVE, BG_ERROR, BG_STALE_INACTIVE
+
+GOOD_RTT_MS = 50
+POOR_RTT_MS = 250
+POOR_SILENCE_MS = 4_000
+
+
+class LinkHealth(VeadoSCActionBase):
+    """
+    Shows the health of the veadotube connection: smoothed RTT, time since the
+    last frame, and how many times the backend has reconnected.
+
+    Everything comes from `LinkQualityEvent`, which the backend pushes every
+    few seconds, so this costs nothing extra over RPyC.
+    """
+
+    action_id = f"{REV_DNS}::LinkHealth"
+    event_types = (LinkQualityEvent, ControllerConnectedEvent)
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+    def update(self, event):
+        super().update(event)
+
+        self.render()
+
+    def color_for(self, quality: LinkQualityEvent | None) -> list[int]:
+        if not self.model.connected:
+            return BG_STALE_INACTIVE
+        if quality is None:
+            # Connected, but no sample yet.
+            return BG_ACTIVE
+        if quality.degraded or quality.rtt_ms > POOR_RTT_MS or quality.since_last_frame_ms > POOR_SILENCE_MS:
+            return BG_ERROR
+        if quality.rtt_ms > GOOD_RTT_MS:
+            return BG_DEGRADED_ACTIVE
+        return BG_ACTIVE
+
+    def draw(self):
+        quality = self.model.link_quality
+        self.set_background_color(self.color_for(quality), update=False)
+
+        if not self.model.connected:
+            self.set_top_label(self.lm.get("actions.health.offline.label"), update=False)
+            self.set_center_label("", update=False)
+            self.set_bottom_label("", update=False)
+        elif quality is None:
+            self.set_top_label("-- ms", update=False)
+            self.set_center_label("", update=False)
+            self.set_bottom_label("", update=False)
+        else:
+            self.set_top_label(f"{quality.rtt_ms:.0f} ms", update=False)
+            self.set_center_label(f"{quality.since_last_frame_ms / 1000:.1f}s", update=False)
+            self.set_bottom_label(f"↻ {quality.reconnect_count}", update=False)
+
+    def on_ready(self):
+        self.model.subscribe(self, *self.event_types)
+        self.render()
+
+    def on_remove(self):
+        self.model.unsubscribe(self)
+        self.plugin_base.render_scheduler.discard(self)
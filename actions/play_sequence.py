@@ -0,0 +1,142 @@
+from uuid import uuid4
+
+from loguru import logger as log  # noqa: F401
+
+from gg_kekemui_veadosc.actions.action_bases import STATE_EVENTS, VeadoSCActionBase
+from gg_kekemui_veadosc.constants import REV_DNS
+from gg_kekemui_veadosc.controller.types import SequenceEvent
+from gg_kekemui_veadosc.model import ModelEvent
+
+DEFAULT_STEP_MS = 100
+
+
+def parse_steps(text: str) -> list[tuple[str, int]]:
+    """
+    Parses `state:ms, state:ms, ...`. A step without a duration gets
+    `DEFAULT_STEP_MS`.
+    """
+    steps = []
+    for part in text.split(","):
+        state_id, _, duration = part.strip().rpartition(":")
+        if not state_id:
+            state_id, duration = duration, ""
+        if not state_id.strip():
+            continue
+        try:
+            ms = int(duration)
+        except ValueError:
+            ms = DEFAULT_STEP_MS
+        steps.append((state_id.strip(), ms))
+    return steps
+
+
+def format_steps(steps: list[tuple[str, int]]) -> str:
+    return ", ".join(f"{state_id}:{ms}" for state_id, ms in steps)
+
+
+class PlaySequence(VeadoSCActionBase):
+    """
+    Plays a list of (state, milliseconds) steps; pressing again stops it.
+
+    Timing is handled by the backend's `Sequencer`, so steps land on schedule
+    regardless of key handling or RPyC latency.
+    """
+
+    action_id = f"{REV_DNS}::PlaySequence"
+    event_types = STATE_EVENTS + (SequenceEvent,)
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+    @property
+    def steps(self) -> list[tuple[str, int]]:
+        return [(state_id, int(ms)) for state_id, ms in self.get_settings().get("steps", [])]
+
+    @steps.setter
+    def steps(self, value: list[tuple[str, int]]):
+        self._set_setting("steps", [list(step) for step in value])
+
+    @property
+    def loop(self) -> bool:
+        return bool(self.get_settings().get("loop", False))
+
+    @loop.setter
+    def loop(self, value: bool):
+        self._set_setting("loop", value)
+
+    def _set_setting(self, key: str, value):
+        settings = self.get_settings()
+
+        dirty = settings.get(key) != value
+        settings[key] = value
+        self.set_settings(settings)
+
+        if dirty:
+            self.render()
+
+    @property
+    def sequence_id(self) -> str:
+        """
+        Kept in the action's settings: the backend's `Sequencer` outlives this
+        action (and the frontend), and a reloaded key must still own its loop.
+        """
+        settings = self.get_settings()
+        if not settings.get("sequence_id"):
+            settings["sequence_id"] = str(uuid4())
+            self.set_settings(settings)
+        return settings["sequence_id"]
+
+    @property
+    def playing(self) -> bool:
+        return self.model.sequence_status(self.sequence_id) is not None
+
+    def on_key_down(self):
+        if self.playing:
+            self.plugin_base.stop_sequence_async(self.sequence_id)
+            return
+
+        steps = [(state_id, ms / 1000) for state_id, ms in self.steps]
+        if not steps:
+            self.show_error(5)
+            return
+        self.plugin_base.play_sequence_async(self.sequence_id, steps, self.loop, self.on_request_result)
+
+    def update(self, event: ModelEvent):
+        super().update(event)
+
+        if isinstance(event, SequenceEvent):
+            if event.sequence_id != self.sequence_id:
+                return
+            if not event.running:
+                log.info(
+                    f"Sequence finished after {event.passes} passes: {event.steps_played} steps, "
+                    f"{event.steps_failed} failed, drift mean {event.mean_drift_ms:.2f}ms / max "
+                    f"{event.max_drift_ms:.2f}ms"
+                )
+        self.render()
+
+    def draw(self):
+        steps = self.steps
+        first = steps[0][0] if steps else ""
+        label = "actions.sequence.playing.label" if self.playing else "actions.sequence.label"
+
+        self.set_media(image=self.model.get_image_for_state(first), size=0.75, update=False)
+        self.set_background_color(self.model.get_color_for_state(first), update=False)
+        self.set_top_label(self.lm.get(label), update=False)
+        self.set_bottom_label(first, update=False)
+
+    def on_ready(self):
+        self.model.subscribe(self, *self.event_types)
+        self.render()
+
+    def on_remove(self):
+        self.model.unsubscribe(self)
+        self.plugin_base.render_scheduler.discard(self)
+        if self.playing:
+            self.plugin_base.stop_sequence_async(self.sequence_id)
+
+    def get_config_rows(self):
+        from gg_kekemui_veadosc.actions.config_rows import SequenceGtk
+
+        self.sequence_gtk = SequenceGtk(self, self.lm)
+        return super().get_config_rows() + self.sequence_gtk.get_config_rows()
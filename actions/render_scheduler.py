@@ -0,0 +1,84 @@
+import threading
+import time
+import traceback
+
+from loguru import logger as log
+
+from gg_kekemui_veadosc.diagnostics import tracer
+
+RENDER_FPS = 30
+RENDER_THREAD_NAME = "gg_kekemui_veadosc::render_scheduler"
+
+
+class RenderScheduler:
+    """
+    Coalesces render requests from actions into at most one pass per frame.
+
+    Model events arrive far faster than a deck can usefully redraw (e.g., a
+    `list` followed by a `thumb` per state). Actions mark themselves dirty here
+    instead of drawing immediately; once per frame interval, every dirty action
+    draws without updating its input, then all inputs are updated in one pass.
+
+    When tracing, a pass is tagged with the correlation ids current when its
+    actions were marked dirty, so a key press can be followed to its redraw.
+    """
+
+    def __init__(self, fps: int = RENDER_FPS):
+        self._interval = 1 / fps
+        self._dirty: dict[str, "VeadoSCActionBase"] = {}  # noqa: F821
+        self._cids: set[str] = set()
+        self._cond = threading.Condition()
+        self._last_flush = 0.0
+
+        self._thread = threading.Thread(target=self._run, name=RENDER_THREAD_NAME, daemon=True)
+        self._thread.start()
+
+    def mark_dirty(self, action: "VeadoSCActionBase"):  # noqa: F821
+        cid = tracer.current_cid()
+        with self._cond:
+            self._dirty[action.observer_id] = action
+            if cid:
+                self._cids.add(cid)
+            self._cond.notify()
+
+    @property
+    def depth(self) -> int:
+        return len(self._dirty)
+
+    def discard(self, action: "VeadoSCActionBase"):  # noqa: F821
+        with self._cond:
+            self._dirty.pop(action.observer_id, None)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._dirty)
+
+            delay = self._last_flush + self._interval - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+
+            with self._cond:
+                dirty = list(self._dirty.values())
+                self._dirty = {}
+                cids, self._cids = sorted(self._cids), set()
+
+            self._last_flush = time.monotonic()
+            cid = cids[0] if len(cids) == 1 else None
+            with tracer.span("RenderScheduler.flush", cid, actions=len(dirty), cids=cids):
+                self._flush(dirty)
+
+    def _flush(self, actions: list["VeadoSCActionBase"]):  # noqa: F821
+        drawn = []
+        for action in actions:
+            try:
+                action.draw()
+                drawn.append(action)
+            except Exception as e:
+                log.warning(f"Caught exception {e=} while drawing. Full details: {traceback.format_exc()}")
+
+        for action in drawn:
+            try:
+                action.get_input().update()
+            except Exception as e:
+                log.warning(f"Caught exception {e=} while updating input. Full details: {traceback.format_exc()}")
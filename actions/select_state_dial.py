@@ -0,0 +1,142 @@
+import threading
+
+from loguru import logger as log
+from src.backend.DeckManagement.InputIdentifier import Input
+
+from gg_kekemui_veadosc.actions.action_bases import VeadoSCActionBase
+from gg_kekemui_veadosc.constants import REV_DNS
+from gg_kekemui_veadosc.controller.types import SetActiveStateRequest
+from gg_kekemui_veadosc.model import ModelEvent
+
+SETTLE_TIME = 0.15
+CONFIRM_TIMEOUT = 2.0
+
+
+class SelectStateDial(VeadoSCActionBase):
+    """
+    Scrolls through veadotube's states with a dial.
+
+    Fast spins produce dozens of ticks a second, so selection is tracked
+    locally and previewed on the touchscreen; only the final target is sent,
+    once the dial has been still for `SETTLE_TIME` seconds (or is pressed).
+    The preview is dropped if veadotube hasn't confirmed the target within
+    `CONFIRM_TIMEOUT` seconds of it being sent.
+    """
+
+    action_id = f"{REV_DNS}::SelectStateDial"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        self._lock = threading.Lock()
+        self._pending: str | None = None
+        self._settle_timer: threading.Timer | None = None
+        self._confirm_timer: threading.Timer | None = None
+
+    @property
+    def shown_state(self) -> str:
+        return self._pending or self.model.active_state
+
+    def event_callback(self, event, data=None):
+        if event == Input.Dial.Events.TURN_CW:
+            self.turn(1)
+        elif event == Input.Dial.Events.TURN_CCW:
+            self.turn(-1)
+        elif event == Input.Dial.Events.SHORT_UP:
+            self.commit()
+        else:
+            super().event_callback(event, data)
+
+    def turn(self, ticks: int):
+        states = self.model.state_list
+        if not states:
+            return
+
+        with self._lock:
+            current = self.shown_state
+            index = states.index(current) if current in states else -1
+            self._pending = states[(index + ticks) % len(states)]
+
+            self._cancel_confirm()
+            if self._settle_timer:
+                self._settle_timer.cancel()
+            self._settle_timer = threading.Timer(SETTLE_TIME, self.commit)
+            self._settle_timer.daemon = True
+            self._settle_timer.start()
+
+        self.render()
+
+    def commit(self):
+        with self._lock:
+            if self._settle_timer:
+                self._settle_timer.cancel()
+                self._settle_timer = None
+            target = self._pending
+            send = target and target != self.model.active_state
+
+            self._cancel_confirm()
+            if send:
+                self._confirm_timer = threading.Timer(CONFIRM_TIMEOUT, self._confirm_expired, args=(target,))
+                self._confirm_timer.daemon = True
+                self._confirm_timer.start()
+            elif target:
+                self._pending = None
+
+        if send:
+            self.plugin_base.send_request_async(SetActiveStateRequest(target), callback=self.on_request_result)
+        elif target:
+            self.render()
+
+    def _cancel_confirm(self):
+        # Caller holds `_lock`.
+        if self._confirm_timer:
+            self._confirm_timer.cancel()
+            self._confirm_timer = None
+
+    def _confirm_expired(self, target: str):
+        with self._lock:
+            if self._pending != target:
+                return
+            self._confirm_timer = None
+            self._pending = None
+
+        log.debug(f"veadotube didn't confirm state {target}; dropping the preview")
+        self.render()
+
+    def on_request_result(self, success: bool):
+        if not success:
+            # Snap the preview back to what veadotube is actually showing.
+            with self._lock:
+                self._cancel_confirm()
+                self._pending = None
+            self.render()
+        super().on_request_result(success)
+
+    def update(self, event: ModelEvent):
+        super().update(event)
+
+        # Hold the preview until veadotube confirms it.
+        with self._lock:
+            if self._pending and self._pending == self.model.active_state:
+                self._cancel_confirm()
+                self._pending = None
+        self.render()
+
+    def draw(self):
+        state_id = self.shown_state
+        self.set_media(image=self.model.get_image_for_state(state_id), size=0.75, update=False)
+        self.set_background_color(self.model.get_color_for_state(state_id), update=False)
+        self.set_top_label("..." if self._pending else "", update=False)
+        self.set_bottom_label(state_id, update=False)
+
+    def on_ready(self):
+        self.model.subscribe(self, *self.event_types)
+        self.render()
+
+    def on_remove(self):
+        self.model.unsubscribe(self)
+        self.plugin_base.render_scheduler.discard(self)
+        with self._lock:
+            if self._settle_timer:
+                self._settle_timer.cancel()
+            self._cancel_confirm()
@@ -3,6 +3,7 @@ from loguru import logger as log  # noqa: F401
 from gg_kekemui_veadosc.actions.action_bases import StateActionBase
 from gg_kekemui_veadosc.constants import REV_DNS
 from gg_kekemui_veadosc.controller.types import SetActiveStateRequest
+from gg_kekemui_veadosc.diagnostics import tracer
 
 
 class SetState(StateActionBase):
@@ -13,7 +14,7 @@ class SetState(StateActionBase):
         super().__init__(*args, **kwargs)
 
     def on_key_down(self):
-        success = self.plugin_base.send_request(SetActiveStateRequest(self.state_id))
-
-        if not success:
-            self.show_error(5)
+        request = SetActiveStateRequest(self.state_id)
+        request.correlation_id = tracer.new_correlation_id()
+        with tracer.span("SetState.on_key_down", request.correlation_id):
+            self.plugin_base.send_request_async(request, callback=self.on_request_result)
@@ -3,6 +3,7 @@ from loguru import logger as log  # noqa: F401
 from gg_kekemui_veadosc.actions.action_bases import StateActionBase
 from gg_kekemui_veadosc.constants import REV_DNS
 from gg_kekemui_veadosc.controller.types import ToggleStateRequest
+from gg_kekemui_veadosc.diagnostics import tracer
 
 
 class ToggleState(StateActionBase):
@@ -19,11 +20,11 @@ class ToggleState(StateActionBase):
         self.toggle()
 
     def toggle(self):
-        success = self.plugin_base.send_request(ToggleStateRequest(self.state_id))
+        request = ToggleStateRequest(self.state_id)
+        request.correlation_id = tracer.new_correlation_id()
+        with tracer.span("ToggleState.toggle", request.correlation_id):
+            self.plugin_base.send_request_async(request, callback=self.on_request_result)
 
-        if not success:
-            self.show_error(5)
-
-    def render(self):
+    def draw(self):
         self.set_top_label("Toggle", update=False)
-        super().render()
+        super().draw()
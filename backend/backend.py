@@ -1,22 +1,88 @@
 # Set path so we can use absolute import paths
+import os
+import signal
 import sys
+import threading
+import time
 from pathlib import Path
 
 ABSOLUTE_PLUGIN_PATH = str(Path(__file__).parent.parent.parent.absolute())
 sys.path.insert(0, ABSOLUTE_PLUGIN_PATH)
 
+from loguru import logger as log
 from streamcontroller_plugin_tools import BackendBase
 
 from gg_kekemui_veadosc.controller.impl import VeadoController_
+from gg_kekemui_veadosc.diagnostics import Profiler, journal, tracer
+from gg_kekemui_veadosc.ipc import IpcServer, build_id
+
+ORPHAN_TIMEOUT = 60
+"""Seconds the backend waits, with no frontend attached, for one to adopt it before exiting. See ADR-03."""
+ORPHAN_CHECK_INTERVAL = 5
+ORPHAN_THREAD_NAME = "gg_kekemui_veadosc::orphan_watch"
 
 
 class Backend(BackendBase):
+    _rpyc_clients = 0
+    """Frontends connected over RPyC. A class attribute, as RPyC may connect before `__init__` finishes."""
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
+        tracer.process_name = "VeadoSC backend"
         self.controller = VeadoController_(self.frontend)
 
+        # Requests and events go over IPC once the frontend connects; RPyC is for control. See ADR-02.
+        # A frontend started later can adopt this backend over the same socket. See ADR-03.
+        self.ipc = IpcServer(self.controller, build_id(), on_stale=lambda: self.retire("out of date"))
+        self.controller.event_sink = self.ipc.publish
+        self._retiring = threading.Lock()
+        threading.Thread(target=self._watch_for_orphan, name=ORPHAN_THREAD_NAME, daemon=True).start()
+
+        self.profiler = Profiler(
+            "backend",
+            gauges={"inbound_queue": self.controller.get_queue_stats, "requests": self.controller.get_request_stats},
+        )
+        self.profiler.start()
+
+        # `kill -USR1 <backend pid>` dumps the journal without involving the frontend.
+        signal.signal(signal.SIGUSR1, lambda *_: journal.dump())
+
     def get_controller(self):
         return self.controller
 
+    def get_ipc_address(self) -> str:
+        return self.ipc.path
+
+    def on_connect(self, conn):
+        super().on_connect(conn)
+        self._rpyc_clients += 1
+
+    def on_disconnect(self, conn):
+        # Deliberately outlives its frontend, so the next one can adopt it.
+        self._rpyc_clients -= 1
+        if self._rpyc_clients <= 0:
+            # The launching frontend is gone; only IPC reaches a frontend from here on.
+            self.controller.frontend = None
+
+    def retire(self, reason: str):
+        """
+        Closes veadotube connections and the IPC socket, then exits.
+        """
+        if not self._retiring.acquire(blocking=False):
+            return
+
+        log.info(f"Backend retiring: {reason}")
+        self.controller.shutdown()
+        self.ipc.close()
+        self.profiler.stop()
+        # RPyC's server thread would otherwise keep the process alive.
+        os._exit(0)
+
+    def _watch_for_orphan(self):
+        while True:
+            time.sleep(ORPHAN_CHECK_INTERVAL)
+            if self._rpyc_clients <= 0 and self.ipc.idle_for > ORPHAN_TIMEOUT:
+                self.retire(f"no frontend for {ORPHAN_TIMEOUT}s")
+
 
 backend = Backend()
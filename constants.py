@@ -1 +1,3 @@
 REV_DNS = "gg_kekemui_veadosc"
+
+DEBUG_ENV = "VEADOSC_DEBUG"
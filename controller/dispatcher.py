@@ -0,0 +1,94 @@
+import threading
+import traceback
+from itertools import groupby
+from queue import SimpleQueue
+from typing import Callable
+
+from loguru import logger as log
+
+from gg_kekemui_veadosc.controller.types import Request
+
+RequestCallback = Callable[[bool], None]
+BatchSender = Callable[[list[Request]], tuple[bool, ...]]
+Call = Callable[[], bool]
+
+DISPATCH_THREAD_NAME = "gg_kekemui_veadosc::request_dispatcher"
+MAX_BATCH = 32
+
+
+class RequestDispatcher:
+    """
+    Moves `send_request` calls off of the caller's thread.
+
+    Key handlers run on StreamController's input thread, and a synchronous
+    `send_request` blocks that thread for the full RPyC + websocket round trip.
+    Requests submitted here are queued and sent, in order, from a single worker
+    thread; anything that queued up while a send was in flight goes out as one
+    batch. The outcome is reported through the optional callback once known.
+
+    Other calls into the backend (e.g., starting a sequence) can be queued too,
+    and run in order with the requests around them.
+    """
+
+    def __init__(self, send: BatchSender):
+        self._send = send
+        self._queue: SimpleQueue[tuple[Request | Call, RequestCallback | None]] = SimpleQueue()
+
+        self._thread = threading.Thread(target=self._consumer, name=DISPATCH_THREAD_NAME, daemon=True)
+        self._thread.start()
+
+    def submit(self, request: Request, callback: RequestCallback | None = None):
+        """
+        Queues a request for delivery and returns immediately.
+
+        :param request: The request to send.
+        :param callback: Invoked from the dispatcher thread with True if the
+            request was sent, False otherwise.
+        """
+        self._queue.put((request, callback))
+
+    def submit_call(self, call: Call, callback: RequestCallback | None = None):
+        """
+        As `submit`, for a call into the backend other than sending requests.
+
+        :param call: Returns True on success.
+        """
+        self._queue.put((call, callback))
+
+    @property
+    def depth(self) -> int:
+        return self._queue.qsize()
+
+    def _consumer(self):
+        log.info("Request dispatcher started")
+        while True:
+            pending = [self._queue.get(block=True)]
+            while len(pending) < MAX_BATCH and not self._queue.empty():
+                pending.append(self._queue.get_nowait())
+
+            results = []
+            for is_request, group in groupby(pending, key=lambda item: isinstance(item[0], Request)):
+                items = [item for item, _ in group]
+                results.extend(self._send_batch(items) if is_request else [self._run(call) for call in items])
+
+            for (_, callback), success in zip(pending, results):
+                if not callback:
+                    continue
+                try:
+                    callback(success)
+                except Exception as e:
+                    log.warning(f"Caught exception {e=} in request callback. Full details: {traceback.format_exc()}")
+
+    def _send_batch(self, batch: list[Request]) -> tuple[bool, ...]:
+        try:
+            return self._send(batch)
+        except Exception as e:
+            log.warning(f"Caught exception {e=} while sending requests. Full details: {traceback.format_exc()}")
+            return (False,) * len(batch)
+
+    def _run(self, call: Call) -> bool:
+        try:
+            return bool(call())
+        except Exception as e:
+            log.warning(f"Caught exception {e=} in dispatched call. Full details: {traceback.format_exc()}")
+            return False
@@ -0,0 +1,104 @@
+import threading
+import time
+
+from loguru import logger as log
+from websockets.exceptions import ConnectionClosed
+from websockets.sync import client
+
+from gg_kekemui_veadosc.controller.types import LinkQualityEvent
+
+PING_INTERVAL = 2
+PONG_TIMEOUT = 2
+STALE_THRESHOLD = 6
+DEGRADED_RTT_MS = 250
+
+MONITOR_THREAD_NAME = "gg_kekemui_veadosc::link_monitor"
+
+
+class LinkMonitor:
+    """
+    Actively checks the health of a single websocket session.
+
+    A half-open TCP connection (e.g., the veadotube host went to sleep) looks
+    perfectly healthy to the reader until the OS gives up on it. Pinging on an
+    interval lets us measure RTT and jitter, and notice a stale link within
+    `STALE_THRESHOLD` seconds, at which point the connection is told to
+    reconnect.
+    """
+
+    def __init__(self, conn: "VTConnection", ws: client.ClientConnection):  # noqa: F821
+        self._conn = conn
+        self._ws = ws
+
+        self.rtt_ms: float = 0.0
+        self.jitter_ms: float = 0.0
+        self.missed_pongs: int = 0
+        self._last_rtt_ms: float | None = None
+        self._last_frame: float = time.monotonic()
+
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=MONITOR_THREAD_NAME, daemon=True)
+        self._thread.start()
+
+    def on_frame(self):
+        self._last_frame = time.monotonic()
+
+    @property
+    def since_last_frame(self) -> float:
+        return time.monotonic() - self._last_frame
+
+    @property
+    def stale(self) -> bool:
+        return self.since_last_frame > STALE_THRESHOLD
+
+    @property
+    def degraded(self) -> bool:
+        if self.missed_pongs > 0 or self.rtt_ms > DEGRADED_RTT_MS:
+            return True
+        return self.since_last_frame > PING_INTERVAL + PONG_TIMEOUT
+
+    def sample(self) -> LinkQualityEvent:
+        return LinkQualityEvent(
+            rtt_ms=self.rtt_ms,
+            jitter_ms=self.jitter_ms,
+            since_last_frame_ms=self.since_last_frame * 1000,
+            degraded=self.degraded,
+            reconnect_count=self._conn.ctrl.reconnect_count,
+        )
+
+    def stop(self):
+        self._stop.set()
+
+    def _record_rtt(self, rtt_ms: float):
+        # Smoothing per RFC 6298 (RTT) and RFC 3550 (jitter).
+        if self._last_rtt_ms is None:
+            self.rtt_ms = rtt_ms
+        else:
+            self.rtt_ms += (rtt_ms - self.rtt_ms) / 8
+            self.jitter_ms += (abs(rtt_ms - self._last_rtt_ms) - self.jitter_ms) / 16
+        self._last_rtt_ms = rtt_ms
+
+    def _run(self):
+        while not self._stop.wait(PING_INTERVAL):
+            sent = time.monotonic()
+            try:
+                pong = self._ws.ping()
+            except ConnectionClosed:
+                break
+
+            if pong.wait(PONG_TIMEOUT):
+                self._record_rtt((time.monotonic() - sent) * 1000)
+                self.missed_pongs = 0
+                self.on_frame()
+            else:
+                self.missed_pongs += 1
+
+            if self._stop.is_set():
+                break
+
+            if self.stale:
+                log.warning(f"No traffic from veadotube for {self.since_last_frame:.1f}s, reconnecting")
+                self._conn.force_reconnect()
+                break
+
+            self._conn.ctrl.publish_from(self._conn, self.sample())
@@ -1,40 +1,100 @@
+import socket
 import threading
+import time
+from typing import Callable, Sequence
 
 from loguru import logger as log
 from websockets.exceptions import ConnectionClosed, InvalidHandshake, InvalidURI
 from websockets.sync import client
 
+from gg_kekemui_veadosc.controller.health import LinkMonitor
+from gg_kekemui_veadosc.controller.inbound import InboundQueue
+from gg_kekemui_veadosc.controller.offline import OfflineBuffer
+from gg_kekemui_veadosc.controller.pending import REQUEST_TIMEOUT, PendingRequests, RequestFuture, answer_keys
+from gg_kekemui_veadosc.controller.probe import open_websocket, probe_instances
+from gg_kekemui_veadosc.controller.sequencer import Sequencer
 from gg_kekemui_veadosc.controller.types import (
     ControllerConnectedEvent,
     Request,
+    ResponseKey,
     SubscribeStateEventsRequest,
     VeadoController,
     VTInstance,
     model_event_factory,
+    response_key_of,
+    serialize_batch,
 )
 from gg_kekemui_veadosc.controller.watchdog import VeadoPollingWatchdog
 from gg_kekemui_veadosc.data import VeadoSCConnectionConfig
+from gg_kekemui_veadosc.diagnostics import journal, tracer
+from gg_kekemui_veadosc.observer import Event
+
+DISPATCH_THREAD_NAME = "gg_kekemui_veadosc::event_dispatch"
+
+RETRY_WAIT = 10
+FAST_RETRY_WAIT = 0.5
+REPROBE_WAIT = 2.5
+HANDOVER_TIMEOUT = 5
+HANDOVER_THREAD_NAME = "gg_kekemui_veadosc::handover"
+WS_THREAD_NAME = "gg_kekemui_veadosc_wst"
+REPROBE_THREAD_NAME = "gg_kekemui_veadosc::reprobe"
+TERMINATE_TIMEOUT = 2
+
+_SHUTDOWN = object()
 
 
 class VTConnection:
-    def __init__(self, controller: "VeadoController", conf: VTInstance):
+    def __init__(self, controller: "VeadoController", conf: VTInstance, ws: client.ClientConnection | None = None):
+        """
+        :param ws: An already-open websocket to `conf` (e.g., from probing) to
+            use for the first session instead of connecting again.
+        """
         self.ctrl = controller
         self.conf = conf
 
         self.should_terminate = threading.Event()
         self.ws = None
+        self._pending_ws = ws
+        self.ready = threading.Event()
+        self.monitor: LinkMonitor | None = None
+        self._fast_retry = False
 
         self.start_ws_thread()
 
     @property
     def connected(self) -> bool:
-        return self.ws is not None
+        return self.ws is not None and not (self.monitor and self.monitor.stale)
+
+    def force_reconnect(self):
+        """
+        Drops the current websocket without waiting for a close handshake, which
+        would never complete on a half-open link, and retries promptly.
+        """
+        self._fast_retry = True
+        journal.record(journal.CONN, f"force reconnect {self.conf}")
+        ws = self.ws
+        if ws:
+            try:
+                ws.socket.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
 
     def terminate(self):
+        """
+        Closes the connection and waits (up to `TERMINATE_TIMEOUT`) for its
+        thread to finish, so that connections replaced over a long session
+        don't accumulate.
+        """
         self.should_terminate.set()
         if self.ws:
             self.ws.close()
 
+        if self.thread is not threading.current_thread():
+            self.thread.join(TERMINATE_TIMEOUT)
+            if self.thread.is_alive():
+                # Most likely still opening; it closes the socket once that finishes.
+                log.warning(f"Connection thread for {self.conf} still running {TERMINATE_TIMEOUT}s after terminate")
+
     def send_request(self, request: Request) -> bool:
         """
         Sends a request to veadotube, if connected.
@@ -48,39 +108,80 @@ class VTConnection:
         """
         try:
             reqstr = request.to_request_string()
-            self.ws.send(reqstr)
+            with tracer.span("VTConnection.send", request.correlation_id if tracer.enabled else None):
+                self.ws.send(reqstr)
+            journal.record(journal.OUT, reqstr)
             return True
         except AttributeError:
             return False
 
+    def send_requests(self, batch: tuple[str, ...], correlation_id: str | None = None) -> tuple[bool, ...]:
+        """
+        Writes already-serialized requests back to back.
+
+        :returns: Per-request success. Once a write fails, the remainder are
+            not attempted.
+        """
+        results = []
+        with tracer.span("VTConnection.send", correlation_id, count=len(batch)):
+            try:
+                for reqstr in batch:
+                    self.ws.send(reqstr)
+                    journal.record(journal.OUT, reqstr)
+                    results.append(True)
+            except (AttributeError, ConnectionClosed):
+                pass
+
+        return tuple(results) + (False,) * (len(batch) - len(results))
+
     def start_ws_thread(self):
         self.should_terminate.clear()
-        self.thread = threading.Thread(target=self.ws_thread, name="gg_kekemui_veadosc_wst", daemon=True)
+        self.thread = threading.Thread(target=self.ws_thread, name=WS_THREAD_NAME, daemon=True)
         self.thread.start()
 
     def ws_thread(self):
         should_terminate: bool = self.should_terminate.is_set()
         while not should_terminate:
-            host = self.conf.hostname
-            port = self.conf.port
             try:
-                self.ws: client.ClientConnection = client.connect(f"ws://{host}:{port}?n=gg_kekemui_veadosc")
+                if self._pending_ws:
+                    self.ws, self._pending_ws = self._pending_ws, None
+                else:
+                    self.ws: client.ClientConnection = open_websocket(self.conf)
+                if self.should_terminate.is_set():
+                    # Terminated while opening; `terminate` had no socket to close.
+                    self.ws.close()
+                    self.ws = None
+                    break
+                self.monitor = LinkMonitor(self, self.ws)
 
                 self.send_request(SubscribeStateEventsRequest())
+                if replay := self.ctrl.take_offline_request():
+                    self.send_requests((replay,))
+                self.ready.set()
 
-                self.ctrl.notify(ControllerConnectedEvent(True))
+                self.ctrl.publish_from(self, ControllerConnectedEvent(True, self.conf.veado_id))
 
                 for message in self.ws:
-                    self.ctrl.on_recv(message)
+                    journal.record(journal.IN, message)
+                    self.monitor.on_frame()
+                    self.ctrl.on_recv(message, self)
             except (InvalidURI, InvalidHandshake, OSError, TimeoutError):
                 log.info("Unable to connect")
             except ConnectionClosed:
                 log.info("Websocket closed")
 
+            if self.monitor:
+                self.monitor.stop()
+                self.monitor = None
+
+            self.ready.clear()
             if self.ws:
                 self.ws = None
-                self.ctrl.notify(ControllerConnectedEvent(False))
-            should_terminate = self.should_terminate.wait(10)
+                self.ctrl.publish_from(self, ControllerConnectedEvent(False, self.conf.veado_id))
+
+            retry_wait = FAST_RETRY_WAIT if self._fast_retry else RETRY_WAIT
+            self._fast_retry = False
+            should_terminate = self.should_terminate.wait(retry_wait)
         log.info("Connection terminated by request")
 
 
@@ -93,16 +194,49 @@ class VeadoController_(VeadoController):
         self._watchdog = VeadoPollingWatchdog(self)
 
         self._conn: VTConnection = None
+        self._conn_lock = threading.RLock()
+        self._route_lock = threading.RLock()
+        self._announced: tuple[bool, str] = (False, "")
+        self._has_connected = False
+        self.reconnect_count = 0
+        self._handover_pending = False
+        self._generation = 0
+        """Bumped by every `_restart`, so a probe can tell the config changed under it."""
+        self._reprobe_timer: threading.Timer | None = None
+
+        self._inbound = InboundQueue()
+        self._dispatch_thread = threading.Thread(target=self._dispatcher, name=DISPATCH_THREAD_NAME, daemon=True)
+        self._dispatch_thread.start()
+
+        self._sequencer = Sequencer(self.send_requests, self.publish)
+        self._offline = OfflineBuffer()
+        self._pending = PendingRequests()
+        self._response_cids: dict[ResponseKey, str] = {}
+        """When tracing, the correlation id of the last request sent per expected answer."""
+
+        self.event_sink: Callable[[Event], bool] | None = None
+        """
+        Preferred route for events to the frontend (see ADR-02). Returns False
+        if it couldn't deliver, in which case RPyC is used.
+        """
 
     @property
     def config(self) -> VeadoSCConnectionConfig:
         return self._config
 
     def set_config(self, value):
+        # Over RPyC `value` is a netref into the frontend, which dies with it; the
+        # config has to outlive the frontend for a later one to adopt this backend.
+        value = VeadoSCConnectionConfig.from_dict(dict(value.to_dict()))
         if self._config == value:
             return
 
-        self._config = value
+        previous, self._config = self._config, value
+        if not value.offline_buffer:
+            self._offline.clear()
+        if value.same_connection(previous):
+            # Only the offline settings changed, and those are read per request.
+            return
         self._restart()
 
     @property
@@ -110,54 +244,380 @@ class VeadoController_(VeadoController):
         return bool(self._conn and self._conn.connected)
 
     def _restart(self):
+        """
+        Applies a new config. The current connection, if any, stays up until its
+        replacement is ready (see `_handover`).
+        """
+        self._generation += 1
+        self._cancel_reprobe()
         self._watchdog.stop_poller()
-        self.terminate_connection(force=True)
+        # Until a connection under the new config takes over, the current one is only a stand-in.
+        self._handover_pending = True
 
         if self.config.smart_connect:
             self._watchdog.start_poller(self.config.instances_dir)
+            # If the new instances dir advertises nothing, no proposal will come to settle the handover.
+            self._schedule_reprobe()
 
         else:
-            instance = VTInstance(veado_id="", hostname=self.config.hostname, port=self.config.port)
-            self.propose_connection(instance)
+            # Don't hold up the frontend (and its RPyC call) while the new connection opens.
+            threading.Thread(
+                target=self.propose_connection, args=(self._direct_instance(),), name=HANDOVER_THREAD_NAME, daemon=True
+            ).start()
+
+    def _direct_instance(self) -> VTInstance:
+        return VTInstance(veado_id="", hostname=self.config.hostname, port=self.config.port)
 
     def propose_connection(self, instance: VTInstance):
-        if self._conn:
-            log.warning(f"Received request to connect to {instance}, but already talking to {self._conn.conf}")
-            return
+        with self._conn_lock:
+            generation = self._generation
+            if not self.config.smart_connect:
+                if instance != self._direct_instance():
+                    log.info(f"Ignoring proposal to connect to {instance} while using direct connect")
+                    return
+                if self._conn and self._conn.conf == instance:
+                    log.info(f"Already talking to {instance}")
+                    self._handover_pending = False
+                    return
+
+                log.info(f"Accepting proposal to connect to {instance}")
+            elif self._conn and self._conn.connected and not self._handover_pending:
+                log.warning(f"Received request to connect to {instance}, but already talking to {self._conn.conf}")
+                return
 
-        log.info(f"Accepting proposal to connect to {instance}")
-        self._conn = VTConnection(self, instance)
+        if self.config.smart_connect:
+            self._probe_and_connect(instance)
+        else:
+            self._handover(instance, generation)
+
+    def handover_connection(self, old: VTInstance, new: VTInstance):
+        with self._conn_lock:
+            generation = self._generation
+            moved = self._conn and self._conn.conf == old
+            if not moved:
+                self.terminate_connection(old)
+
+        if moved:
+            log.info(f"Instance {old} moved to {new}")
+            self._handover(new, generation)
+        else:
+            self.propose_connection(new)
 
-    def terminate_connection(self, instance: VTInstance | None = None, force: bool = False):
-        if not self._conn:
-            log.info("Nothing to terminate")
+    def _probe_and_connect(self, proposed: VTInstance | None = None):
+        """
+        Probes every known instance concurrently and connects to the best one
+        that answers, rather than committing to whichever was proposed first.
+        If none answer, tries again after `REPROBE_WAIT` seconds.
+
+        Probing can take over a second, so `_conn_lock` is only taken to act on
+        the result, and the result is dropped if the config changed meanwhile.
+        """
+        generation = self._generation
+        candidates = self._watchdog.candidates()
+        if proposed and proposed not in [c for c, _ in candidates]:
+            # The poller may not have published its file list yet.
+            candidates.append((proposed, int(time.time())))
+
+        winner = probe_instances(candidates)
+        with self._conn_lock:
+            if generation != self._generation:
+                log.info("Config changed while probing, discarding the result")
+                if winner:
+                    winner.ws.close()
+                return
+
+            if not winner:
+                log.info(f"No reachable veadotube instance among {len(candidates)} candidate(s)")
+                if self._handover_pending:
+                    # The config changed and nothing under the new config answered.
+                    self._handover_pending = False
+                    self.terminate_connection(force=True)
+                self._schedule_reprobe()
+                return
+
+            current = self._conn
+            if current and current.connected and (current.conf == winner.instance or not self._handover_pending):
+                # Already there, or a concurrent probe connected first.
+                if current.conf == winner.instance:
+                    self._handover_pending = False
+                winner.ws.close()
+                return
+
+        self._handover(winner.instance, generation, ws=winner.ws)
+
+    def _handover(self, instance: VTInstance, generation: int, ws: client.ClientConnection | None = None):
+        """
+        Make-before-break: opens and subscribes a connection to `instance`
+        while the current one keeps serving, then switches routing and closes
+        the old connection. Events from a connection are only forwarded while
+        it is the active one, so the old connection's teardown is never seen by
+        the model.
+
+        The wait for the new connection happens outside `_conn_lock`. If it
+        isn't ready within `HANDOVER_TIMEOUT` while the current one is up, what
+        happens depends on why we're switching: after a config change, the old
+        instance is no longer wanted and is dropped anyway (the new connection
+        keeps retrying); otherwise the new one is abandoned and the handover
+        retried after `REPROBE_WAIT`.
+
+        :param generation: `_generation` when the handover was decided on. If
+            the config has changed since, the handover is dropped.
+        """
+        new = VTConnection(self, instance, ws=ws)
+
+        with self._conn_lock:
+            current = self._conn
+        ready = not (current and current.connected) or new.ready.wait(HANDOVER_TIMEOUT)
+
+        with self._conn_lock:
+            if generation != self._generation or self._conn is not current:
+                log.info(f"Handover to {instance} superseded while it was opening")
+                new.terminate()
+                return
+
+            if not ready and not self._handover_pending:
+                # Switching now would drop a working connection for one that may never come up.
+                log.warning(f"{instance} was not ready after {HANDOVER_TIMEOUT}s, staying on {current.conf}")
+                journal.record(journal.CONN, f"handover {current.conf} -> {instance} abandoned")
+                new.terminate()
+                self._schedule_reprobe()
+                return
+
+            if not ready:
+                log.warning(f"{instance} was not ready after {HANDOVER_TIMEOUT}s, dropping {current.conf} anyway")
+                if self.config.smart_connect:
+                    # Another advertised instance may answer sooner.
+                    self._schedule_reprobe()
+
+            with self._route_lock:
+                old, self._conn = self._conn, new
+                # Always re-announce so the model resyncs against the new instance.
+                self._announce(new.connected, instance.veado_id, force=new.connected)
+            self._handover_pending = False
+
+        if old:
+            log.info(f"Handed over from {old.conf} to {instance}")
+            journal.record(journal.CONN, f"handover {old.conf} -> {instance}")
+            old.terminate()
+
+    def _schedule_reprobe(self):
+        self._cancel_reprobe()
+        self._reprobe_timer = threading.Timer(REPROBE_WAIT, self._reprobe)
+        self._reprobe_timer.name = REPROBE_THREAD_NAME
+        self._reprobe_timer.daemon = True
+        self._reprobe_timer.start()
+
+    def _cancel_reprobe(self):
+        if self._reprobe_timer:
+            self._reprobe_timer.cancel()
+            self._reprobe_timer = None
+
+    def _reprobe(self):
+        if not self.config.smart_connect:
+            # A handover to the configured instance fell through; try it again.
+            self.propose_connection(self._direct_instance())
             return
+        with self._conn_lock:
+            if self.connected and not self._handover_pending:
+                return
+        self._probe_and_connect()
 
-        if not force and instance != self._conn.conf:
-            log.info(f"Received request to terminate {instance}, but connected to {self._conn.conf}")
+    def terminate_connection(self, instance: VTInstance | None = None, force: bool = False):
+        with self._conn_lock:
+            if not self._conn:
+                log.info("Nothing to terminate")
+                return
+
+            if not force and instance != self._conn.conf:
+                log.info(f"Received request to terminate {instance}, but connected to {self._conn.conf}")
+                return
+
+            log.info(f"Terminating {self._conn.conf}")
+            with self._route_lock:
+                old, self._conn = self._conn, None
+                self._announce(False, old.conf.veado_id)
+            old.terminate()
+
+            if not force and self.config.smart_connect:
+                # Another advertised instance may still be reachable.
+                self._schedule_reprobe()
+
+    def _announce(self, connected: bool, veado_id: str, force: bool = False):
+        if not force and self._announced == (connected, veado_id):
             return
 
-        log.info(f"Terminating {self._conn.conf}")
-        self._conn.terminate()
-        self._conn = None
+        if connected and not self._announced[0]:
+            if self._has_connected:
+                self.reconnect_count += 1
+            self._has_connected = True
+
+        self._announced = (connected, veado_id)
+        if not connected:
+            self._pending.fail_all(ConnectionError(f"Disconnected from {veado_id or 'veadotube'}"))
+        journal.record(journal.CONN, f"connected={connected} veado_id={veado_id!r}")
+        self.publish(ControllerConnectedEvent(connected, veado_id))
+
+    def publish_from(self, conn: VTConnection, event: Event):
+        """
+        Publishes an event raised by `conn`, if `conn` is the active connection.
+        """
+        with self._route_lock:
+            if conn is not self._conn:
+                return
+
+            if isinstance(event, ControllerConnectedEvent):
+                self._announce(event.is_connected, event.veado_id)
+            else:
+                self.publish(event)
+
+    def on_recv(self, message, conn: VTConnection | None = None):
+        if conn is not None and conn is not self._conn:
+            return
 
-    def on_recv(self, message):
-        event = model_event_factory(message)
+        cid = None
+        with tracer.span("VeadoController.on_recv") as span:
+            event = model_event_factory(message)
+            if event and tracer.enabled:
+                # Continue the trace of the request this answers, if any.
+                cid = span.cid = self._response_cid(event) or tracer.new_correlation_id()
         if event:
-            self.notify(event=event)
+            event.correlation_id = cid
+            event.received_at = time.monotonic()
+            self._pending.resolve(event)
+            self.publish(event)
+
+    def _expect_responses(self, batch: tuple[str, ...], results: tuple[bool, ...], cid: str | None):
+        if not (tracer.enabled and cid):
+            return
+        for reqstr, sent in zip(batch, results):
+            if sent and (key := response_key_of(reqstr)):
+                self._response_cids[key] = cid
+
+    def _response_cid(self, event: Event) -> str | None:
+        # Most specific first, e.g. a `set` for this state before any `peek`.
+        for key in reversed(answer_keys(event)):
+            if cid := self._response_cids.pop(key, None):
+                return cid
+        return None
+
+    def publish(self, event: Event):
+        """
+        Queues an event for delivery to the frontend. Called from the websocket
+        reader so that slow consumers never hold up reading the next frame.
+        """
+        self._inbound.put(event)
+
+    def get_queue_stats(self) -> dict:
+        return self._inbound.stats()
+
+    def get_trace_events(self) -> str:
+        return tracer.export_json()
+
+    def dump_journal(self) -> str:
+        path = journal.dump()
+        log.info(f"Wrote journal to {path}")
+        return str(path)
+
+    def shutdown(self):
+        self._cancel_reprobe()
+        self._watchdog.shutdown()
+        self._sequencer.stop_all()
+        with self._conn_lock:
+            with self._route_lock:
+                old, self._conn = self._conn, None
+            if old:
+                old.terminate()
+
+        self._pending.close()
+        self._inbound.put(_SHUTDOWN)
+        if self._dispatch_thread is not threading.current_thread():
+            self._dispatch_thread.join()
+
+    def _dispatcher(self):
+        log.info("Event dispatcher started")
+        while (event := self._inbound.get()) is not _SHUTDOWN:
+            try:
+                with tracer.span("VeadoController.notify", event.correlation_id):
+                    self.notify(event=event)
+            except Exception as e:
+                log.warning(f"Caught exception {e=} while dispatching {type(event).__name__}")
+        log.info("Event dispatcher terminating")
 
     def send_request(self, request: Request) -> bool:
+        # `request` is usually an RPyC proxy, so only read the id when tracing.
+        cid = request.correlation_id if tracer.enabled else None
+        with tracer.span("VeadoController.send_request", cid):
+            try:
+                sent = self._conn.send_request(request)
+            except AttributeError:
+                return False
+            if sent and cid and (key := request.response_key()):
+                self._response_cids[key] = cid
+            return sent
+
+    def send_requests(
+        self,
+        batch: Sequence[Request | str],
+        correlation_id: str | None = None,
+        replayable: tuple[bool, ...] | None = None,
+    ) -> tuple[bool, ...]:
+        with tracer.span("VeadoController.send_requests", correlation_id, count=len(batch)):
+            batch = serialize_batch(batch)
+            conn = self._conn
+            results = conn.send_requests(batch, correlation_id) if conn else (False,) * len(batch)
+            self._expect_responses(batch, results, correlation_id)
+            if replayable and not all(results):
+                results = self._buffer_offline(batch, results, replayable)
+            return results
+
+    def request(self, request: Request, timeout: float = REQUEST_TIMEOUT) -> RequestFuture:
+        return self._pending.send([request], self.send_requests, timeout)[0]
+
+    def get_request_stats(self) -> dict:
+        return self._pending.stats()
+
+    def _buffer_offline(
+        self, batch: tuple[str, ...], results: tuple[bool, ...], replayable: tuple[bool, ...]
+    ) -> tuple[bool, ...]:
+        """
+        Holds the latest failed, replayable request for `take_offline_request`,
+        if the offline buffer is enabled.
 
-        try:
-            return self._conn.send_request(request)
-        except AttributeError:
-            return False
+        :returns: `results`, with every failed replayable request marked as
+            sent; the held request supersedes them.
+        """
+        config = self._config
+        if not (config and config.offline_buffer):
+            return results
+
+        held = [i for i, (ok, replay) in enumerate(zip(results, replayable)) if not ok and replay]
+        if not held:
+            return results
 
-    def notify(self, *args, **kwargs):
+        self._offline.put(batch[held[-1]], float(config.offline_ttl))
+        return tuple(ok or replay for ok, replay in zip(results, replayable))
+
+    def take_offline_request(self) -> str | None:
+        """
+        Called by a connection once subscribed; see `OfflineBuffer`.
+        """
+        return self._offline.take()
+
+    def play_sequence(self, sequence_id: str, steps: Sequence[tuple[str, float]], loop: bool = False) -> bool:
+        return self._sequencer.play(sequence_id, steps, loop)
+
+    def stop_sequence(self, sequence_id: str):
+        self._sequencer.stop(sequence_id)
+
+    def notify(self, event: Event):
         """
         Proxies events from this backend into the VeadoSC frontend.
         Should conform to the interface of `gg_kekemui_veadosc.observer.Subject`.
 
-        See ADR-01 for why this exists.
+        See ADR-01 for why this exists, and ADR-02 for `event_sink`. `frontend`
+        is None once the frontend that launched this backend is gone (ADR-03).
         """
-        self.frontend.update(*args, **kwargs)
+        if self.event_sink and self.event_sink(event):
+            return
+        if self.frontend is not None:
+            self.frontend.update(event)
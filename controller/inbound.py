@@ -0,0 +1,129 @@
+import threading
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field
+from enum import Enum
+from itertools import count
+from typing import Hashable
+
+from loguru import logger as log
+
+from gg_kekemui_veadosc.controller.types import LinkQualityEvent
+from gg_kekemui_veadosc.model.events import ActiveStateEvent, ThumbnailEvent
+from gg_kekemui_veadosc.observer import Event
+
+
+class QueuePolicy(Enum):
+    NEVER_DROP = 1
+    """Every event is delivered. The producer blocks if the queue is full."""
+    LATEST_WINS = 2
+    """Only the newest pending event of this type is delivered."""
+    DEDUPE = 3
+    """Only the newest pending event per type and `state_id` is delivered."""
+
+
+POLICIES: dict[type[Event], QueuePolicy] = {
+    ActiveStateEvent: QueuePolicy.LATEST_WINS,
+    LinkQualityEvent: QueuePolicy.LATEST_WINS,
+    ThumbnailEvent: QueuePolicy.DEDUPE,
+}
+"""Anything not listed here (e.g., `AllStatesEvent`) is `NEVER_DROP`."""
+
+MAX_DEPTH = 256
+
+
+@dataclass
+class InboundQueueStats:
+    depth: int = 0
+    high_water: int = 0
+    enqueued: int = 0
+    coalesced: int = 0
+    dropped: dict[str, int] = field(default_factory=dict)
+
+
+class InboundQueue:
+    """
+    Bounded hand-off between the websocket reader and event dispatch.
+
+    Pending events are coalesced according to their `QueuePolicy`, so a burst of
+    `peek` or `thumb` frames behind a slow consumer collapses into the events
+    that still matter. If the queue is full, droppable events are discarded and
+    counted; `NEVER_DROP` events make the producer wait for room instead.
+    """
+
+    def __init__(self, max_depth: int = MAX_DEPTH):
+        self._max_depth = max_depth
+        self._pending: OrderedDict[Hashable, Event] = OrderedDict()
+        self._cond = threading.Condition()
+        self._seq = count()
+        self._stats = InboundQueueStats()
+        self._closed = False
+
+    def _key_for(self, event: Event) -> tuple[QueuePolicy, Hashable]:
+        policy = POLICIES.get(type(event), QueuePolicy.NEVER_DROP)
+        if policy == QueuePolicy.LATEST_WINS:
+            return policy, type(event)
+        elif policy == QueuePolicy.DEDUPE:
+            return policy, (type(event), event.state_id)
+        else:
+            return policy, next(self._seq)
+
+    def put(self, event: Event):
+        with self._cond:
+            if self._closed:
+                return
+            policy, key = self._key_for(event)
+
+            if key in self._pending:
+                # Delivered in the replacement's place, not the original's, so it can't overtake
+                # events that arrived in between.
+                self._pending[key] = event
+                self._pending.move_to_end(key)
+                self._stats.coalesced += 1
+                return
+
+            if len(self._pending) >= self._max_depth:
+                if policy != QueuePolicy.NEVER_DROP:
+                    name = type(event).__name__
+                    self._stats.dropped[name] = self._stats.dropped.get(name, 0) + 1
+                    log.warning(f"Inbound queue full, dropping {name}")
+                    return
+                self._cond.wait_for(lambda: self._closed or len(self._pending) < self._max_depth)
+                if self._closed:
+                    return
+
+            self._pending[key] = event
+            self._stats.enqueued += 1
+            self._stats.high_water = max(self._stats.high_water, len(self._pending))
+            self._cond.notify_all()
+
+    def get(self) -> Event | None:
+        """
+        Blocks until an event is available, then returns the oldest one.
+
+        :returns: None once the queue is closed and drained.
+        """
+        with self._cond:
+            self._cond.wait_for(lambda: self._pending or self._closed)
+            if not self._pending:
+                return None
+            _, event = self._pending.popitem(last=False)
+            self._cond.notify_all()
+            return event
+
+    def close(self):
+        """
+        Stops taking events, without waiting for room as a `put` might. Events
+        already queued are still delivered.
+        """
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    @property
+    def depth(self) -> int:
+        return len(self._pending)
+
+    def stats(self) -> dict:
+        with self._cond:
+            self._stats.depth = len(self._pending)
+            return asdict(self._stats)
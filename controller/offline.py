@@ -0,0 +1,49 @@
+import threading
+import time
+
+from gg_kekemui_veadosc.diagnostics import journal
+
+
+class OfflineBuffer:
+    """
+    Holds the most recent request that couldn't be sent because veadotube was
+    unreachable, for replay once a connection is back.
+
+    Only the latest request is kept, and only until its deadline. Replaying
+    every press made during an outage would flash through stale states. A
+    press from long ago would be just as surprising as a lost one.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending: tuple[str, float] | None = None
+
+    def put(self, reqstr: str, ttl: float):
+        """
+        :param reqstr: The serialized request.
+        :param ttl: Seconds from now after which the request is discarded.
+        """
+        with self._lock:
+            self._pending = (reqstr, time.monotonic() + ttl)
+        journal.record(journal.CONN, f"buffered offline ({ttl}s): {reqstr}")
+
+    def take(self) -> str | None:
+        """
+        Removes and returns the held request, if it hasn't expired.
+        """
+        with self._lock:
+            pending, self._pending = self._pending, None
+
+        if not pending:
+            return None
+
+        reqstr, deadline = pending
+        if time.monotonic() > deadline:
+            journal.record(journal.CONN, f"dropped expired offline request: {reqstr}")
+            return None
+        journal.record(journal.CONN, f"replaying offline request: {reqstr}")
+        return reqstr
+
+    def clear(self):
+        with self._lock:
+            self._pending = None
@@ -0,0 +1,249 @@
+import heapq
+import threading
+import time
+from concurrent.futures import Future, InvalidStateError
+from dataclasses import asdict, dataclass
+from itertools import count
+from typing import Callable, Sequence
+
+from loguru import logger as log
+
+from gg_kekemui_veadosc.controller.types import Request, ResponseKey
+from gg_kekemui_veadosc.observer import Event, event_class
+
+REQUEST_TIMEOUT = 5
+TIMEOUT_THREAD_NAME = "gg_kekemui_veadosc::request_timeouts"
+
+
+class RequestFuture(Future):
+    """
+    Resolves to the event that answered `request`, or fails with
+    `TimeoutError`, or `ConnectionError` if it couldn't be sent or the
+    connection dropped first. Cancel it to stop waiting.
+    """
+
+    def __init__(self, request: Request, key: ResponseKey):
+        super().__init__()
+        self.request_name = type(request).__name__
+        self.key = key
+        self.sent_at = time.monotonic()
+        """When the request was handed to be sent; see `Event.received_at`."""
+        self.latency_ms: float | None = None
+        """Time from sending to the answer arriving, once resolved."""
+
+
+@dataclass
+class RequestStats:
+    sent: int = 0
+    resolved: int = 0
+    timed_out: int = 0
+    failed: int = 0
+    cancelled: int = 0
+    total_latency_ms: float = 0.0
+    max_latency_ms: float = 0.0
+
+    def as_dict(self) -> dict:
+        stats = asdict(self)
+        stats["mean_latency_ms"] = round(self.total_latency_ms / self.resolved, 3) if self.resolved else 0.0
+        return stats
+
+
+def answer_keys(event: Event) -> list[ResponseKey]:
+    """
+    :returns: The `ResponseKey`s of the requests that `event` answers.
+    """
+    cls = event_class(event)
+    keys = [(cls, None)]
+    state_id = getattr(event, "state_id", None)
+    if state_id is not None:
+        keys.append((cls, state_id))
+    return keys
+
+
+def when_all(futures: Sequence[Future], callback: Callable[[Sequence[Future]], None]):
+    """
+    Calls `callback(futures)` once every future is done, from whichever thread
+    finishes the last one.
+    """
+    if not futures:
+        callback(futures)
+        return
+
+    remaining = [len(futures)]
+    lock = threading.Lock()
+
+    def done(_):
+        with lock:
+            remaining[0] -= 1
+            last = remaining[0] == 0
+        if last:
+            callback(futures)
+
+    for future in futures:
+        future.add_done_callback(done)
+
+
+class PendingRequests:
+    """
+    Matches requests to the inbound events that answer them (see
+    `Request.response_key`).
+
+    veadotube replies carry no request id, so a request is answered by the
+    first matching event that veadotube sent after the request was sent,
+    whether or not in reply; e.g., any `peek` answers a `PeekRequest`. Every
+    request waiting on that match is resolved by it. Events read before the
+    request went out (by `Event.received_at`) don't answer it, even when they
+    are delivered after.
+    """
+
+    def __init__(self):
+        self._pending: dict[ResponseKey, list[RequestFuture]] = {}
+        self._deadlines: list[tuple[float, int, RequestFuture]] = []
+        self._seq = count()
+        self._cond = threading.Condition()
+        self._thread: threading.Thread | None = None
+        self._closed = False
+        self._stats: dict[str, RequestStats] = {}
+
+    def send(
+        self,
+        batch: Sequence[Request],
+        send: Callable[[Sequence[Request]], Sequence[bool]],
+        timeout: float = REQUEST_TIMEOUT,
+    ) -> list[RequestFuture]:
+        """
+        Sends `batch` with `send` and tracks each request that expects an
+        answer. Requests that `send` reports as unsent fail straight away.
+
+        :returns: One future per request, in order. Requests that expect no
+            answer resolve to None once sent.
+        """
+        futures = [self.track(request, timeout) for request in batch]
+        sent_at = time.monotonic()
+        for future in futures:
+            future.sent_at = sent_at
+        for future, sent in zip(futures, send(batch)):
+            if not sent:
+                self._settle(future, error=ConnectionError(f"{future.request_name} was not sent"))
+            elif future.key is None:
+                self._settle(future, None)
+        return futures
+
+    def track(self, request: Request, timeout: float = REQUEST_TIMEOUT) -> RequestFuture:
+        """
+        Starts waiting for the answer to `request`, which the caller then
+        sends. Prefer `send`.
+        """
+        key = request.response_key()
+        future = RequestFuture(request, key)
+        with self._cond:
+            self._stats.setdefault(future.request_name, RequestStats()).sent += 1
+            if key is not None:
+                self._pending.setdefault(key, []).append(future)
+                heapq.heappush(self._deadlines, (time.monotonic() + timeout, next(self._seq), future))
+                self._start()
+                self._cond.notify()
+        future.add_done_callback(self._forget)
+        return future
+
+    def resolve(self, event: Event):
+        """
+        Resolves every request answered by `event`.
+        """
+        received_at = getattr(event, "received_at", None)
+        answered = []
+        with self._cond:
+            for key in answer_keys(event):
+                waiting = self._pending.pop(key, [])
+                later = [f for f in waiting if received_at is not None and f.sent_at > received_at]
+                answered += [f for f in waiting if f not in later]
+                if later:
+                    self._pending[key] = later
+        for future in answered:
+            self._settle(future, event)
+
+    def fail_all(self, error: Exception):
+        """
+        Fails every pending request, e.g. with `ConnectionError` once the
+        connection they were sent on is gone.
+        """
+        with self._cond:
+            pending = [future for futures in self._pending.values() for future in futures]
+            self._pending.clear()
+        for future in pending:
+            self._settle(future, error=error)
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        self.fail_all(ConnectionError("Closed"))
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join()
+
+    @property
+    def depth(self) -> int:
+        with self._cond:
+            return sum(len(futures) for futures in self._pending.values())
+
+    def stats(self) -> dict[str, dict]:
+        """
+        :returns: Outcomes and answer latency per request type.
+        """
+        with self._cond:
+            return {name: stats.as_dict() for name, stats in self._stats.items()}
+
+    def _settle(self, future: RequestFuture, result: Event | None = None, error: Exception | None = None):
+        if error is None:
+            future.latency_ms = (time.monotonic() - future.sent_at) * 1000
+        try:
+            if error is None:
+                future.set_result(result)
+            else:
+                future.set_exception(error)
+        except InvalidStateError:
+            pass  # Already cancelled or settled.
+
+    def _forget(self, future: RequestFuture):
+        with self._cond:
+            waiting = self._pending.get(future.key)
+            if waiting and future in waiting:
+                waiting.remove(future)
+                if not waiting:
+                    del self._pending[future.key]
+
+            stats = self._stats[future.request_name]
+            if future.cancelled():
+                stats.cancelled += 1
+            elif isinstance(future.exception(), TimeoutError):
+                stats.timed_out += 1
+            elif future.exception():
+                stats.failed += 1
+            else:
+                stats.resolved += 1
+                stats.total_latency_ms += future.latency_ms
+                stats.max_latency_ms = max(stats.max_latency_ms, future.latency_ms)
+
+    def _start(self):
+        if not self._thread:
+            self._thread = threading.Thread(target=self._expire, name=TIMEOUT_THREAD_NAME, daemon=True)
+            self._thread.start()
+
+    def _expire(self):
+        while True:
+            with self._cond:
+                while not self._closed and not self._deadlines:
+                    self._cond.wait()
+                if self._closed:
+                    break
+
+                deadline, _, future = self._deadlines[0]
+                remaining = deadline - time.monotonic()
+                if remaining > 0:
+                    self._cond.wait(remaining)
+                    continue
+                heapq.heappop(self._deadlines)
+
+            if not future.done():
+                log.debug(f"{future.request_name} timed out")
+                self._settle(future, error=TimeoutError(f"No answer to {future.request_name}"))
@@ -0,0 +1,113 @@
+import threading
+import time
+from dataclasses import dataclass
+from queue import Empty, SimpleQueue
+
+from loguru import logger as log
+from websockets.exceptions import InvalidHandshake, InvalidURI
+from websockets.sync import client
+
+from gg_kekemui_veadosc.controller.types import VTInstance
+
+PROBE_TIMEOUT = 1.5
+PROBE_GRACE = 0.05
+PROBE_THREAD_NAME = "gg_kekemui_veadosc::probe"
+
+
+def open_websocket(instance: VTInstance, open_timeout: float | None = 10) -> client.ClientConnection:
+    # LinkMonitor takes care of keepalive.
+    return client.connect(
+        f"ws://{instance.hostname}:{instance.port}?n=gg_kekemui_veadosc",
+        open_timeout=open_timeout,
+        ping_interval=None,
+    )
+
+
+@dataclass
+class ProbeResult:
+    instance: VTInstance
+    modified: int
+    rtt: float
+    ws: client.ClientConnection
+
+
+class _Probe:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.decided = False
+        self.results: SimpleQueue[ProbeResult | None] = SimpleQueue()
+
+    def run(self, instance: VTInstance, modified: int, timeout: float):
+        start = time.monotonic()
+        try:
+            ws = open_websocket(instance, open_timeout=timeout)
+        except (InvalidURI, InvalidHandshake, OSError, TimeoutError):
+            log.debug(f"Probe of {instance} failed")
+            self.results.put(None)
+            return
+
+        result = ProbeResult(instance=instance, modified=modified, rtt=time.monotonic() - start, ws=ws)
+        with self.lock:
+            if not self.decided:
+                self.results.put(result)
+                return
+        # Finished after a winner was picked.
+        ws.close()
+
+
+def probe_instances(candidates: list[tuple[VTInstance, int]], timeout: float = PROBE_TIMEOUT) -> ProbeResult | None:
+    """
+    Attempts a websocket handshake with every candidate at once.
+
+    Once the first handshake completes, stragglers get `PROBE_GRACE` seconds to
+    finish; the winner is then the freshest instance file, with handshake RTT
+    breaking ties. Every other socket is closed.
+
+    :param candidates: Instances paired with their instance file's mtime.
+    :returns: The winning result, with its websocket still open, or None if no
+        candidate completed a handshake within `timeout`.
+    """
+    if not candidates:
+        return None
+
+    probe = _Probe()
+    for instance, modified in candidates:
+        threading.Thread(
+            target=probe.run, args=(instance, modified, timeout), name=PROBE_THREAD_NAME, daemon=True
+        ).start()
+
+    finished: list[ProbeResult] = []
+    outstanding = len(candidates)
+    deadline = time.monotonic() + timeout
+    while outstanding:
+        if finished:
+            deadline = min(deadline, time.monotonic() + PROBE_GRACE)
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        try:
+            result = probe.results.get(timeout=remaining)
+        except Empty:
+            break
+        outstanding -= 1
+        if result:
+            finished.append(result)
+
+    with probe.lock:
+        probe.decided = True
+    # Anything that landed between the last get and the decision
+    while not probe.results.empty():
+        result = probe.results.get()
+        if result:
+            finished.append(result)
+
+    if not finished:
+        return None
+
+    finished.sort(key=lambda r: (-r.modified, r.rtt))
+    winner, losers = finished[0], finished[1:]
+    for loser in losers:
+        loser.ws.close()
+
+    log.info(f"Probed {len(candidates)} instance(s), selected {winner.instance} ({winner.rtt * 1000:.0f} ms)")
+    return winner
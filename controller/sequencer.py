@@ -0,0 +1,202 @@
+import threading
+import time
+from typing import Callable, Sequence
+
+from loguru import logger as log
+
+from gg_kekemui_veadosc.controller.types import SequenceEvent, SetActiveStateRequest, serialize_batch
+from gg_kekemui_veadosc.observer import Event
+
+SEQUENCE_THREAD_NAME = "gg_kekemui_veadosc::sequence"
+
+SPIN_WINDOW = 0.002
+"""
+`Event.wait` can overshoot by a millisecond or more; the last stretch before
+each deadline is busy-waited instead.
+"""
+MIN_STEP = 0.01
+DRIFT_WARNING_MS = 10
+
+Step = tuple[str, float]
+"""A state id and how long to hold it, in seconds."""
+
+
+class SequencePlayback:
+    """
+    Plays one sequence on its own thread.
+
+    Each step's deadline is computed from the start of the pass, not from when
+    the previous step was actually sent, so per-step lateness doesn't
+    accumulate over the sequence (or across loops).
+    """
+
+    def __init__(
+        self,
+        sequence_id: str,
+        steps: tuple[Step, ...],
+        loop: bool,
+        send: Callable[[tuple[str, ...]], tuple[bool, ...]],
+        publish: Callable[[Event], None],
+        on_exit: Callable[["SequencePlayback"], None],
+        replaces: "SequencePlayback | None" = None,
+    ):
+        """
+        :param replaces: A playback of the same sequence to stop, and wait for,
+            before starting; from this playback's thread, not the caller's.
+        """
+        self.sequence_id = sequence_id
+        self.steps = steps
+        self.loop = loop
+
+        self._send = send
+        self._publish = publish
+        self._on_exit = on_exit
+        self._replaces = replaces
+
+        # Serialize once up front, so a step costs no more than the send itself.
+        self._wires = serialize_batch([SetActiveStateRequest(state_id) for state_id, _ in steps])
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=SEQUENCE_THREAD_NAME, daemon=True)
+
+        self.passes = 0
+        self.played = 0
+        self.failed = 0
+        self._drift_total_ms = 0.0
+        self._drift_max_ms = 0.0
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def join(self, timeout: float | None = None):
+        self._thread.join(timeout)
+
+    def _wait_until(self, deadline: float) -> bool:
+        """
+        :returns: False if stopped before `deadline`.
+        """
+        remaining = deadline - time.monotonic() - SPIN_WINDOW
+        if remaining > 0 and self._stop.wait(remaining):
+            return False
+        while time.monotonic() < deadline:
+            if self._stop.is_set():
+                return False
+        return not self._stop.is_set()
+
+    def _run(self):
+        if self._replaces:
+            # Its final status must land before this one's first.
+            self._replaces.stop()
+            self._replaces.join()
+            self._replaces = None
+        if self._stop.is_set():
+            # Stopped, or itself replaced, before it began.
+            self._on_exit(self)
+            return
+
+        log.info(f"Playing sequence {self.sequence_id} ({len(self.steps)} steps, {self.loop=})")
+        self._publish(self.status(running=True))
+        deadline = time.monotonic()
+        try:
+            while True:
+                for wire, (state_id, duration) in zip(self._wires, self.steps):
+                    if not self._wait_until(deadline):
+                        return
+
+                    drift_ms = (time.monotonic() - deadline) * 1000
+                    if not self._send((wire,))[0]:
+                        self.failed += 1
+                    self._record_drift(drift_ms)
+                    deadline += duration
+
+                self.passes += 1
+                if not self.loop:
+                    # Hold the final step for its full duration; `finally` reports done.
+                    self._wait_until(deadline)
+                    return
+                self._publish(self.status(running=True))
+        except Exception as e:
+            log.warning(f"Sequence {self.sequence_id} aborted: {e=}")
+        finally:
+            self._publish(self.status(running=False))
+            self._on_exit(self)
+
+    def _record_drift(self, drift_ms: float):
+        self.played += 1
+        self._drift_total_ms += drift_ms
+        self._drift_max_ms = max(self._drift_max_ms, drift_ms)
+        if drift_ms > DRIFT_WARNING_MS:
+            log.warning(f"Sequence {self.sequence_id} step sent {drift_ms:.1f}ms late")
+
+    def status(self, running: bool) -> SequenceEvent:
+        return SequenceEvent(
+            sequence_id=self.sequence_id,
+            running=running,
+            passes=self.passes,
+            steps_played=self.played,
+            steps_failed=self.failed,
+            mean_drift_ms=self._drift_total_ms / self.played if self.played else 0.0,
+            max_drift_ms=self._drift_max_ms,
+        )
+
+
+class Sequencer:
+    """
+    Runs timed state sequences in the backend, next to the websocket, so step
+    timing doesn't depend on frontend key events or RPyC latency. At most one
+    playback per `sequence_id`; starting it again restarts it.
+    """
+
+    def __init__(self, send: Callable[[tuple[str, ...]], tuple[bool, ...]], publish: Callable[[Event], None]):
+        self._send = send
+        self._publish = publish
+        self._playbacks: dict[str, SequencePlayback] = {}
+        self._lock = threading.Lock()
+
+    def play(self, sequence_id: str, steps: Sequence[Step], loop: bool = False) -> bool:
+        """
+        :param sequence_id: Caller-chosen id; reported back in `SequenceEvent`.
+        :param steps: (state_id, seconds) pairs. Durations below `MIN_STEP`
+            are raised to it, so a looping sequence can't spin.
+        :param loop: Repeat until stopped.
+
+        :returns: False if `steps` is empty.
+        """
+        # Copy out of any RPyC proxy up front, rather than touching it per step.
+        steps = tuple((str(state_id), max(float(duration), MIN_STEP)) for state_id, duration in steps)
+        if not steps:
+            return False
+
+        with self._lock:
+            previous = self._playbacks.get(sequence_id)
+            playback = SequencePlayback(
+                sequence_id, steps, loop, self._send, self._publish, self._on_exit, replaces=previous
+            )
+            self._playbacks[sequence_id] = playback
+
+        playback.start()
+        return True
+
+    def stop(self, sequence_id: str):
+        with self._lock:
+            playback = self._playbacks.get(sequence_id)
+        if playback:
+            playback.stop()
+
+    def stop_all(self):
+        with self._lock:
+            playbacks = list(self._playbacks.values())
+        for playback in playbacks:
+            playback.stop()
+
+    @property
+    def playing(self) -> list[str]:
+        with self._lock:
+            return list(self._playbacks.keys())
+
+    def _on_exit(self, playback: SequencePlayback):
+        with self._lock:
+            if self._playbacks.get(playback.sequence_id) is playback:
+                del self._playbacks[playback.sequence_id]
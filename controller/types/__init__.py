@@ -6,6 +6,7 @@ from .messages import (
     PeekResponse,
     Request,
     Response,
+    ResponseKey,
     SetActiveStateRequest,
     StateEventsRequest,
     StateEventsResponse,
@@ -15,5 +16,7 @@ from .messages import (
     ToggleStateRequest,
     UnsubscribeStateEventsRequest,
     model_event_factory,
+    response_key_of,
+    serialize_batch,
 )
-from .types import ControllerConnectedEvent, VTInstance
+from .types import ControllerConnectedEvent, LinkQualityEvent, SequenceEvent, VTInstance
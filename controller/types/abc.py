@@ -1,10 +1,14 @@
 from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING, Sequence
 
 from gg_kekemui_veadosc.data import VeadoSCConnectionConfig
 
 from .messages import Request
 from .types import VTInstance
 
+if TYPE_CHECKING:
+    from gg_kekemui_veadosc.controller.pending import RequestFuture
+
 
 class ConnectionManager(ABC):
 
@@ -19,6 +23,14 @@ class ConnectionManager(ABC):
     def propose_connection(self, instance: VTInstance):
         pass
 
+    @abstractmethod
+    def handover_connection(self, old: VTInstance, new: VTInstance):
+        """
+        Replaces a connection to `old` with one to `new`, without an
+        intervening disconnect.
+        """
+        pass
+
 
 class VeadoController(ConnectionManager, ABC):
 
@@ -50,3 +62,96 @@ class VeadoController(ConnectionManager, ABC):
             want to explode callers if we're not connected.
         """
         pass
+
+    @abstractmethod
+    def send_requests(
+        self,
+        batch: Sequence[Request | str],
+        correlation_id: str | None = None,
+        replayable: tuple[bool, ...] | None = None,
+    ) -> tuple[bool, ...]:
+        """
+        Sends several requests to veadotube in one call, in order.
+
+        :param batch: Requests, or their wire strings (see `serialize_batch`).
+            Callers on the other side of RPyC should pass strings.
+        :param correlation_id: Tracing id for the batch as a whole.
+        :param replayable: Per-request `Request.replayable`. If given, and the
+            offline buffer is enabled in the config, a replayable request that
+            can't be sent is held and sent on reconnect, and reported as sent.
+
+        :returns: Per-request success, as for `send_request`. Once a request
+            fails, the remainder are not attempted.
+        """
+        pass
+
+    @abstractmethod
+    def request(self, request: Request, timeout: float = 5) -> "RequestFuture":
+        """
+        Sends a request and returns a future for veadotube's answer, matched
+        by event type and state id. See `PendingRequests`.
+
+        The future is local to the process that made the call. The frontend
+        should use `VeadoSC.request`, which matches against the events it
+        receives, rather than wait on a future across RPyC.
+
+        :param timeout: Seconds to wait for an answer before the future fails
+            with `TimeoutError`.
+        """
+        pass
+
+    @abstractmethod
+    def play_sequence(self, sequence_id: str, steps: Sequence[tuple[str, float]], loop: bool = False) -> bool:
+        """
+        Plays a timed sequence of states from the backend. Progress and timing
+        drift are reported via `SequenceEvent`.
+
+        :param sequence_id: Identifies the sequence in events and for
+            `stop_sequence`. Playing an id that is already playing restarts it.
+        :param steps: (state_id, seconds to hold) pairs. Pass a tuple so it
+            crosses RPyC by value.
+        :param loop: Repeat until stopped.
+
+        :returns: False if there are no steps.
+        """
+        pass
+
+    @abstractmethod
+    def stop_sequence(self, sequence_id: str):
+        """
+        Stops a sequence after its current step. The active state is left as is.
+        """
+        pass
+
+    @abstractmethod
+    def shutdown(self):
+        """
+        Stops every connection and thread the controller started. The
+        controller can't be used afterwards.
+        """
+        pass
+
+    @abstractmethod
+    def get_trace_events(self) -> str:
+        """
+        :returns: This process's trace spans as a JSON list of Chrome trace
+            events. A string, so that it crosses RPyC by value.
+        """
+        pass
+
+    @abstractmethod
+    def dump_journal(self) -> str:
+        """
+        Writes the backend's event journal to a file.
+
+        :returns: The path written to.
+        """
+        pass
+
+    @abstractmethod
+    def get_queue_stats(self) -> dict:
+        """
+        :returns: Depth, high water mark, and coalesce/drop counters for the
+            queue between the websocket reader and event dispatch.
+        """
+        pass
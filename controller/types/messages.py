@@ -1,11 +1,50 @@
 import json
 from abc import ABC, abstractmethod
-from typing import Any
+from typing import Any, Iterable
 
 from loguru import logger as log  # noqa: F401
 
 import gg_kekemui_veadosc.model.events as me
 
+ResponseKey = tuple[type[me.ModelEvent], str | None]
+"""The event type that answers a request, and the state it must be about (None for any)."""
+
+RESPONSES: dict[str, tuple[type[me.ModelEvent], bool]] = {
+    "list": (me.AllStatesEvent, False),
+    "peek": (me.ActiveStateEvent, False),
+    "thumb": (me.ThumbnailEvent, True),
+    # veadotube announces the change to listeners with a `peek`.
+    "set": (me.ActiveStateEvent, True),
+    # Toggling may land on another state, so any `peek` answers it.
+    "toggle": (me.ActiveStateEvent, False),
+}
+"""
+For each `stateEvents` request, the event that answers it, and whether the
+answer must be about the requested state.
+"""
+
+
+def _response_key(payload: dict[str, Any]) -> ResponseKey | None:
+    answer = RESPONSES.get(payload.get("event"))
+    if not answer:
+        return None
+    event_type, same_state = answer
+    return event_type, payload.get("state") if same_state else None
+
+
+def response_key_of(request: str) -> ResponseKey | None:
+    """
+    As `Request.response_key`, for a request already serialized to its wire
+    string.
+    """
+    try:
+        message = json.loads(request.split(":", maxsplit=1)[1])
+    except (IndexError, ValueError):
+        return None
+    if message.get("type") != "stateEvents":
+        return None
+    return _response_key(message.get("payload") or {})
+
 
 class VeadoBase(ABC):
     @classmethod
@@ -21,10 +60,25 @@ class NodesBase(VeadoBase):
 
 
 class Request(ABC):
+    correlation_id: str | None = None
+    """Set by the frontend when tracing is enabled. See `gg_kekemui_veadosc.diagnostics`."""
+    replayable: bool = False
+    """
+    True if sending this late still does what the user meant, i.e., it's
+    idempotent. Only replayable requests are held while offline.
+    """
+
     @abstractmethod
     def _get_request_payload(self, incoming: dict | None = None) -> dict[str, Any]:
         pass
 
+    def response_key(self) -> ResponseKey | None:
+        """
+        :returns: What the inbound event answering this request looks like, or
+            None if veadotube doesn't answer it. See `PendingRequests`.
+        """
+        return None
+
     def to_request_string(self) -> str:
         return f"{self.get_channel()}:{json.dumps(self._get_request_payload())}"
 
@@ -54,6 +108,9 @@ class StateEventsRequest(NodesBase, Request, ABC):
             "payload": incoming,
         }
 
+    def response_key(self) -> ResponseKey | None:
+        return _response_key(self._get_request_payload()["payload"])
+
 
 class StateEventsResponse(NodesBase, Response, ABC):
 
@@ -168,6 +225,8 @@ class ThumbnailResponse(StateEventsResponse):
 
 
 class SetActiveStateRequest(StateEventsRequest):
+    replayable = True
+
     def __init__(self, state_id: str):
         self.state_id = state_id
 
@@ -183,6 +242,14 @@ class ToggleStateRequest(StateEventsRequest):
         return super()._get_request_payload({"event": "toggle", "state": self.state_id})
 
 
+def serialize_batch(batch: Iterable[Request | str]) -> tuple[str, ...]:
+    """
+    Converts requests to their wire strings. A tuple of strings crosses RPyC by
+    value, where a list of `Request`s would cost a round trip per element.
+    """
+    return tuple(r if isinstance(r, str) else r.to_request_string() for r in batch)
+
+
 NODES_RESPONSE_TYPES: list[StateEventsResponse] = [
     ListStateEventsResponse,
     PeekResponse,
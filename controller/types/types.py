@@ -8,12 +8,53 @@ from gg_kekemui_veadosc.observer import Event
 @dataclass
 class ControllerConnectedEvent(Event):
     is_connected: bool
+    veado_id: str = ""
 
     @property
     def event_name(self):
         return "observer.ControllerConnectedEvent"
 
 
+@dataclass
+class LinkQualityEvent(Event):
+    """
+    Periodic health sample for the current veadotube connection. Times are in
+    milliseconds; `rtt_ms` and `jitter_ms` are smoothed. `reconnect_count` is
+    how many times the backend has regained a lost connection.
+    """
+
+    rtt_ms: float
+    jitter_ms: float
+    since_last_frame_ms: float
+    degraded: bool
+    reconnect_count: int = 0
+
+    @property
+    def event_name(self):
+        return "observer.LinkQualityEvent"
+
+
+@dataclass
+class SequenceEvent(Event):
+    """
+    Progress of a sequence started with `VeadoController.play_sequence`: sent
+    when it starts, after each pass, and when it stops. Drift is how late
+    steps were sent relative to their scheduled time.
+    """
+
+    sequence_id: str
+    running: bool
+    passes: int = 0
+    steps_played: int = 0
+    steps_failed: int = 0
+    mean_drift_ms: float = 0.0
+    max_drift_ms: float = 0.0
+
+    @property
+    def event_name(self):
+        return "observer.SequenceEvent"
+
+
 @dataclass
 class VTInstance:
     veado_id: str
@@ -1,4 +1,5 @@
 import threading
+import time
 from dataclasses import dataclass
 from enum import Enum
 from pathlib import Path
@@ -8,6 +9,7 @@ from loguru import logger as log
 
 from gg_kekemui_veadosc.controller.types import VTInstance
 from gg_kekemui_veadosc.controller.types.abc import ConnectionManager
+from gg_kekemui_veadosc.diagnostics import journal
 
 
 @dataclass
@@ -32,7 +34,33 @@ FS_POLL_TIME = 2.5
 FS_THREAD_NAME = "gg_kekemui_veadosc::vpw_fs_poller"
 
 QUEUE_THREAD_NAME = "gg_kekemui_veadosc::queue_poller"
-QUEUE_WAIT_TIME = 5
+
+SETTLE_WINDOW = 0.25
+"""How long to gather events after the first one before acting on them."""
+DELETE_SETTLE_WINDOW = FS_POLL_TIME * 1.5
+"""
+How long to wait for a deleted instance file to come back. veadotube deletes
+and rewrites its file on restart, which spans more than one poll.
+"""
+
+_SHUTDOWN = object()
+
+NetChange = tuple[VTInstance | None, VTInstance | None]
+"""An instance's (before, after) across a batch of events."""
+
+
+def coalesce(events: list[FileEvent]) -> dict[str, NetChange]:
+    """
+    Folds a batch of events into the net change per `veado_id`, in order of
+    first appearance. E.g., deleted-then-recreated on a new port becomes a
+    single (old, new) change, and created-then-deleted becomes (None, None).
+    """
+    net: dict[str, NetChange] = {}
+    for event in events:
+        veado_id = (event.new_instance or event.old_instance).veado_id
+        before = net[veado_id][0] if veado_id in net else event.old_instance
+        net[veado_id] = (before, event.new_instance)
+    return net
 
 
 class VeadoPollingWatchdog:
@@ -61,21 +89,41 @@ class VeadoPollingWatchdog:
             log.warning(f"Watchdog configured with path {dir_str} that does not end with `instances`. Ignoring.")
             return
 
-        self._stop_fs_thread.clear()
+        # A fresh event per thread, so that a poller that hasn't noticed its
+        # stop yet can't be revived by the next start.
+        self._stop_fs_thread = threading.Event()
         # RPyC seems to hang if we keep the object/Path reference around.
         self._watch_dir = dir_str
-        self._fs_thread = threading.Thread(target=self._fs_poller, name=FS_THREAD_NAME, daemon=True)
+        self._fs_thread = threading.Thread(
+            target=self._fs_poller, args=(self._stop_fs_thread,), name=FS_THREAD_NAME, daemon=True
+        )
         self._fs_thread.start()
 
-    def stop_poller(self):
-        if not self._stop_fs_thread:
-            return
+    def candidates(self) -> list[tuple[VTInstance, int]]:
+        """
+        :returns: Every instance currently advertised in the watched directory,
+            paired with its instance file's modification time.
+        """
+        return [(data.contents, data.modified) for data in list(self._files.values())]
 
+    def stop_poller(self):
         self._stop_fs_thread.set()
+        if self._fs_thread and self._fs_thread is not threading.current_thread():
+            self._fs_thread.join()
+        self._fs_thread = None
         self._files = {}
         self._watch_dir = None
 
-    def _fs_poller(self):
+    def shutdown(self):
+        """
+        Stops polling and the consumer. Events already queued are dropped.
+        """
+        self.stop_poller()
+        self._update_queue.put(_SHUTDOWN)
+        if self._queue_thread is not threading.current_thread():
+            self._queue_thread.join()
+
+    def _fs_poller(self, stop: threading.Event):
         log.info(f"FS Poller started, monitoring {str(self._watch_dir)}")
 
         # Rematerialize as our own object.
@@ -113,20 +161,72 @@ class VeadoPollingWatchdog:
             except FileNotFoundError as e:
                 log.warning(f"Couldn't find {e.filename}. Suppressing exception.")
 
-            should_continue = not self._stop_fs_thread.wait(timeout=FS_POLL_TIME)
+            should_continue = not stop.wait(timeout=FS_POLL_TIME)
         log.info("FS thread terminating")
 
     def _queue_consumer(self):
+        """
+        Blocks until there is work, then gathers whatever else arrives within
+        the settle window so that only the net change per instance reaches the
+        `ConnectionManager`.
+        """
         log.info("Queue consumer started")
         while True:
+            event = self._update_queue.get(block=True)
+            if event is _SHUTDOWN:
+                break
+
+            events = self._settle(event)
+            if events is None:
+                break
+
+            for veado_id, (old, new) in coalesce(events).items():
+                try:
+                    self._apply(old, new)
+                except Exception as e:
+                    log.warning(f"Caught exception {e=} while applying change to {veado_id}")
+        log.info("Queue consumer terminating")
+
+    def _settle(self, first: FileEvent) -> list[FileEvent] | None:
+        """
+        :returns: `first` plus anything queued within the settle window, or
+            None if asked to shut down.
+        """
+        self._record(first)
+        events = [first]
+        start = time.monotonic()
+        deadline = start + SETTLE_WINDOW
+        while True:
+            if any(old and not new for old, new in coalesce(events).values()):
+                deadline = max(deadline, start + DELETE_SETTLE_WINDOW)
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return events
+
             try:
-                event = self._update_queue.get(block=True, timeout=QUEUE_WAIT_TIME)
+                event = self._update_queue.get(block=True, timeout=remaining)
+            except Empty:
+                return events
+            if event is _SHUTDOWN:
+                return None
+            self._record(event)
+            events.append(event)
+
+    def _record(self, event: FileEvent):
+        journal.record(journal.FS, f"{event.event.name} new={event.new_instance} old={event.old_instance}")
+
+    def _apply(self, old: VTInstance | None, new: VTInstance | None):
+        if old == new:
+            # Created and deleted, or rewritten unchanged, within the window.
+            return
 
-                if event.old_instance:
-                    self._cm.terminate_connection(event.old_instance)
+        journal.record(journal.FS, f"net change old={old} new={new}")
+        if old and new:
+            self._cm.handover_connection(old, new)
 
-                if event.new_instance:
-                    self._cm.propose_connection(event.new_instance)
+        elif old:
+            self._cm.terminate_connection(old)
 
-            except Empty:
-                continue
+        elif new:
+            self._cm.propose_connection(new)
@@ -8,7 +8,11 @@ class VeadoSCConnectionConfig:
     INSTANCES_DIR = "instances_dir"
     HOSTNAME = "hostname"
     PORT = "port"
-    KEYS = (SMART_CONNECT, INSTANCES_DIR, HOSTNAME, PORT)
+    OFFLINE_BUFFER = "offline_buffer"
+    OFFLINE_TTL = "offline_ttl"
+    KEYS = (SMART_CONNECT, INSTANCES_DIR, HOSTNAME, PORT, OFFLINE_BUFFER, OFFLINE_TTL)
+    CONNECTION_KEYS = (SMART_CONNECT, INSTANCES_DIR, HOSTNAME, PORT)
+    """The keys that decide what to connect to, as opposed to how requests are handled."""
 
     def __init__(
         self,
@@ -16,10 +20,19 @@ class VeadoSCConnectionConfig:
         instances_dir: Path | str = Path("~/.veadotube/instances"),
         hostname: str = "localhost",
         port: int = 40404,
+        offline_buffer: bool = False,
+        offline_ttl: float = 10,
     ):
+        """
+        :param offline_buffer: Hold the latest state change made while
+            disconnected, and send it on reconnect.
+        :param offline_ttl: Seconds a held state change stays valid.
+        """
         self.smart_connect = smart_connect
         self.hostname = hostname
         self.port = port
+        self.offline_buffer = offline_buffer
+        self.offline_ttl = offline_ttl
 
         instances_dir = instances_dir if isinstance(instances_dir, Path) else Path(instances_dir)
         if instances_dir.exists():
@@ -27,12 +40,31 @@ class VeadoSCConnectionConfig:
         else:
             self.instances_dir = Path.home() / ".veadotube/instances"
 
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, VeadoSCConnectionConfig):
+            return NotImplemented
+        return self.to_dict() == other.to_dict()
+
+    __hash__ = None
+
+    def same_connection(self, other: "VeadoSCConnectionConfig | None") -> bool:
+        """
+        :returns: True if `other` connects to the same place, whatever its
+            other settings.
+        """
+        if other is None:
+            return False
+        mine, theirs = self.to_dict(), other.to_dict()
+        return all(mine[key] == theirs[key] for key in self.CONNECTION_KEYS)
+
     def to_dict(self) -> dict[str, Any]:
         d = {}
         d[self.SMART_CONNECT] = self.smart_connect
         d[self.INSTANCES_DIR] = str(self.instances_dir)
         d[self.HOSTNAME] = self.hostname
         d[self.PORT] = self.port
+        d[self.OFFLINE_BUFFER] = self.offline_buffer
+        d[self.OFFLINE_TTL] = self.offline_ttl
 
         return d
 
@@ -0,0 +1,3 @@
+from .journal import Journal, journal
+from .profiling import Profiler
+from .tracing import Tracer, tracer, write_chrome_trace
@@ -0,0 +1,48 @@
+import time
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+
+JOURNAL_SIZE = 2_000
+DETAIL_LIMIT = 240
+DUMP_DIR = Path(__file__).parent.parent / "journals"
+
+
+class Journal:
+    """
+    Fixed-size, always-on record of recent backend activity: inbound frames,
+    outbound requests, connection transitions, and watchdog file events.
+
+    Entries are truncated to `DETAIL_LIMIT` characters (thumbnails would
+    otherwise dominate), so keeping this on in production is cheap. Dump it
+    after the fact to see what led up to a reported hiccup.
+    """
+
+    IN = "in"
+    OUT = "out"
+    CONN = "conn"
+    FS = "fs"
+
+    def __init__(self, size: int = JOURNAL_SIZE):
+        self._entries: deque[tuple[float, str, str]] = deque(maxlen=size)
+
+    def record(self, kind: str, detail: str):
+        if len(detail) > DETAIL_LIMIT:
+            detail = f"{detail[:DETAIL_LIMIT]}... ({len(detail)} chars)"
+        # deque.append is atomic, no lock needed.
+        self._entries.append((time.time(), kind, detail))
+
+    def lines(self) -> list[str]:
+        return [
+            f"{datetime.fromtimestamp(ts).isoformat(timespec='milliseconds')} {kind:<4} {detail}"
+            for ts, kind, detail in list(self._entries)
+        ]
+
+    def dump(self, directory: Path = DUMP_DIR) -> Path:
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / f"journal-{time.strftime('%Y%m%d-%H%M%S')}.log"
+        path.write_text("\n".join(self.lines()) + "\n")
+        return path
+
+
+journal = Journal()
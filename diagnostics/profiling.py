@@ -0,0 +1,185 @@
+import atexit
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from pathlib import Path
+from typing import Any, Callable
+
+from loguru import logger as log
+
+from gg_kekemui_veadosc.constants import DEBUG_ENV
+
+PROFILE_ENV = "VEADOSC_PROFILE"
+"""
+Comma-separated list of profilers to enable: `cpu`, `mem`, `stats`, or `all`.
+If unset, `VEADOSC_DEBUG` enables all of them.
+"""
+PROFILERS = ("cpu", "mem", "stats")
+PROFILE_DIR = Path(__file__).parent.parent / "profiles"
+
+SAMPLE_INTERVAL = 0.01
+FLUSH_INTERVAL = 60
+STATS_INTERVAL = 10
+MEM_TOP_N = 30
+
+PROFILER_THREAD_NAME = "gg_kekemui_veadosc::profiler"
+
+
+def enabled_profilers() -> set[str]:
+    value = os.environ.get(PROFILE_ENV)
+    if value is None:
+        return set(PROFILERS) if DEBUG_ENV in os.environ else set()
+
+    requested = {p.strip().lower() for p in value.split(",") if p.strip()}
+    return set(PROFILERS) if "all" in requested else requested & set(PROFILERS)
+
+
+class StackSampler:
+    """
+    Statistical CPU profiler covering every thread in the process (cProfile
+    only sees the thread it was started on). Writes collapsed stacks, which
+    flamegraph.pl and https://www.speedscope.app accept directly.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._counts: Counter[str] = Counter()
+        self._lock = threading.Lock()
+
+    def sample(self, skip_ident: int):
+        names = {t.ident: t.name for t in threading.enumerate()}
+        for ident, frame in sys._current_frames().items():
+            if ident == skip_ident:
+                continue
+
+            stack = []
+            while frame:
+                stack.append(f"{frame.f_code.co_name} ({Path(frame.f_code.co_filename).name}:{frame.f_lineno})")
+                frame = frame.f_back
+            stack.append(names.get(ident, str(ident)))
+
+            with self._lock:
+                self._counts[";".join(reversed(stack))] += 1
+
+    def flush(self):
+        with self._lock:
+            lines = [f"{stack} {count}" for stack, count in self._counts.most_common()]
+        self.path.write_text("\n".join(lines) + "\n")
+
+
+class MemorySnapshotter:
+    """
+    Periodic tracemalloc snapshots, limited to allocations made by plugin
+    code. Each flush writes the top allocation sites and the change since the
+    previous flush.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._filters = [tracemalloc.Filter(True, f"{Path(__file__).parent.parent}{os.sep}*")]
+        self._previous: tracemalloc.Snapshot | None = None
+        tracemalloc.start()
+
+    def flush(self):
+        snapshot = tracemalloc.take_snapshot().filter_traces(self._filters)
+        lines = [f"# {time.strftime('%Y-%m-%d %H:%M:%S')}", "## Top allocations"]
+        lines += [str(stat) for stat in snapshot.statistics("lineno")[:MEM_TOP_N]]
+
+        if self._previous:
+            lines.append("## Change since previous snapshot")
+            lines += [str(stat) for stat in snapshot.compare_to(self._previous, "lineno")[:MEM_TOP_N]]
+        self._previous = snapshot
+
+        with self.path.open("a") as f:
+            f.write("\n".join(lines) + "\n\n")
+
+
+class StatsReporter:
+    """
+    Appends one JSON line per interval with thread count plus any gauges
+    supplied by the caller (e.g., queue depths, thumbnail memory).
+    """
+
+    def __init__(self, path: Path, gauges: dict[str, Callable[[], Any]]):
+        self.path = path
+        self.gauges = gauges
+
+    def flush(self):
+        stats: dict[str, Any] = {"time": time.time(), "threads": threading.active_count()}
+        for name, gauge in self.gauges.items():
+            try:
+                stats[name] = gauge()
+            except Exception as e:
+                stats[name] = f"error: {e}"
+
+        with self.path.open("a") as f:
+            f.write(json.dumps(stats, default=str) + "\n")
+
+
+class Profiler:
+    """
+    Runs whichever profilers are enabled via `PROFILE_ENV`/`DEBUG_ENV`, writing
+    their output under `PROFILE_DIR`. Does nothing if none are enabled, so it is
+    safe to construct unconditionally.
+    """
+
+    def __init__(self, process_name: str, gauges: dict[str, Callable[[], Any]] | None = None):
+        self.process_name = process_name
+        self.gauges = gauges or {}
+        self.enabled = enabled_profilers()
+
+        self._sampler: StackSampler | None = None
+        self._memory: MemorySnapshotter | None = None
+        self._stats: StatsReporter | None = None
+        self._stop = threading.Event()
+
+    def start(self):
+        if not self.enabled:
+            return
+
+        PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+        prefix = f"{self.process_name}-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}"
+        if "cpu" in self.enabled:
+            self._sampler = StackSampler(PROFILE_DIR / f"{prefix}-cpu.folded")
+        if "mem" in self.enabled:
+            self._memory = MemorySnapshotter(PROFILE_DIR / f"{prefix}-mem.txt")
+        if "stats" in self.enabled:
+            self._stats = StatsReporter(PROFILE_DIR / f"{prefix}-stats.jsonl", self.gauges)
+
+        log.info(f"Profiling {sorted(self.enabled)} to {PROFILE_DIR}/{prefix}-*")
+        threading.Thread(target=self._run, name=PROFILER_THREAD_NAME, daemon=True).start()
+        atexit.register(self.stop)
+
+    def stop(self):
+        self._stop.set()
+        self._flush(self._sampler, self._memory)
+
+    def _flush(self, *profilers: StackSampler | MemorySnapshotter | StatsReporter | None):
+        for profiler in profilers:
+            if profiler:
+                try:
+                    profiler.flush()
+                except Exception as e:
+                    log.warning(f"Unable to write {type(profiler).__name__} output: {e}")
+
+    def _run(self):
+        me = threading.get_ident()
+        next_flush = time.monotonic() + FLUSH_INTERVAL
+        next_stats = time.monotonic()
+        interval = SAMPLE_INTERVAL if self._sampler else STATS_INTERVAL
+
+        while not self._stop.wait(interval):
+            if self._sampler:
+                self._sampler.sample(skip_ident=me)
+
+            now = time.monotonic()
+            if now >= next_stats:
+                self._flush(self._stats)
+                next_stats = now + STATS_INTERVAL
+            if now >= next_flush:
+                self._flush(self._sampler, self._memory)
+                next_flush = now + FLUSH_INTERVAL
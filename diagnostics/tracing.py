@@ -0,0 +1,119 @@
+import json
+import os
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any
+from uuid import uuid4
+
+TRACE_ENV = "VEADOSC_TRACE"
+RING_SIZE = 10_000
+
+
+class _NoopSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+class Span:
+    __slots__ = ("tracer", "name", "cid", "args", "start", "outer_cid")
+
+    def __init__(self, tracer: "Tracer", name: str, cid: str | None, args: dict[str, Any]):
+        self.tracer = tracer
+        self.name = name
+        self.cid = cid
+        self.args = args
+
+    def __enter__(self):
+        self.outer_cid = self.tracer.current_cid()
+        if self.cid:
+            self.tracer._local.cid = self.cid
+        self.start = time.monotonic_ns()
+        return self
+
+    def __exit__(self, *args):
+        self.tracer._record(self.name, self.start, time.monotonic_ns() - self.start, self.cid, self.args)
+        self.tracer._local.cid = self.outer_cid
+        return False
+
+
+class Tracer:
+    """
+    Lightweight span tracing into a ring buffer, exportable as Chrome trace
+    events (load the output in `chrome://tracing` or https://ui.perfetto.dev).
+
+    Both VeadoSC processes hold a tracer; spans are stamped with the monotonic
+    clock, which is shared across processes, and carry an optional correlation
+    id so a request can be followed from key press to redraw. When disabled,
+    `span` returns a shared no-op context manager.
+
+    While a span with a correlation id is open, `current_cid` returns that id
+    on the span's thread, for work it sets off to pick up (e.g., a redraw).
+    """
+
+    def __init__(self, enabled: bool | None = None, ring_size: int = RING_SIZE):
+        self.enabled = TRACE_ENV in os.environ if enabled is None else enabled
+        self.process_name = "veadosc"
+        self._events: deque[tuple] = deque(maxlen=ring_size)
+        self._local = threading.local()
+
+    def new_correlation_id(self) -> str | None:
+        return uuid4().hex[:12] if self.enabled else None
+
+    def current_cid(self) -> str | None:
+        """
+        :returns: The correlation id of the innermost open span on this
+            thread that has one.
+        """
+        return getattr(self._local, "cid", None)
+
+    def span(self, name: str, cid: str | None = None, **args) -> Span | _NoopSpan:
+        if not self.enabled:
+            return NOOP_SPAN
+        return Span(self, name, cid, args)
+
+    def _record(self, name: str, start_ns: int, dur_ns: int, cid: str | None, args: dict[str, Any]):
+        # deque.append is atomic, no lock needed.
+        self._events.append((name, start_ns, dur_ns, threading.get_ident(), cid, args))
+
+    def export(self) -> list[dict[str, Any]]:
+        pid = os.getpid()
+        events: list[dict[str, Any]] = [
+            {"name": "process_name", "ph": "M", "pid": pid, "args": {"name": self.process_name}},
+        ]
+        for name, start_ns, dur_ns, tid, cid, args in list(self._events):
+            if cid:
+                args = {**args, "cid": cid}
+            events.append(
+                {
+                    "name": name,
+                    "cat": "veadosc",
+                    "ph": "X",
+                    "ts": start_ns / 1000,
+                    "dur": dur_ns / 1000,
+                    "pid": pid,
+                    "tid": tid,
+                    "args": args,
+                }
+            )
+        return events
+
+    def export_json(self) -> str:
+        return json.dumps(self.export())
+
+
+def write_chrome_trace(path: Path, *event_lists: list[dict[str, Any]]) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    events = [e for events in event_lists for e in events]
+    path.write_text(json.dumps({"traceEvents": events, "displayTimeUnit": "ms"}))
+    return path
+
+
+tracer = Tracer()
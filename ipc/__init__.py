@@ -0,0 +1,4 @@
+from .client import IpcClient
+from .handshake import build_id
+from .remote import RemoteController
+from .server import IpcServer, default_socket_path
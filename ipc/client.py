@@ -0,0 +1,215 @@
+import socket
+import threading
+import traceback
+from itertools import count
+from typing import Any, Callable
+
+from loguru import logger as log
+
+from gg_kekemui_veadosc.controller.inbound import InboundQueue
+from gg_kekemui_veadosc.diagnostics import tracer
+from gg_kekemui_veadosc.ipc.codec import (
+    Welcome,
+    decode_event,
+    decode_results,
+    decode_return,
+    decode_welcome,
+    encode_call,
+    encode_hello,
+    encode_requests,
+)
+from gg_kekemui_veadosc.ipc.framing import PROTOCOL_VERSION, FrameError, FrameKind, recv_frame, send_frame
+from gg_kekemui_veadosc.observer import Event
+
+READER_THREAD_NAME = "gg_kekemui_veadosc::ipc_client_reader"
+EVENT_THREAD_NAME = "gg_kekemui_veadosc::ipc_events"
+
+CONNECT_TIMEOUT = 2
+REQUEST_TIMEOUT = 5
+
+
+class _Pending:
+    def __init__(self):
+        self.done = threading.Event()
+        self.received = False
+        self.value: Any = None
+        self.error: str | None = None
+
+
+class IpcClient:
+    """
+    Frontend end of the IPC channel. See `IpcServer` and ADR-02.
+
+    Events are handed to `on_event` from a dedicated thread, not the socket
+    reader, so an observer that sends a request can't deadlock waiting for a
+    result the reader would never get to.
+
+    Between the two, events wait in an `InboundQueue`, coalesced and bounded
+    by the same policies as in the backend. Once it's full of events that
+    can't be dropped, the reader stops reading. The socket then fills up and
+    holds up the backend's publishing, so its own inbound queue coalesces what
+    follows, rather than the frontend buffering without limit.
+    """
+
+    def __init__(self, path: str, on_event: Callable[[Event], None]):
+        self._on_event = on_event
+
+        self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._sock.settimeout(CONNECT_TIMEOUT)
+        self._sock.connect(path)
+        self._sock.settimeout(None)
+
+        self._write_lock = threading.Lock()
+        self._ids = count(1)
+        self._pending: dict[int, _Pending] = {}
+        self._welcome = _Pending()
+        self._connected = True
+
+        self._events = InboundQueue()
+        self._event_thread = threading.Thread(target=self._deliver_events, name=EVENT_THREAD_NAME, daemon=True)
+        self._event_thread.start()
+        self._reader_thread = threading.Thread(target=self._reader, name=READER_THREAD_NAME, daemon=True)
+        self._reader_thread.start()
+
+    @property
+    def connected(self) -> bool:
+        return self._connected
+
+    def handshake(self, build: str, config: dict[str, Any], timeout: float = REQUEST_TIMEOUT) -> Welcome:
+        """
+        Introduces this frontend to the backend, which checks that both run
+        the same code. Must be sent before anything else.
+
+        :param build: This frontend's `build_id`.
+        :param config: The connection config, as `VeadoSCConnectionConfig.to_dict`.
+
+        :raises ConnectionError: If the channel is down, or the backend didn't
+            answer within `timeout`.
+        """
+        self._send(FrameKind.HELLO, encode_hello(build, PROTOCOL_VERSION, config))
+        if not self._welcome.done.wait(timeout) or self._welcome.value is None:
+            raise ConnectionError("No IPC handshake from the backend")
+        return self._welcome.value
+
+    def call(self, method: str, *args: Any, timeout: float = REQUEST_TIMEOUT) -> Any:
+        """
+        Calls a controller method in the backend. See `ipc.remote.CALLS`.
+
+        :raises ConnectionError: If the channel is down.
+        :raises TimeoutError: If no result arrived within `timeout`.
+        :raises RuntimeError: If the call raised in the backend.
+        """
+        call_id = next(self._ids)
+        pending = self._pending[call_id] = _Pending()
+        try:
+            self._send(FrameKind.CALL, encode_call(call_id, method, args))
+            if not pending.done.wait(timeout):
+                raise TimeoutError(f"No result for {method} within {timeout}s")
+        finally:
+            self._pending.pop(call_id, None)
+
+        if not pending.received:
+            raise ConnectionError("IPC channel closed during call")
+        if pending.error:
+            raise RuntimeError(pending.error)
+        return pending.value
+
+    def send_requests(
+        self,
+        batch: tuple[str, ...],
+        correlation_id: str | None = None,
+        replayable: tuple[bool, ...] | None = None,
+        timeout: float = REQUEST_TIMEOUT,
+    ) -> tuple[bool, ...]:
+        """
+        As `VeadoController.send_requests`, for already-serialized requests.
+
+        :raises ConnectionError: If the channel is down. Nothing was sent, so
+            the caller may retry another way.
+        """
+        if not self._connected:
+            raise ConnectionError("IPC channel is closed")
+
+        request_id = next(self._ids)
+        pending = self._pending[request_id] = _Pending()
+        try:
+            with tracer.span("IpcClient.send_requests", correlation_id, count=len(batch)):
+                self._send(FrameKind.REQUESTS, encode_requests(request_id, batch, correlation_id, replayable))
+                if not pending.done.wait(timeout):
+                    log.warning(f"No IPC result for request batch {request_id} within {timeout}s")
+        finally:
+            self._pending.pop(request_id, None)
+
+        return pending.value or (False,) * len(batch)
+
+    def event_stats(self) -> dict:
+        """
+        :returns: Stats for events waiting to be delivered, as
+            `InboundQueue.stats`.
+        """
+        return self._events.stats()
+
+    def close(self):
+        self._close()
+        try:
+            self._sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+
+    def _send(self, kind: FrameKind, payload: bytes):
+        if not self._connected:
+            raise ConnectionError("IPC channel is closed")
+        try:
+            with self._write_lock:
+                send_frame(self._sock, kind, payload)
+        except OSError as e:
+            self._close()
+            raise ConnectionError("IPC send failed") from e
+
+    def _close(self):
+        if not self._connected:
+            return
+        self._connected = False
+        self._events.close()
+        self._welcome.done.set()
+        for pending in list(self._pending.values()):
+            pending.done.set()
+
+    def _reader(self):
+        reader = self._sock.makefile("rb")
+        try:
+            while frame := recv_frame(reader):
+                kind, payload = frame
+                if kind == FrameKind.EVENT:
+                    if event := decode_event(payload):
+                        self._events.put(event)
+                elif kind == FrameKind.RESULTS:
+                    request_id, results = decode_results(payload)
+                    if pending := self._pending.get(request_id):
+                        pending.value = results
+                        pending.done.set()
+                elif kind == FrameKind.RETURN:
+                    call_id, value, error = decode_return(payload)
+                    if pending := self._pending.get(call_id):
+                        pending.value, pending.error = value, error
+                        pending.received = True
+                        pending.done.set()
+                elif kind == FrameKind.WELCOME:
+                    self._welcome.value = decode_welcome(payload)
+                    self._welcome.done.set()
+                else:
+                    log.warning(f"Ignoring unexpected IPC frame {kind.name}")
+        except (OSError, FrameError, ValueError) as e:
+            log.warning(f"IPC channel failed: {e=}")
+        finally:
+            reader.close()
+            self._close()
+            self._sock.close()
+        log.info("IPC channel closed")
+
+    def _deliver_events(self):
+        while (event := self._events.get()) is not None:
+            try:
+                self._on_event(event)
+            except Exception as e:
+                log.warning(f"Caught exception {e=} while delivering IPC event. Full details: {traceback.format_exc()}")
@@ -0,0 +1,140 @@
+import json
+from dataclasses import dataclass, fields
+from typing import Any, Callable
+
+from loguru import logger as log
+
+from gg_kekemui_veadosc.controller.types import ControllerConnectedEvent, LinkQualityEvent, SequenceEvent
+from gg_kekemui_veadosc.model import ActiveStateEvent, AllStatesEvent, ThumbnailEvent
+from gg_kekemui_veadosc.model.types import StateDetail
+from gg_kekemui_veadosc.observer import Event
+
+EVENT_TYPES: dict[str, type[Event]] = {
+    cls.__name__: cls
+    for cls in (
+        ActiveStateEvent,
+        AllStatesEvent,
+        ThumbnailEvent,
+        ControllerConnectedEvent,
+        LinkQualityEvent,
+        SequenceEvent,
+    )
+}
+"""Events that can cross the IPC channel. All are dataclasses."""
+
+
+def _encode_state(state: StateDetail) -> dict[str, str]:
+    return {"id": state.state_id, "name": state.state_name, "thumbHash": state.thumb_hash}
+
+
+FIELD_ENCODERS: dict[tuple[type[Event], str], tuple[Callable[[Any], Any], Callable[[Any], Any]]] = {
+    (AllStatesEvent, "states"): (
+        lambda states: [_encode_state(s) for s in states],
+        lambda states: [StateDetail(s) for s in states],
+    ),
+}
+"""(encode, decode) for fields that aren't plain JSON values."""
+
+
+def _dumps(obj: Any) -> bytes:
+    return json.dumps(obj, separators=(",", ":")).encode()
+
+
+def encode_event(event: Event) -> bytes:
+    cls = type(event)
+    data = {}
+    for f in fields(event):
+        value = getattr(event, f.name)
+        if (cls, f.name) in FIELD_ENCODERS:
+            value = FIELD_ENCODERS[(cls, f.name)][0](value)
+        data[f.name] = value
+
+    return _dumps({"t": cls.__name__, "c": event.correlation_id, "r": event.received_at, "d": data})
+
+
+def decode_event(payload: bytes) -> Event | None:
+    """
+    :returns: The event, or None if its type isn't known to this side.
+    """
+    message = json.loads(payload)
+    cls = EVENT_TYPES.get(message["t"])
+    if not cls:
+        log.warning(f"Dropping IPC event of unknown type {message['t']}")
+        return None
+
+    data = message["d"]
+    for (owner, name), (_, decode) in FIELD_ENCODERS.items():
+        if owner is cls and name in data:
+            data[name] = decode(data[name])
+
+    event = cls(**data)
+    if message["c"]:
+        event.correlation_id = message["c"]
+    if message.get("r") is not None:
+        event.received_at = message["r"]
+    return event
+
+
+def encode_requests(
+    request_id: int, batch: tuple[str, ...], correlation_id: str | None, replayable: tuple[bool, ...] | None
+) -> bytes:
+    return _dumps({"i": request_id, "b": batch, "c": correlation_id, "r": replayable})
+
+
+def decode_requests(payload: bytes) -> tuple[int, tuple[str, ...], str | None, tuple[bool, ...] | None]:
+    message = json.loads(payload)
+    replayable = tuple(message["r"]) if message["r"] is not None else None
+    return message["i"], tuple(message["b"]), message["c"], replayable
+
+
+def encode_results(request_id: int, results: tuple[bool, ...]) -> bytes:
+    return _dumps({"i": request_id, "r": results})
+
+
+def decode_results(payload: bytes) -> tuple[int, tuple[bool, ...]]:
+    message = json.loads(payload)
+    return message["i"], tuple(message["r"])
+
+
+@dataclass
+class Welcome:
+    accepted: bool
+    reason: str = ""
+    config_matches: bool = False
+    """True if the backend was already running with the frontend's config."""
+
+
+def encode_hello(build: str, protocol: int, config: dict[str, Any]) -> bytes:
+    return _dumps({"b": build, "p": protocol, "c": config})
+
+
+def decode_hello(payload: bytes) -> tuple[str, int, dict[str, Any]]:
+    message = json.loads(payload)
+    return message["b"], message["p"], message["c"]
+
+
+def encode_welcome(welcome: Welcome) -> bytes:
+    return _dumps({"a": welcome.accepted, "r": welcome.reason, "m": welcome.config_matches})
+
+
+def decode_welcome(payload: bytes) -> Welcome:
+    message = json.loads(payload)
+    return Welcome(accepted=message["a"], reason=message["r"], config_matches=message["m"])
+
+
+def encode_call(call_id: int, method: str, args: tuple[Any, ...]) -> bytes:
+    return _dumps({"i": call_id, "m": method, "a": args})
+
+
+def decode_call(payload: bytes) -> tuple[int, str, list[Any]]:
+    message = json.loads(payload)
+    return message["i"], message["m"], message["a"]
+
+
+def encode_return(call_id: int, value: Any = None, error: str | None = None) -> bytes:
+    return _dumps({"i": call_id, "v": value, "e": error})
+
+
+def decode_return(payload: bytes) -> tuple[int, Any, str | None]:
+    message = json.loads(payload)
+    return message["i"], message["v"], message["e"]
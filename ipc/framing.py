@@ -0,0 +1,65 @@
+import socket
+import struct
+from enum import IntEnum
+from typing import BinaryIO
+
+PROTOCOL_VERSION = 1
+"""Bumped whenever a frame kind or payload changes. Part of the handshake."""
+
+HEADER = struct.Struct(">IB")
+"""Payload length, then frame kind."""
+MAX_FRAME = 16 * 1024 * 1024
+
+
+class FrameKind(IntEnum):
+    REQUESTS = 1
+    """Frontend to backend: a batch of serialized veadotube requests."""
+    RESULTS = 2
+    """Backend to frontend: per-request success for a `REQUESTS` frame."""
+    EVENT = 3
+    """Backend to frontend: one event for the frontend's observers."""
+    HELLO = 4
+    """Frontend to backend: build id and config, sent first on every connection."""
+    WELCOME = 5
+    """Backend to frontend: whether the backend accepts the frontend from `HELLO`."""
+    CALL = 6
+    """Frontend to backend: a control call on the controller. See `ipc.remote`."""
+    RETURN = 7
+    """Backend to frontend: the outcome of a `CALL`."""
+
+
+class FrameError(Exception):
+    pass
+
+
+def send_frame(sock: socket.socket, kind: FrameKind, payload: bytes):
+    """
+    Writes one frame. Callers sharing a socket between threads must hold a
+    lock around this, as `sendall` may write in several chunks.
+    """
+    sock.sendall(HEADER.pack(len(payload), kind) + payload)
+
+
+def recv_frame(reader: BinaryIO) -> tuple[FrameKind, bytes] | None:
+    """
+    :param reader: A buffered reader over the socket (`socket.makefile("rb")`),
+        so that small frames don't cost a `recv` each for header and body.
+
+    :returns: The next frame, or None once the peer has closed the socket.
+    """
+    header = reader.read(HEADER.size)
+    if len(header) < HEADER.size:
+        return None
+
+    length, kind = HEADER.unpack(header)
+    if length > MAX_FRAME:
+        raise FrameError(f"Frame of {length} bytes exceeds {MAX_FRAME}")
+
+    payload = reader.read(length)
+    if len(payload) < length:
+        return None
+
+    try:
+        return FrameKind(kind), payload
+    except ValueError:
+        raise FrameError(f"Unknown frame kind {kind}")
@@ -0,0 +1,121 @@
+from typing import Any, Callable, Sequence
+
+from loguru import logger as log
+
+from gg_kekemui_veadosc.controller.pending import REQUEST_TIMEOUT, PendingRequests, RequestFuture
+from gg_kekemui_veadosc.controller.types import Request, VeadoController, VTInstance, serialize_batch
+from gg_kekemui_veadosc.data import VeadoSCConnectionConfig
+from gg_kekemui_veadosc.ipc.client import IpcClient
+
+
+def _instance(value: str | None) -> VTInstance | None:
+    return VTInstance.from_json_string(value) if value else None
+
+
+CALLS: dict[str, Callable[..., Any]] = {
+    "connected": lambda c: c.connected,
+    "get_config": lambda c: c.config.to_dict() if c.config else None,
+    "set_config": lambda c, config: c.set_config(VeadoSCConnectionConfig.from_dict(config)),
+    "propose_connection": lambda c, instance: c.propose_connection(_instance(instance)),
+    "terminate_connection": lambda c, instance, force: c.terminate_connection(_instance(instance), force),
+    "handover_connection": lambda c, old, new: c.handover_connection(_instance(old), _instance(new)),
+    "play_sequence": lambda c, sequence_id, steps, loop: c.play_sequence(
+        sequence_id, tuple(tuple(step) for step in steps), loop
+    ),
+    "stop_sequence": lambda c, sequence_id: c.stop_sequence(sequence_id),
+    "shutdown": lambda c: c.shutdown(),
+    "get_trace_events": lambda c: c.get_trace_events(),
+    "dump_journal": lambda c: c.dump_journal(),
+    "get_queue_stats": lambda c: c.get_queue_stats(),
+}
+"""
+Controller calls the backend serves over IPC, taking and returning plain JSON
+values. Called as `CALLS[method](controller, *args)`.
+"""
+
+
+class RemoteController(VeadoController):
+    """
+    The backend's controller, as seen through the IPC channel. Used in place of
+    the RPyC proxy when the frontend adopted an already running backend, and so
+    has no RPyC connection to it. See ADR-03.
+
+    As with the real controller, a failure (here, including the channel being
+    down) is logged and reported as an unsuccessful result rather than raised.
+    """
+
+    def __init__(self, ipc: IpcClient, pending: PendingRequests):
+        """
+        :param pending: Resolved by the frontend from the events it receives.
+        """
+        super().__init__()
+        self._ipc = ipc
+        self._pending = pending
+
+    def _call(self, method: str, *args: Any, default: Any = None) -> Any:
+        try:
+            return self._ipc.call(method, *args)
+        except (ConnectionError, TimeoutError, RuntimeError) as e:
+            log.warning(f"Backend call {method} failed: {e}")
+            return default
+
+    @property
+    def config(self) -> VeadoSCConnectionConfig | None:
+        config = self._call("get_config")
+        return VeadoSCConnectionConfig.from_dict(config) if config else None
+
+    @config.setter
+    def config(self, value: VeadoSCConnectionConfig):
+        self.set_config(value)
+
+    def set_config(self, value: VeadoSCConnectionConfig):
+        self._call("set_config", value.to_dict())
+
+    @property
+    def connected(self) -> bool:
+        return bool(self._call("connected", default=False))
+
+    def send_request(self, request: Request) -> bool:
+        return self.send_requests([request])[0]
+
+    def send_requests(
+        self,
+        batch: Sequence[Request | str],
+        correlation_id: str | None = None,
+        replayable: tuple[bool, ...] | None = None,
+    ) -> tuple[bool, ...]:
+        try:
+            return self._ipc.send_requests(serialize_batch(batch), correlation_id, replayable)
+        except ConnectionError as e:
+            log.warning(f"Unable to send requests: {e}")
+            return (False,) * len(batch)
+
+    def request(self, request: Request, timeout: float = REQUEST_TIMEOUT) -> RequestFuture:
+        return self._pending.send([request], self.send_requests, timeout)[0]
+
+    def propose_connection(self, instance: VTInstance):
+        self._call("propose_connection", instance.to_json_string())
+
+    def terminate_connection(self, instance: VTInstance | None = None, force: bool = False):
+        self._call("terminate_connection", instance.to_json_string() if instance else None, force)
+
+    def handover_connection(self, old: VTInstance, new: VTInstance):
+        self._call("handover_connection", old.to_json_string(), new.to_json_string())
+
+    def play_sequence(self, sequence_id: str, steps: Sequence[tuple[str, float]], loop: bool = False) -> bool:
+        return bool(self._call("play_sequence", sequence_id, [list(step) for step in steps], loop, default=False))
+
+    def stop_sequence(self, sequence_id: str):
+        self._call("stop_sequence", sequence_id)
+
+    def shutdown(self):
+        self._call("shutdown")
+
+    def get_trace_events(self) -> str:
+        return self._call("get_trace_events", default="[]")
+
+    def dump_journal(self) -> str:
+        return self._call("dump_journal", default="")
+
+    def get_queue_stats(self) -> dict:
+        return self._call("get_queue_stats", default={})
@@ -0,0 +1,270 @@
+import atexit
+import os
+import socket
+import tempfile
+import threading
+import time
+import traceback
+from typing import Callable
+
+from loguru import logger as log
+
+from gg_kekemui_veadosc.controller.types import VeadoController
+from gg_kekemui_veadosc.diagnostics import tracer
+from gg_kekemui_veadosc.ipc.codec import (
+    Welcome,
+    decode_call,
+    decode_hello,
+    decode_requests,
+    encode_event,
+    encode_results,
+    encode_return,
+    encode_welcome,
+)
+from gg_kekemui_veadosc.ipc.framing import PROTOCOL_VERSION, FrameError, FrameKind, recv_frame, send_frame
+from gg_kekemui_veadosc.ipc.remote import CALLS
+from gg_kekemui_veadosc.observer import Event
+
+ACCEPT_THREAD_NAME = "gg_kekemui_veadosc::ipc_accept"
+READER_THREAD_NAME = "gg_kekemui_veadosc::ipc_reader"
+CALL_THREAD_NAME = "gg_kekemui_veadosc::ipc_call"
+
+LIVENESS_TIMEOUT = 0.5
+
+
+def default_socket_path() -> str:
+    """
+    One well-known path per user, so that a new frontend can find a backend
+    that is already running. See ADR-03.
+    """
+    # Socket paths are limited to ~108 bytes, so stay out of the (deep) plugin directory.
+    directory = os.environ.get("XDG_RUNTIME_DIR") or tempfile.gettempdir()
+    return os.path.join(directory, f"gg_kekemui_veadosc-{os.getuid()}.sock")
+
+
+def _in_use(path: str) -> bool:
+    """
+    :returns: True if something is still listening on the socket at `path`.
+        A listener too busy to accept in time counts as live.
+    """
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    probe.settimeout(LIVENESS_TIMEOUT)
+    try:
+        probe.connect(path)
+        return True
+    except TimeoutError:
+        return True
+    except OSError:
+        return False
+    finally:
+        probe.close()
+
+
+class IpcServer:
+    """
+    Backend end of the IPC channel: a Unix domain socket carrying request
+    batches from the frontend and events to it. See ADR-02.
+
+    Serves one frontend at a time. Each connection starts with a handshake
+    (`FrameKind.HELLO`); once accepted, the new frontend replaces the previous
+    one, and until then nothing else is served.
+    """
+
+    def __init__(
+        self,
+        controller: VeadoController,
+        build: str,
+        path: str | None = None,
+        on_stale: Callable[[], None] | None = None,
+    ):
+        """
+        :param build: This backend's `build_id`. Frontends built from other
+            code are turned away.
+        :param on_stale: Called after turning a frontend away, as it will
+            launch a backend of its own; this one is then out of date.
+        """
+        self._controller = controller
+        self._build = build
+        self._on_stale = on_stale
+        self.path = path or default_socket_path()
+
+        self._client: socket.socket | None = None
+        self._write_lock = threading.Lock()
+        self._closed = False
+        self._idle_since: float | None = time.monotonic()
+
+        if os.path.exists(self.path) and _in_use(self.path):
+            # A frontend that failed to adopt it launched us; leave it to retire once orphaned.
+            root, ext = os.path.splitext(self.path)
+            fallback = f"{root}-{os.getpid()}{ext}"
+            log.warning(f"{self.path} is served by another backend, listening on {fallback} instead")
+            self.path = fallback
+        if os.path.exists(self.path):
+            # Left by a backend that crashed or is retiring; see `close`.
+            os.unlink(self.path)
+        self._listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._listener.bind(self.path)
+        os.chmod(self.path, 0o600)
+        self._inode = os.stat(self.path).st_ino
+        self._listener.listen(1)
+        atexit.register(self.close)
+
+        self._thread = threading.Thread(target=self._accept_loop, name=ACCEPT_THREAD_NAME, daemon=True)
+        self._thread.start()
+
+    @property
+    def connected(self) -> bool:
+        return self._client is not None
+
+    @property
+    def idle_for(self) -> float:
+        """
+        :returns: Seconds since a frontend was last connected, or 0 if one is.
+        """
+        idle_since = self._idle_since
+        return 0.0 if idle_since is None else time.monotonic() - idle_since
+
+    def publish(self, event: Event) -> bool:
+        """
+        Sends an event to the frontend.
+
+        :returns: True if sent, False if no frontend is connected (so the
+            caller can fall back to RPyC).
+        """
+        client = self._client
+        if client is None:
+            return False
+
+        payload = encode_event(event)
+        try:
+            with self._write_lock:
+                send_frame(client, FrameKind.EVENT, payload)
+            return True
+        except OSError as e:
+            log.warning(f"IPC event delivery failed: {e=}")
+            self._drop(client)
+            return False
+
+    def close(self):
+        self._closed = True
+        try:
+            self._listener.close()
+        except OSError:
+            pass
+        if self._client:
+            self._drop(self._client)
+        try:
+            # The path may already belong to a newer backend.
+            if os.stat(self.path).st_ino == self._inode:
+                os.unlink(self.path)
+        except FileNotFoundError:
+            pass
+
+    def _drop(self, client: socket.socket):
+        if self._client is client:
+            self._client = None
+            self._idle_since = time.monotonic()
+        try:
+            # Unlike `close`, this also ends the reader blocked on the socket.
+            client.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        client.close()
+
+    def _accept_loop(self):
+        log.info(f"IPC server listening on {self.path}")
+        while not self._closed:
+            try:
+                client, _ = self._listener.accept()
+            except OSError:
+                break
+
+            threading.Thread(target=self._serve, args=(client,), name=READER_THREAD_NAME, daemon=True).start()
+        log.info("IPC server terminating")
+
+    def _serve(self, client: socket.socket):
+        log.info("IPC client connected")
+        reader = client.makefile("rb")
+        welcomed = False
+        try:
+            while frame := recv_frame(reader):
+                kind, payload = frame
+                if kind == FrameKind.HELLO:
+                    welcome = self._welcome(*decode_hello(payload))
+                    with self._write_lock:
+                        send_frame(client, FrameKind.WELCOME, encode_welcome(welcome))
+                    if not welcome.accepted:
+                        self._retire()
+                        break
+                    welcomed = True
+                    self._attach(client)
+                elif not welcomed:
+                    log.warning(f"Ignoring IPC frame {kind.name} before handshake")
+                elif kind == FrameKind.REQUESTS:
+                    self._requests(client, payload)
+                elif kind == FrameKind.CALL:
+                    # Calls like `propose_connection` can take seconds; don't hold up requests behind them.
+                    threading.Thread(
+                        target=self._call, args=(client, payload), name=CALL_THREAD_NAME, daemon=True
+                    ).start()
+                else:
+                    log.warning(f"Ignoring unexpected IPC frame {kind.name}")
+        except (OSError, FrameError, ValueError) as e:
+            log.warning(f"IPC client failed: {e=}")
+        except Exception as e:
+            log.warning(f"Caught exception {e=} serving IPC client. {traceback.format_exc()}")
+        finally:
+            reader.close()
+            self._drop(client)
+        log.info("IPC client disconnected")
+
+    def _welcome(self, build: str, protocol: int, config: dict) -> Welcome:
+        if protocol != PROTOCOL_VERSION or build != self._build:
+            log.info(f"Turning away frontend {build} (protocol {protocol}); this backend is {self._build}")
+            return Welcome(accepted=False, reason=f"backend is {self._build}, protocol {PROTOCOL_VERSION}")
+
+        try:
+            current = self._controller.config
+            matches = bool(current and current.to_dict() == config)
+        except Exception as e:
+            log.warning(f"Caught exception {e=} comparing configs. {traceback.format_exc()}")
+            return Welcome(accepted=False, reason=f"backend config unreadable: {type(e).__name__}")
+        log.info(f"Frontend {build} attached, config {'unchanged' if matches else 'changed'}")
+        return Welcome(accepted=True, config_matches=matches)
+
+    def _attach(self, client: socket.socket):
+        previous, self._client = self._client, client
+        self._idle_since = None
+        if previous:
+            log.info("New IPC client, dropping the previous one")
+            self._drop(previous)
+
+    def _retire(self):
+        if self._on_stale:
+            threading.Thread(target=self._on_stale, name=CALL_THREAD_NAME, daemon=True).start()
+
+    def _requests(self, client: socket.socket, payload: bytes):
+        request_id, batch, cid, replayable = decode_requests(payload)
+        with tracer.span("IpcServer.requests", cid, count=len(batch)):
+            try:
+                results = tuple(self._controller.send_requests(batch, cid, replayable))
+            except Exception as e:
+                log.warning(f"Caught exception {e=} while sending requests. {traceback.format_exc()}")
+                results = (False,) * len(batch)
+
+        with self._write_lock:
+            send_frame(client, FrameKind.RESULTS, encode_results(request_id, results))
+
+    def _call(self, client: socket.socket, payload: bytes):
+        call_id, method, args = decode_call(payload)
+        try:
+            reply = encode_return(call_id, value=CALLS[method](self._controller, *args))
+        except Exception as e:
+            log.warning(f"Caught exception {e=} in IPC call {method}. {traceback.format_exc()}")
+            reply = encode_return(call_id, error=f"{type(e).__name__}: {e}")
+
+        try:
+            with self._write_lock:
+                send_frame(client, FrameKind.RETURN, reply)
+        except OSError:
+            pass  # The reader notices too, and drops the client.
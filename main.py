@@ -5,7 +5,9 @@ from pathlib import Path
 ABSOLUTE_PLUGIN_PATH = str(Path(__file__).parent.parent.absolute())
 sys.path.insert(0, ABSOLUTE_PLUGIN_PATH)
 
+import json
 import os
+import time
 
 from loguru import logger as log  # noqa: F401
 from src.backend.DeckManagement.InputIdentifier import Input
@@ -16,56 +18,100 @@ from src.backend.PluginManager.ActionInputSupport import ActionInputSupport
 from src.backend.PluginManager.PluginBase import PluginBase
 
 # Import actions
-from gg_kekemui_veadosc.actions import SetState, ToggleState
-from gg_kekemui_veadosc.controller.types import Request, VeadoController, VTInstance
+from gg_kekemui_veadosc.actions import (
+    CycleStates,
+    DumpDiagnostics,
+    LinkHealth,
+    PlaySequence,
+    SelectStateDial,
+    SetState,
+    ToggleState,
+)
+from gg_kekemui_veadosc.actions.render_scheduler import RenderScheduler
+from gg_kekemui_veadosc.constants import DEBUG_ENV
+from gg_kekemui_veadosc.controller.dispatcher import RequestCallback, RequestDispatcher
+from gg_kekemui_veadosc.controller.pending import REQUEST_TIMEOUT, PendingRequests, RequestFuture
+from gg_kekemui_veadosc.controller.types import (
+    ControllerConnectedEvent,
+    Request,
+    VeadoController,
+    VTInstance,
+    serialize_batch,
+)
 from gg_kekemui_veadosc.data import VeadoSCConnectionConfig
+from gg_kekemui_veadosc.diagnostics import Profiler, tracer, write_chrome_trace
+from gg_kekemui_veadosc.ipc import IpcClient, RemoteController, build_id, default_socket_path
 from gg_kekemui_veadosc.model import VeadoModel
 from gg_kekemui_veadosc.model.impl import VeadoModel_
+from gg_kekemui_veadosc.model.snapshot import SnapshotStore, save_on_exit
 from gg_kekemui_veadosc.observer import Event, Subject
 
-DEBUG_ENV = "VEADOSC_DEBUG"
-
 
 class VeadoSC(Subject, PluginBase):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.lm = self.locale_manager
+        tracer.process_name = "VeadoSC frontend"
 
-        debug_mode = DEBUG_ENV in os.environ
-
-        backend_path = os.path.join(self.PATH, "backend", "backend.py")
-        backend_venv = os.path.join(self.PATH, "backend", ".venv")
-        self.launch_backend(backend_path=backend_path, venv_path=backend_venv, open_in_terminal=debug_mode)
-
-        # The backend doesn't always launch within the 0.3 seconds afforded by
-        # PluginBase. Give ourselves a bit more time.
-        for i in range(10):
-            if not self.backend_connection:
-                self.wait_for_backend(10)
-            else:
-                break
-
-        if not self.backend_connection:
-            raise ValueError("Backend failed to launch after 10 seconds")
+        self.pending = PendingRequests()
+        self.ipc: IpcClient | None = self._adopt_backend()
+        if self.ipc:
+            self.controller: VeadoController = RemoteController(self.ipc, self.pending)
+        else:
+            self._launch_backend()
+            self.controller = self.backend.get_controller()
+            self.ipc = self._connect_ipc(self.backend.get_ipc_address())
+        self.request_dispatcher = RequestDispatcher(self.send_requests)
 
-        self.controller: VeadoController = self.backend.get_controller()
+        snapshot_store = SnapshotStore(os.path.join(self.PATH, "cache"))
+        model = VeadoModel_(self, self.controller, self.PATH, snapshot_store)
+        save_on_exit(model.save_snapshot)
+        self.model: VeadoModel = model
+        self.render_scheduler = RenderScheduler()
 
-        self.model: VeadoModel = VeadoModel_(self, self.controller, self.PATH)
+        self.profiler = Profiler(
+            "frontend",
+            gauges={
+                "request_queue": lambda: self.request_dispatcher.depth,
+                "render_dirty": lambda: self.render_scheduler.depth,
+                "thumbnail_bytes": self.model.thumbnail_bytes,
+                "backend_inbound_queue": lambda: dict(self.controller.get_queue_stats()),
+                "ipc_event_queue": lambda: self.ipc.event_stats() if self.ipc else {},
+                "observers": self.observer_stats,
+                "requests": self.pending.stats,
+            },
+        )
+        self.profiler.start()
 
         self._propagate_config(self.conn_conf, force=True)
 
-        for action in [SetState, ToggleState]:
+        key_support = {
+            Input.Key: ActionInputSupport.SUPPORTED,
+            Input.Dial: ActionInputSupport.UNTESTED,
+            Input.Touchscreen: ActionInputSupport.UNTESTED,
+        }
+        dial_support = {
+            Input.Key: ActionInputSupport.UNSUPPORTED,
+            Input.Dial: ActionInputSupport.SUPPORTED,
+            Input.Touchscreen: ActionInputSupport.UNTESTED,
+        }
+
+        for action, action_support in [
+            (SetState, key_support),
+            (ToggleState, key_support),
+            (CycleStates, key_support),
+            (PlaySequence, key_support),
+            (LinkHealth, key_support),
+            (SelectStateDial, dial_support),
+            (DumpDiagnostics, key_support),
+        ]:
             self.add_action_holder(
                 ActionHolder(
                     plugin_base=self,
                     action_base=action,
                     action_id=action.action_id,
                     action_name=self.locale_manager.get(action.action_id),
-                    action_support={
-                        Input.Key: ActionInputSupport.SUPPORTED,
-                        Input.Dial: ActionInputSupport.UNTESTED,
-                        Input.Touchscreen: ActionInputSupport.UNTESTED,
-                    },
+                    action_support=action_support,
                 )
             )
 
@@ -82,12 +128,124 @@ class VeadoSC(Subject, PluginBase):
         Provides proxying of events from the VeadoSC backend into this frontend.
         Should conform to the interface of `gg_kekemui_veadosc.observer.Observer`.
 
-        See ADR-01 for why this exists.
+        Events arrive over IPC, or RPyC if that's unavailable. See ADR-01 and ADR-02.
+        """
+        # Attribute access on a proxied event is itself an RPyC call; skip it unless tracing.
+        cid = event.correlation_id if tracer.enabled else None
+        with tracer.span("VeadoSC.update", cid):
+            self.notify(event)
+
+        # After observers, so that whoever waits on a request sees the model already updated.
+        if isinstance(event, ControllerConnectedEvent) and not event.is_connected:
+            self.pending.fail_all(ConnectionError("Disconnected from veadotube"))
+        else:
+            self.pending.resolve(event)
+
+    def _adopt_backend(self) -> IpcClient | None:
+        """
+        Attaches to a backend left running by a previous frontend (e.g., before
+        a plugin reload), along with its live veadotube connection. See ADR-03.
+
+        :returns: The IPC channel to it, or None if there is no backend running
+            the same code as this frontend.
+        """
+        path = default_socket_path()
+        if not os.path.exists(path):
+            return None
+
+        ipc = self._connect_ipc(path)
+        if ipc:
+            log.info("Adopted running backend")
+        return ipc
+
+    def _launch_backend(self):
+        debug_mode = DEBUG_ENV in os.environ
+
+        backend_path = os.path.join(self.PATH, "backend", "backend.py")
+        backend_venv = os.path.join(self.PATH, "backend", ".venv")
+        self.launch_backend(backend_path=backend_path, venv_path=backend_venv, open_in_terminal=debug_mode)
+
+        # The backend doesn't always launch within the 0.3 seconds afforded by
+        # PluginBase. Give ourselves a bit more time.
+        for i in range(10):
+            if not self.backend_connection:
+                self.wait_for_backend(10)
+            else:
+                break
+
+        if not self.backend_connection:
+            raise ValueError("Backend failed to launch after 10 seconds")
+
+    def _connect_ipc(self, path: str) -> IpcClient | None:
+        """
+        Opens the IPC channel used for requests and events (see ADR-02). If it
+        can't be opened, or the backend turns this frontend away, everything
+        keeps going over RPyC.
         """
-        self.notify(event)
+        try:
+            ipc = IpcClient(path, on_event=self.update)
+        except OSError as e:
+            log.warning(f"Unable to open IPC channel at {path}: {e=}")
+            return None
+
+        try:
+            welcome = ipc.handshake(build_id(), self.conn_conf.to_dict())
+        except ConnectionError as e:
+            log.warning(f"IPC handshake failed: {e=}")
+            ipc.close()
+            return None
+
+        if not welcome.accepted:
+            log.info(f"Backend turned this frontend away ({welcome.reason})")
+            ipc.close()
+            return None
+
+        log.info(f"IPC channel open, backend config {'unchanged' if welcome.config_matches else 'will change'}")
+        return ipc
 
     def send_request(self, request: Request) -> bool:
-        return self.controller.send_request(request)
+        return self.send_requests([request])[0]
+
+    def send_requests(self, batch: list[Request]) -> tuple[bool, ...]:
+        """
+        Sends several requests with a single call into the backend.
+
+        :returns: Per-request success, in order.
+        """
+        cid = next((r.correlation_id for r in batch if r.correlation_id), None)
+        with tracer.span("VeadoSC.send_requests", cid, count=len(batch)):
+            serialized = serialize_batch(batch)
+            replayable = tuple(r.replayable for r in batch)
+            if self.ipc and self.ipc.connected:
+                try:
+                    return self.ipc.send_requests(serialized, cid, replayable)
+                except ConnectionError:
+                    log.warning("IPC channel lost, falling back to RPyC")
+            return tuple(self.controller.send_requests(serialized, cid, replayable))
+
+    def request(self, request: Request, timeout: float = REQUEST_TIMEOUT) -> RequestFuture:
+        """
+        Sends a request and returns a future for veadotube's answer. See
+        `PendingRequests`.
+        """
+        return self.request_batch([request], timeout)[0]
+
+    def request_batch(self, batch: list[Request], timeout: float = REQUEST_TIMEOUT) -> list[RequestFuture]:
+        """
+        As `request`, sending the whole batch in one call.
+        """
+        return self.pending.send(batch, self.send_requests, timeout)
+
+    def send_request_async(self, request: Request, callback: RequestCallback | None = None):
+        """
+        Queues `request` for delivery without blocking the caller. Key handlers
+        should prefer this over `send_request`.
+
+        :param request: The request to send.
+        :param callback: Invoked once the request has been sent (True) or has
+            failed (False).
+        """
+        self.request_dispatcher.submit(request, callback)
 
     def propose_connection(self, instance: VTInstance | str):
         if not isinstance(instance, VTInstance):
@@ -101,6 +259,75 @@ class VeadoSC(Subject, PluginBase):
 
         self.controller.terminate_connection(instance)
 
+    def play_sequence(self, sequence_id: str, steps: list[tuple[str, float]], loop: bool = False) -> bool:
+        """
+        Starts a timed sequence in the backend. See `VeadoController.play_sequence`.
+        """
+        # A tuple of tuples crosses RPyC by value, so the backend never calls back for steps.
+        return self.controller.play_sequence(sequence_id, tuple((str(s), float(d)) for s, d in steps), loop)
+
+    def stop_sequence(self, sequence_id: str):
+        self.controller.stop_sequence(sequence_id)
+
+    def play_sequence_async(
+        self,
+        sequence_id: str,
+        steps: list[tuple[str, float]],
+        loop: bool = False,
+        callback: RequestCallback | None = None,
+    ):
+        """
+        As `play_sequence`, without blocking the caller; see `send_request_async`.
+        """
+        self.request_dispatcher.submit_call(lambda: self.play_sequence(sequence_id, steps, loop), callback)
+
+    def stop_sequence_async(self, sequence_id: str):
+        """
+        As `stop_sequence`, without blocking the caller.
+        """
+        self.request_dispatcher.submit_call(lambda: self.stop_sequence(sequence_id))
+
+    def dump_trace(self) -> str:
+        """
+        Writes frontend and backend spans to a Chrome trace file under the
+        plugin directory.
+
+        :returns: The path written to.
+        """
+        path = Path(self.PATH) / "traces" / f"trace-{time.strftime('%Y%m%d-%H%M%S')}.json"
+        backend_events = json.loads(self.controller.get_trace_events())
+        write_chrome_trace(path, tracer.export(), backend_events)
+        return str(path)
+
+    def observer_stats(self) -> dict[str, dict]:
+        """
+        :returns: Per-observer event handling times for the plugin (which
+            feeds the model) and the model (which feeds actions). See
+            `EventBus.stats`.
+        """
+        return {"plugin": self.bus.stats(), "model": self.model.bus.stats()}
+
+    def dump_observer_stats(self) -> str:
+        """
+        :returns: The path written to.
+        """
+        path = Path(self.PATH) / "journals" / f"observers-{time.strftime('%Y%m%d-%H%M%S')}.json"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.observer_stats(), indent=2))
+        return str(path)
+
+    def dump_diagnostics(self) -> list[str]:
+        """
+        Writes the backend journal, observer stats, and the trace if tracing
+        is enabled.
+
+        :returns: The paths written to.
+        """
+        paths = [self.controller.dump_journal(), self.dump_observer_stats()]
+        if tracer.enabled:
+            paths.append(self.dump_trace())
+        return paths
+
     @property
     def conn_conf(self) -> VeadoSCConnectionConfig:
         return VeadoSCConnectionConfig.from_dict(self.get_settings().get("connection", {}))
@@ -1,3 +1,3 @@
 from .abc import VeadoModel
-from .events import ActiveStateEvent, AllStatesEvent, ModelEvent, ThumbnailEvent
+from .events import ActiveStateEvent, AllStatesEvent, DegradedEvent, ModelEvent, ThumbnailEvent
 from .types import VeadoState
@@ -4,16 +4,41 @@ from gg_kekemui_veadosc.observer import Observer, Subject
 
 
 class VeadoModel(Subject, Observer, ABC):
+    event_budget = None
+    """Exempt: the model's own dispatch includes its observers, which are budgeted individually."""
 
     @property
     @abstractmethod
     def state_list(self) -> list[str]:
         pass
 
+    @property
+    @abstractmethod
+    def degraded(self) -> bool:
+        """
+        True if connected, but the link to veadotube is slow or unresponsive.
+        """
+        pass
+
+    @abstractmethod
+    def sequence_status(self, sequence_id: str) -> "SequenceEvent | None":  # noqa: F821
+        """
+        :returns: The latest progress of a running sequence, or None if it
+            isn't playing.
+        """
+        pass
+
     @abstractmethod
     def get_color_for_state(self, state_id: str) -> list[int]:
         pass
 
+    @abstractmethod
+    def thumbnail_bytes(self) -> int:
+        """
+        :returns: Approximate memory held by decoded thumbnails.
+        """
+        pass
+
     @abstractmethod
     def get_image_for_state(self, state_id: str) -> "PIL.ImageFile.ImageFile":  # noqa: F821
         pass
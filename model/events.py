@@ -39,3 +39,17 @@ class AllStatesEvent(ModelEvent):
     @property
     def event_name(self):
         return super().event_name() + "AllStatesEvent"
+
+
+@dataclass
+class DegradedEvent(ModelEvent):
+    """
+    Raised by the model when `VeadoModel.degraded` changes, so that keys whose
+    colour depends on it don't have to redraw on every `LinkQualityEvent`.
+    """
+
+    degraded: bool
+
+    @property
+    def event_name(self):
+        return super().event_name() + "DegradedEvent"
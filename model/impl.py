@@ -1,124 +1,320 @@
 import os
+import threading
 from collections import defaultdict
+from functools import cached_property
+from typing import TYPE_CHECKING, Callable, Sequence
 
 from loguru import logger as log
-from PIL.ImageFile import ImageFile
 
+from gg_kekemui_veadosc.controller.pending import RequestFuture, when_all
 from gg_kekemui_veadosc.controller.types import (
     ControllerConnectedEvent,
+    LinkQualityEvent,
     ListStateEventsRequest,
     PeekRequest,
+    SequenceEvent,
     ThumbnailRequest,
     VeadoController,
 )
+from gg_kekemui_veadosc.diagnostics import tracer
 from gg_kekemui_veadosc.model import (
     ActiveStateEvent,
     AllStatesEvent,
+    DegradedEvent,
     ThumbnailEvent,
     VeadoState,
 )
 from gg_kekemui_veadosc.model.abc import VeadoModel
+from gg_kekemui_veadosc.model.snapshot import ModelSnapshot, SnapshotStore
 from gg_kekemui_veadosc.model.utils import get_image_from_b64, get_image_from_path
-from gg_kekemui_veadosc.observer import Event
+from gg_kekemui_veadosc.observer import Event, TypeDispatch, event_class
+
+if TYPE_CHECKING:
+    from PIL.ImageFile import ImageFile
 
 BG_ACTIVE = [111, 202, 28, 255]
 BG_INACTIVE = [68, 100, 38, 255]
 BG_ERROR = [71, 0, 14, 255]
+BG_DEGRADED_ACTIVE = [214, 146, 0, 255]
+BG_DEGRADED_INACTIVE = [110, 80, 16, 255]
+BG_STALE_ACTIVE = [96, 120, 140, 255]
+BG_STALE_INACTIVE = [52, 62, 72, 255]
+
+SNAPSHOT_DELAY = 2
+BOOTSTRAP_TIMEOUT = 2
+BOOTSTRAP_ATTEMPTS = 3
 
 
 class VeadoModel_(VeadoModel):
-    def __init__(self, frontend, controller: VeadoController, base_path: str):
+    def __init__(
+        self, frontend, controller: VeadoController, base_path: str, snapshot_store: SnapshotStore | None = None
+    ):
+        """
+        :param base_path: The plugin root, for bundled assets.
+        :param snapshot_store: Where to persist the model between runs. Without
+            one, the model starts empty and saves nothing.
+        """
         super().__init__()
         self.states: dict[str, VeadoState] = defaultdict(lambda: VeadoState())
         self.active_state: str = ""
+        self.link_quality: LinkQualityEvent | None = None
+        self.veado_id: str = ""
+        self.sequences: dict[str, SequenceEvent] = {}
 
+        self.frontend = frontend
         self.controller: VeadoController = controller
+        self._bootstrap_lock = threading.Lock()
+        self._bootstrapping = False
+
+        self.base_path = base_path
 
-        self.disconnected_image = get_image_from_path(os.path.join(base_path, "assets", "ix-icons", "disconnected.png"))
-        self.not_found_image = get_image_from_path(os.path.join(base_path, "assets", "ix-icons", "missing-symbol.png"))
+        self.snapshot_store = snapshot_store
+        self._snapshot_timer: threading.Timer | None = None
+        self._unsaved_thumbnails: dict[str, str] = {}
+        """Thumbnails (by thumb hash) to write with the next snapshot."""
+        self._states_lock = threading.Lock()
+        """Held while changing `states`, so the snapshot timer sees them whole."""
+        self._restore_snapshot()
 
-        self.update_map = {
-            AllStatesEvent: self._list_update,
-            ActiveStateEvent: self._peek_update,
-            ThumbnailEvent: self._thumb_update,
-            ControllerConnectedEvent: self._connected_update,
-        }
+        self.update_map: TypeDispatch[Callable[[Event], None]] = TypeDispatch(
+            {
+                AllStatesEvent: self._list_update,
+                ActiveStateEvent: self._peek_update,
+                ThumbnailEvent: self._thumb_update,
+                ControllerConnectedEvent: self._connected_update,
+                LinkQualityEvent: self._link_quality_update,
+                SequenceEvent: self._sequence_update,
+            }
+        )
 
         # Use the frontend's proxied events
-        frontend.subscribe(self)
+        frontend.subscribe(self, *self.update_map.keys())
         self.connected: bool = controller.connected
         self.bootstrap()
 
     def update(self, event: Event):
-        update_impl = self._default_update
-        for event_type, handler in self.update_map.items():
-            if isinstance(event, event_type):
-                update_impl = handler
-                break
+        update_impl = self.update_map.lookup(event_class(event)) or self._default_update
 
-        update_impl(event)
-        self.notify(event)
+        with tracer.span("VeadoModel.update", event.correlation_id if tracer.enabled else None):
+            update_impl(event)
+            self.notify(event)
 
     @property
     def state_list(self) -> list[str]:
         return list(self.states.keys())
 
-    def bootstrap(self):
-        self.controller.send_request(ListStateEventsRequest())
-        self.controller.send_request(PeekRequest())
+    @property
+    def degraded(self) -> bool:
+        return bool(self.link_quality and self.link_quality.degraded)
+
+    def bootstrap(self, attempt: int = 1):
+        """
+        Asks veadotube for the state list and the active state, retrying up to
+        `BOOTSTRAP_ATTEMPTS` times if either goes unanswered. A no-op while a
+        bootstrap is already waiting on its answers.
+        """
+        with self._bootstrap_lock:
+            if self._bootstrapping:
+                return
+            self._bootstrapping = True
+
+        futures = self.frontend.request_batch([ListStateEventsRequest(), PeekRequest()], BOOTSTRAP_TIMEOUT)
+        when_all(futures, lambda futures: self._bootstrapped(futures, attempt))
+
+    def _bootstrapped(self, futures: Sequence[RequestFuture], attempt: int):
+        with self._bootstrap_lock:
+            self._bootstrapping = False
+
+        timed_out = [f.request_name for f in futures if not f.cancelled() and isinstance(f.exception(), TimeoutError)]
+        if not timed_out:
+            # Anything else failed with the connection, and reconnecting bootstraps again.
+            if not any(f.cancelled() or f.exception() for f in futures):
+                log.debug(f"Bootstrapped in {max(f.latency_ms for f in futures):.1f} ms")
+            return
+
+        if not self.connected:
+            return
+        if attempt >= BOOTSTRAP_ATTEMPTS:
+            log.warning(f"No answer to {', '.join(timed_out)} after {attempt} attempts")
+            return
+
+        log.info(f"No answer to {', '.join(timed_out)}, retrying")
+        self.bootstrap(attempt + 1)
 
     def get_color_for_state(self, state_id: str) -> list[int]:
-        if not self.connected or state_id not in self.states:
+        if state_id not in self.states:
             return BG_ERROR
+        elif not self.connected:
+            return BG_STALE_ACTIVE if state_id == self.active_state else BG_STALE_INACTIVE
         elif state_id == self.active_state:
-            return BG_ACTIVE
+            return BG_DEGRADED_ACTIVE if self.degraded else BG_ACTIVE
         else:
-            return BG_INACTIVE
+            return BG_DEGRADED_INACTIVE if self.degraded else BG_INACTIVE
 
-    def get_image_for_state(self, state_id: str) -> ImageFile:
-        if not self.connected:
-            return self.disconnected_image
+    @cached_property
+    def disconnected_image(self) -> "ImageFile":
+        return get_image_from_path(os.path.join(self.base_path, "assets", "ix-icons", "disconnected.png"))
+
+    @cached_property
+    def not_found_image(self) -> "ImageFile":
+        return get_image_from_path(os.path.join(self.base_path, "assets", "ix-icons", "missing-symbol.png"))
 
+    def get_image_for_state(self, state_id: str) -> "ImageFile":
         state = self.states.get(state_id)
         if state and state.thumbnail:
             return state.thumbnail
+        elif not self.connected:
+            return self.disconnected_image
         else:
             return self.not_found_image
 
+    def thumbnail_bytes(self) -> int:
+        total = 0
+        for state in list(self.states.values()):
+            if state.thumbnail:
+                total += state.thumbnail.width * state.thumbnail.height * len(state.thumbnail.getbands())
+        return total
+
+    def save_snapshot(self):
+        self._snapshot_timer = None
+        if not self.snapshot_store:
+            return
+
+        with self._states_lock:
+            snapshot = ModelSnapshot(
+                states=[
+                    {"id": s.state_id, "name": s.state_name or "", "thumb_hash": s.thumb_hash or ""}
+                    for s in self.states.values()
+                ],
+                active_state=self.active_state,
+                veado_id=self.veado_id,
+            )
+            thumbnails, self._unsaved_thumbnails = self._unsaved_thumbnails, {}
+
+        # Before the snapshot, which prunes thumbnails it doesn't reference.
+        for thumb_hash, b64 in thumbnails.items():
+            self.snapshot_store.save_thumbnail(thumb_hash, b64)
+        self.snapshot_store.save(snapshot)
+
+    def _schedule_snapshot(self):
+        """
+        Saves a snapshot shortly, so that bursts of updates are written once.
+        """
+        if self._snapshot_timer or not self.snapshot_store:
+            return
+
+        self._snapshot_timer = threading.Timer(SNAPSHOT_DELAY, self.save_snapshot)
+        self._snapshot_timer.daemon = True
+        self._snapshot_timer.start()
+
+    def _restore_snapshot(self):
+        """
+        Seeds the model from the last saved snapshot so keys can be drawn (in
+        their stale style) before veadotube is reachable. Live `list`/`peek`
+        data replaces it as it arrives.
+        """
+        snapshot = self.snapshot_store.load() if self.snapshot_store else None
+        if not snapshot:
+            return
+
+        for saved in snapshot.states:
+            vstate: VeadoState = self.states[saved["id"]]
+            vstate.state_id = saved["id"]
+            vstate.state_name = saved.get("name")
+            vstate.thumb_hash = saved.get("thumb_hash") or None
+
+            thumb_path = self.snapshot_store.thumbnail_path(vstate.thumb_hash or "")
+            if vstate.thumb_hash and thumb_path.exists():
+                try:
+                    vstate.thumbnail = get_image_from_path(str(thumb_path))
+                except OSError:
+                    pass
+
+        if snapshot.active_state in self.states:
+            self.states[snapshot.active_state].is_active = True
+            self.active_state = snapshot.active_state
+        self.veado_id = snapshot.veado_id
+
     def _list_update(self, event: AllStatesEvent):
-        current_keys = set(self.states.keys())
-        for state in event.states:
-            if state.state_id in current_keys:
-                current_keys.remove(state.state_id)
-            vstate: VeadoState = self.states[state.state_id]
-            vstate.state_id = state.state_id
-            vstate.state_name = state.state_name
-
-            if vstate.thumb_hash != state.thumb_hash:
-                vstate.thumbnail = None
-                vstate.thumb_hash = state.thumb_hash
-                self.controller.send_request(ThumbnailRequest(vstate.state_id))
-
-        for key in current_keys:  # Clean up deleted items
-            del self.states[key]
+        thumbnail_requests = []
+        with self._states_lock:
+            current_keys = set(self.states.keys())
+            for state in event.states:
+                if state.state_id in current_keys:
+                    current_keys.remove(state.state_id)
+                vstate: VeadoState = self.states[state.state_id]
+                vstate.state_id = state.state_id
+                vstate.state_name = state.state_name
+
+                # Thumbnails restored from a snapshot may be missing even when the hash matches.
+                if vstate.thumb_hash != state.thumb_hash or not vstate.thumbnail:
+                    vstate.thumbnail = None
+                    vstate.thumb_hash = state.thumb_hash
+                    thumbnail_requests.append(ThumbnailRequest(vstate.state_id))
+
+            for key in current_keys:  # Clean up deleted items
+                del self.states[key]
+
+        if thumbnail_requests:
+            # Through the frontend's request tracking, so thumbnail latency shows in its stats.
+            self.frontend.request_batch(thumbnail_requests)
+
+        self._schedule_snapshot()
 
     def _peek_update(self, event: ActiveStateEvent):
-        for state in self.states.values():
-            state.is_active = False
+        with self._states_lock:
+            for state in self.states.values():
+                state.is_active = False
+
+            self.states[event.state_id].is_active = True
+            self.active_state = event.state_id
 
-        self.states[event.state_id].is_active = True
-        self.active_state = event.state_id
+        self._schedule_snapshot()
 
     def _thumb_update(self, event: ThumbnailEvent):
-        state = self.states[event.state_id]
-        state.state_id = event.state_id
-        state.thumb_hash = event.thumb_hash
-        state.thumbnail = get_image_from_b64(event.thumb_b64_str)
+        thumbnail = get_image_from_b64(event.thumb_b64_str)
+        with self._states_lock:
+            state = self.states[event.state_id]
+            state.state_id = event.state_id
+            state.thumb_hash = event.thumb_hash
+            state.thumbnail = thumbnail
+            if self.snapshot_store:
+                self._unsaved_thumbnails[event.thumb_hash] = event.thumb_b64_str
+
+        # Written by the snapshot timer, off the dispatch thread.
+        self._schedule_snapshot()
 
     def _connected_update(self, event: ControllerConnectedEvent):
         self.connected = event.is_connected
+        self._set_link_quality(None)
         if self.connected:
+            if event.veado_id and self.veado_id and event.veado_id != self.veado_id:
+                # Restored from another instance's snapshot, or smart connect moved to another instance.
+                log.info(f"Connected to {event.veado_id}, discarding states from {self.veado_id}")
+                with self._states_lock:
+                    self.states.clear()
+                    self.active_state = ""
+            self.veado_id = event.veado_id
             self.bootstrap()
 
+    def _link_quality_update(self, event: LinkQualityEvent):
+        self._set_link_quality(event)
+
+    def _set_link_quality(self, quality: LinkQualityEvent | None):
+        # Samples arrive every few seconds; only `degraded` changes how states are drawn.
+        was_degraded = self.degraded
+        self.link_quality = quality
+        if self.degraded != was_degraded:
+            self.notify(DegradedEvent(self.degraded))
+
+    def _sequence_update(self, event: SequenceEvent):
+        if event.running:
+            self.sequences[event.sequence_id] = event
+        else:
+            self.sequences.pop(event.sequence_id, None)
+
+    def sequence_status(self, sequence_id: str) -> SequenceEvent | None:
+        return self.sequences.get(sequence_id)
+
     def _default_update(self, event: Event):
         log.warning(f"Received unknown Event type {event.event_name}: {event.__repr__()}")
@@ -0,0 +1,123 @@
+import atexit
+import json
+import os
+import re
+from base64 import b64decode
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable
+
+from loguru import logger as log
+
+SNAPSHOT_FILE = "snapshot.json"
+THUMBS_DIR = "thumbs"
+
+_exit_save: Callable[[], None] | None = None
+
+
+@dataclass
+class ModelSnapshot:
+    """
+    A compact, persisted copy of the model used to draw keys immediately on
+    startup, before the backend has connected to veadotube.
+    """
+
+    states: list[dict[str, str]] = field(default_factory=list)
+    active_state: str = ""
+    veado_id: str = ""
+
+    STATES = "states"
+    ACTIVE_STATE = "active_state"
+    VEADO_ID = "veado_id"
+
+    def to_dict(self) -> dict[str, Any]:
+        d = {}
+        d[self.STATES] = self.states
+        d[self.ACTIVE_STATE] = self.active_state
+        d[self.VEADO_ID] = self.veado_id
+
+        return d
+
+    @classmethod
+    def from_dict(cls, d: dict[str, Any]) -> "ModelSnapshot":
+        return ModelSnapshot(
+            states=[s for s in d.get(cls.STATES, []) if s.get("id")],
+            active_state=d.get(cls.ACTIVE_STATE, ""),
+            veado_id=d.get(cls.VEADO_ID, ""),
+        )
+
+
+class SnapshotStore:
+    """
+    Reads and writes `ModelSnapshot`s and cached thumbnails under `cache_dir`.
+    Thumbnails are keyed by veadotube's thumb hash, so an unchanged state never
+    needs its thumbnail written twice.
+    """
+
+    def __init__(self, cache_dir: str):
+        self.cache_dir = Path(cache_dir)
+        self.snapshot_path = self.cache_dir / SNAPSHOT_FILE
+        self.thumbs_dir = self.cache_dir / THUMBS_DIR
+
+    def load(self) -> ModelSnapshot | None:
+        try:
+            return ModelSnapshot.from_dict(json.loads(self.snapshot_path.read_text()))
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, AttributeError) as e:
+            log.warning(f"Ignoring unreadable snapshot {self.snapshot_path}: {e}")
+            return None
+
+    def save(self, snapshot: ModelSnapshot):
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            self._write_atomic(self.snapshot_path, json.dumps(snapshot.to_dict()).encode())
+            self._prune_thumbnails({s.get("thumb_hash") for s in snapshot.states})
+        except OSError as e:
+            log.warning(f"Unable to save snapshot to {self.snapshot_path}: {e}")
+
+    def thumbnail_path(self, thumb_hash: str) -> Path:
+        return self.thumbs_dir / f"{re.sub(r'[^A-Za-z0-9_-]', '_', thumb_hash)}.png"
+
+    def save_thumbnail(self, thumb_hash: str, b64: str):
+        path = self.thumbnail_path(thumb_hash)
+        if path.exists():
+            return
+
+        try:
+            self.thumbs_dir.mkdir(parents=True, exist_ok=True)
+            self._write_atomic(path, b64decode(b64))
+        except (OSError, ValueError) as e:
+            log.warning(f"Unable to cache thumbnail {path}: {e}")
+
+    def _prune_thumbnails(self, keep: set[str]):
+        if not self.thumbs_dir.exists():
+            return
+
+        keep_paths = {self.thumbnail_path(h) for h in keep if h}
+        for path in self.thumbs_dir.iterdir():
+            if path not in keep_paths:
+                path.unlink(missing_ok=True)
+
+    @staticmethod
+    def _write_atomic(path: Path, data: bytes):
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+
+
+def save_on_exit(save: Callable[[], None]):
+    """
+    Calls `save` when the process exits. Only the latest `save` is kept: each
+    plugin reload builds a new model, and its snapshot must be the one left on
+    disk, not whichever stale model's handler happened to run last.
+    """
+    global _exit_save
+    if _exit_save is None:
+        atexit.register(_save_on_exit)
+    _exit_save = save
+
+
+def _save_on_exit():
+    if _exit_save:
+        _exit_save()
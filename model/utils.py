@@ -1,13 +1,21 @@
 from base64 import b64decode
 from io import BytesIO
+from typing import TYPE_CHECKING
 
-from PIL import Image, ImageFile
+if TYPE_CHECKING:
+    from PIL.ImageFile import ImageFile
 
+# PIL is imported on first use; it's only needed once there's an image to show.
+
+
+def get_image_from_b64(b64: str) -> "ImageFile":
+    from PIL import Image
 
-def get_image_from_b64(b64: str) -> ImageFile.ImageFile:
     image_bytes = b64decode(b64)
     return Image.open(BytesIO(image_bytes))
 
 
-def get_image_from_path(path: str) -> ImageFile.ImageFile:
+def get_image_from_path(path: str) -> "ImageFile":
+    from PIL import Image
+
     return Image.open(path)
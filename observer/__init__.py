@@ -1,2 +1,4 @@
+from .bus import EventBus, TypeDispatch, event_class
 from .event import Event
 from .observer import Observer, Subject
+from .stats import ObserverStats
@@ -0,0 +1,183 @@
+import threading
+import time
+import traceback
+from typing import Callable, Generic, TypeVar
+
+from loguru import logger as log
+
+from .event import Event
+from .stats import EVENT_BUDGET, ObserverStats
+
+T = TypeVar("T")
+Callback = Callable[[Event], None]
+
+
+def event_class(event: Event) -> type:
+    """
+    The event's class. For an RPyC proxy, this is the local class it proxies
+    (when importable), where `type()` would give the proxy class instead.
+    """
+    return event.__class__
+
+
+class TypeDispatch(Generic[T]):
+    """
+    Maps event types to a value (typically a handler), resolving subclasses to
+    their nearest registered base. Resolution walks the MRO once per concrete
+    class; after that a lookup is a single dict hit.
+    """
+
+    def __init__(self, entries: dict[type, T] | None = None):
+        self._entries: dict[type, T] = dict(entries or {})
+        self._cache: dict[type, T | None] = {}
+
+    def __setitem__(self, event_type: type, value: T):
+        self._entries[event_type] = value
+        self._cache.clear()
+
+    def keys(self) -> tuple[type, ...]:
+        return tuple(self._entries)
+
+    def lookup(self, cls: type) -> T | None:
+        try:
+            return self._cache[cls]
+        except KeyError:
+            pass
+
+        value = next((self._entries[klass] for klass in cls.__mro__ if klass in self._entries), None)
+        self._cache[cls] = value
+        return value
+
+
+class EventBus:
+    """
+    Delivers each event only to observers subscribed to its type (or a base of
+    it), so dispatch cost scales with the number of interested observers
+    rather than with every observer.
+
+    The observers for each concrete event class are resolved once and cached;
+    the cache is dropped whenever subscriptions change, which is rare compared
+    to publishing.
+
+    Every delivery is timed (see `ObserverStats`). An observer that runs over
+    its budget is warned about, and one that keeps failing or running over is
+    quarantined: unsubscribed, so it can't keep slowing events for everyone
+    else.
+    """
+
+    def __init__(self):
+        self._subscriptions: dict[type, dict[str, Callback]] = {}
+        self._cache: dict[type, tuple[tuple[ObserverStats, Callback], ...]] = {}
+        self._lock = threading.Lock()
+        self._stats: dict[str, ObserverStats] = {}
+        self._quarantined: dict[str, ObserverStats] = {}
+
+    def subscribe(
+        self,
+        observer_id: str,
+        callback: Callback,
+        *event_types: type,
+        name: str | None = None,
+        budget: float | None = EVENT_BUDGET,
+    ):
+        """
+        :param observer_id: Identifies the subscriber for `unsubscribe`.
+        :param callback: Called with each matching event.
+        :param event_types: Event classes of interest, including subclasses.
+            If none are given, the subscriber receives every `Event`.
+        :param name: Identifies the subscriber in stats and logs. Defaults to
+            `observer_id`.
+        :param budget: Seconds the callback may take per event. None exempts
+            it from warnings and quarantine.
+        """
+        with self._lock:
+            for event_type in event_types or (Event,):
+                self._subscriptions.setdefault(event_type, {})[observer_id] = callback
+            if observer_id not in self._stats:
+                self._stats[observer_id] = ObserverStats(observer_id, name or observer_id, budget)
+            self._quarantined.pop(observer_id, None)
+            self._cache.clear()
+
+    def unsubscribe(self, observer_id: str, *event_types: type):
+        """
+        :param event_types: Event classes to stop receiving. If none are
+            given, removes every subscription held by `observer_id`.
+        """
+        with self._lock:
+            for event_type in event_types or tuple(self._subscriptions):
+                subscribers = self._subscriptions.get(event_type)
+                if subscribers is not None:
+                    subscribers.pop(observer_id, None)
+                    if not subscribers:
+                        del self._subscriptions[event_type]
+            if not any(observer_id in subscribers for subscribers in self._subscriptions.values()):
+                self._stats.pop(observer_id, None)
+            self._cache.clear()
+
+    def subscribers(self, cls: type) -> tuple[tuple[ObserverStats, Callback], ...]:
+        """
+        :returns: The stats and callback of each observer interested in events
+            of class `cls`. An observer subscribed to several of its bases is
+            only included once.
+        """
+        try:
+            return self._cache[cls]
+        except KeyError:
+            pass
+
+        with self._lock:
+            callbacks: dict[str, Callback] = {}
+            for klass in cls.__mro__:
+                for observer_id, callback in self._subscriptions.get(klass, {}).items():
+                    callbacks.setdefault(observer_id, callback)
+            resolved = tuple((self._stats[observer_id], callback) for observer_id, callback in callbacks.items())
+            self._cache[cls] = resolved
+        return resolved
+
+    def publish(self, event: Event):
+        for stats, callback in self.subscribers(event_class(event)):
+            if stats.quarantined:
+                continue
+
+            failed = False
+            start = time.perf_counter()
+            try:
+                callback(event)
+            except Exception as e:
+                failed = True
+                log.warning(
+                    f"Caught exception {e=} from {stats.name} while dispatching updates. "
+                    f"Full details: {traceback.format_exc()}"
+                )
+            elapsed = time.perf_counter() - start
+
+            if stats.record(elapsed, failed):
+                if not failed:
+                    log.warning(
+                        f"{stats.name} took {elapsed * 1000:.1f} ms to handle {event_class(event).__name__} "
+                        f"(budget {stats.budget * 1000:.0f} ms)"
+                    )
+                if stats.should_quarantine:
+                    self._quarantine(stats)
+
+    def stats(self) -> dict[str, dict]:
+        """
+        :returns: Per-observer timings keyed by observer id, including
+            quarantined observers.
+        """
+        with self._lock:
+            everyone = {**self._stats, **self._quarantined}
+        return {observer_id: stats.as_dict() for observer_id, stats in everyone.items()}
+
+    def _quarantine(self, stats: ObserverStats):
+        if stats.quarantined:
+            return
+
+        stats.quarantined = True
+        self.unsubscribe(stats.observer_id)
+        with self._lock:
+            self._quarantined[stats.observer_id] = stats
+        log.error(
+            f"Quarantined {stats.name} ({stats.observer_id}) after {stats.strikes} consecutive failed or slow updates; "
+            f"it will receive no further events. {stats.as_dict()}"
+        )
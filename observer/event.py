@@ -2,6 +2,13 @@ from abc import ABC, abstractmethod
 
 
 class Event(ABC):
+    correlation_id = None
+    """Set by the backend when tracing is enabled. See `gg_kekemui_veadosc.diagnostics`."""
+    received_at: float | None = None
+    """
+    For events read from veadotube, the backend's `time.monotonic()` when the
+    frame arrived. The clock is shared across processes.
+    """
 
     @property
     @abstractmethod
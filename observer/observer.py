@@ -1,13 +1,17 @@
-import traceback
 from abc import ABC, abstractmethod
 from uuid import uuid4
 
 from loguru import logger as log
 
+from .bus import EventBus
 from .event import Event
+from .stats import EVENT_BUDGET
 
 
 class Observer(ABC):
+    event_budget: float | None = EVENT_BUDGET
+    """Seconds `update` may take per event. See `EventBus`."""
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.observer_id = str(uuid4())
@@ -20,24 +24,29 @@ class Observer(ABC):
 class Subject(ABC):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self.observers: dict[str, callable] = {}
+        self.bus = EventBus()
 
-    def subscribe(self, observer: Observer):
+    def subscribe(self, observer: Observer, *event_types: type[Event]):
+        """
+        :param event_types: Only deliver events of these types (or their
+            subclasses). Defaults to every event.
+        """
         if hasattr(observer, "observer_id"):
-            self.observers[observer.observer_id] = observer.update
+            self.bus.subscribe(
+                observer.observer_id,
+                observer.update,
+                *event_types,
+                name=type(observer).__name__,
+                budget=getattr(observer, "event_budget", EVENT_BUDGET),
+            )
         else:
             log.error(f"{observer=} does not have an observer_id. {observer.__repr__()}")
 
-    def unsubscribe(self, observer: Observer):
-        try:
-            del self.observers[observer.observer_id]
-        except KeyError:
-            pass
+    def unsubscribe(self, observer: Observer, *event_types: type[Event]):
+        """
+        :param event_types: Types to stop receiving. Defaults to all of them.
+        """
+        self.bus.unsubscribe(observer.observer_id, *event_types)
 
     def notify(self, event: Event):
-        for observer in list(self.observers.values()):
-            try:
-                # TODO - Should we do an instance-wide threadpool here?
-                observer(event)
-            except Exception as e:
-                log.warning(f"Caught exception {e=} while dispatching updates. Full details: {traceback.format_exc()}")
+        self.bus.publish(event)
@@ -0,0 +1,82 @@
+from typing import Any
+
+EVENT_BUDGET = 0.02
+"""Seconds an observer may spend handling one event before it is warned about."""
+
+QUARANTINE_STRIKES = 5
+"""Consecutive failures or overruns after which an observer is unsubscribed."""
+
+
+class ObserverStats:
+    """
+    Running timings for one subscriber to an `EventBus`.
+
+    A strike is an event that raised or ran over `budget`; a clean event
+    clears them, so only an observer that keeps misbehaving is quarantined.
+    """
+
+    __slots__ = (
+        "observer_id",
+        "name",
+        "budget",
+        "calls",
+        "failures",
+        "overruns",
+        "total_time",
+        "max_time",
+        "strikes",
+        "quarantined",
+    )
+
+    def __init__(self, observer_id: str, name: str, budget: float | None = EVENT_BUDGET):
+        """
+        :param budget: Seconds allowed per event. None exempts the observer
+            from overrun warnings and quarantine; it is still timed.
+        """
+        self.observer_id = observer_id
+        self.name = name
+        self.budget = budget
+        self.calls = 0
+        self.failures = 0
+        self.overruns = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+        self.strikes = 0
+        self.quarantined = False
+
+    def record(self, elapsed: float, failed: bool) -> bool:
+        """
+        :returns: True if this event was a strike.
+        """
+        self.calls += 1
+        self.total_time += elapsed
+        if elapsed > self.max_time:
+            self.max_time = elapsed
+
+        overran = self.budget is not None and elapsed > self.budget
+        if failed:
+            self.failures += 1
+        if overran:
+            self.overruns += 1
+
+        if (failed or overran) and self.budget is not None:
+            self.strikes += 1
+            return True
+
+        self.strikes = 0
+        return False
+
+    @property
+    def should_quarantine(self) -> bool:
+        return self.strikes >= QUARANTINE_STRIKES
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "name": self.name,
+            "calls": self.calls,
+            "failures": self.failures,
+            "overruns": self.overruns,
+            "mean_ms": round(self.total_time / self.calls * 1000, 3) if self.calls else 0.0,
+            "max_ms": round(self.max_time * 1000, 3),
+            "quarantined": self.quarantined,
+        }
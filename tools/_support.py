@@ -0,0 +1,146 @@
+"""
+Shared setup for the developer tools in this directory.
+
+The plugin is normally imported by StreamController as `gg_kekemui_veadosc`
+from its plugins directory. These helpers make that import work from any
+checkout, and stand in for the pieces of StreamController the plugin touches
+so that tools can exercise real plugin code without a running app.
+"""
+
+import sys
+import types
+from pathlib import Path
+
+PLUGIN_ROOT = Path(__file__).parent.parent.absolute()
+PACKAGE_NAME = "gg_kekemui_veadosc"
+
+
+def install_plugin_package():
+    """
+    Makes `import gg_kekemui_veadosc` resolve to this checkout, regardless of
+    the directory name it was cloned into.
+    """
+    if PACKAGE_NAME in sys.modules:
+        return
+
+    package = types.ModuleType(PACKAGE_NAME)
+    package.__path__ = [str(PLUGIN_ROOT)]
+    sys.modules[PACKAGE_NAME] = package
+
+
+class RecordingInput:
+    def __init__(self):
+        self.updates = 0
+
+    def update(self):
+        self.updates += 1
+
+
+class RecordingActionBase:
+    """
+    Stand-in for `src.backend.PluginManager.ActionBase.ActionBase`. Rendering
+    methods record what they were called with instead of touching a deck.
+    """
+
+    def __init__(self, *args, plugin_base=None, **kwargs):
+        super().__init__()
+        self.plugin_base = plugin_base
+        self.on_ready_called = False
+        self.settings = {}
+        self.input = RecordingInput()
+        self.calls: dict[str, int] = {}
+
+    def _record(self, name: str):
+        self.calls[name] = self.calls.get(name, 0) + 1
+
+    def get_settings(self):
+        return self.settings
+
+    def set_settings(self, settings):
+        self.settings = settings
+
+    def get_input(self):
+        return self.input
+
+    def set_media(self, *args, **kwargs):
+        self._record("set_media")
+
+    def set_background_color(self, *args, **kwargs):
+        self._record("set_background_color")
+
+    def set_top_label(self, *args, **kwargs):
+        self._record("set_top_label")
+
+    def set_center_label(self, *args, **kwargs):
+        self._record("set_center_label")
+
+    def set_bottom_label(self, *args, **kwargs):
+        self._record("set_bottom_label")
+
+    def show_error(self, *args, **kwargs):
+        self._record("show_error")
+
+    def event_callback(self, event, data=None):
+        self._record(f"event_callback:{event}")
+
+
+class _Placeholder:
+    """Answers any attribute lookup, enough for annotations on GTK types."""
+
+    def __getattr__(self, name):
+        return self
+
+
+class RecordingLocaleManager:
+    def get(self, key: str) -> str:
+        return key
+
+
+def _module(name: str, **attrs) -> types.ModuleType:
+    module = types.ModuleType(name)
+    module.__dict__.update(attrs)
+    sys.modules[name] = module
+    return module
+
+
+class _InputEvents:
+    def __init__(self, *names: str):
+        for name in names:
+            setattr(self, name, name)
+
+
+class RecordingInput_:
+    """Stand-in for `src.backend.DeckManagement.InputIdentifier.Input`."""
+
+    class Key:
+        Events = _InputEvents("DOWN", "UP", "SHORT_UP", "HOLD_START", "HOLD_STOP")
+
+    class Dial:
+        Events = _InputEvents("DOWN", "UP", "SHORT_UP", "HOLD_START", "HOLD_STOP", "TURN_CW", "TURN_CCW")
+
+    class Touchscreen:
+        Events = _InputEvents("DRAG_LEFT", "DRAG_RIGHT")
+
+
+def install_streamcontroller_stubs(gtk: bool = True):
+    """
+    Registers stand-ins for the StreamController modules imported by the
+    frontend. GTK is only stubbed if it isn't importable (e.g., headless CI).
+
+    :param gtk: Set to False to leave GTK alone entirely, e.g., to check that
+        nothing imports it.
+    """
+    for name in ("src", "src.backend", "src.backend.PluginManager", "src.backend.DeckManagement"):
+        _module(name)
+    _module("src.backend.PluginManager.ActionBase", ActionBase=RecordingActionBase)
+    _module("src.backend.DeckManagement.InputIdentifier", Input=RecordingInput_)
+
+    if not gtk:
+        return
+
+    try:
+        import gi  # noqa: F401
+    except ImportError:
+        placeholder = _Placeholder()
+        repository = _module("gi.repository", Adw=placeholder, Gio=placeholder, Gtk=placeholder, GLib=placeholder)
+        _module("gi", require_version=lambda *args: None, repository=repository)
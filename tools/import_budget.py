@@ -0,0 +1,126 @@
+"""
+Checks how long the plugin's frontend modules take to import.
+
+StreamController imports every plugin at startup, so anything imported at
+module load is paid by every user on every launch, whether or not they ever
+press a key. This runs a fresh interpreter with `-X importtime`, imports the
+plugin modules that `main.py` imports at load time (read from `main.py`
+itself, so the list can't drift), with StreamController stubbed out, and fails if
+the total goes over budget, or if a module that should only be loaded on first
+use (GTK, PIL) was imported eagerly.
+
+Import times are noisy, so the best of several runs is used.
+
+Usage:
+    python tools/import_budget.py [--budget-ms 60] [--runs 5] [--top 15]
+"""
+
+import argparse
+import ast
+import subprocess
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from _support import PACKAGE_NAME, PLUGIN_ROOT  # noqa: E402
+
+
+def frontend_modules() -> list[str]:
+    """
+    :returns: The plugin modules imported at the top level of `main.py`, in
+        order.
+    """
+    tree = ast.parse((PLUGIN_ROOT / "main.py").read_text())
+    modules = []
+    for node in tree.body:
+        if isinstance(node, ast.ImportFrom) and node.module:
+            names = [node.module]
+        elif isinstance(node, ast.Import):
+            names = [alias.name for alias in node.names]
+        else:
+            continue
+        modules += [name for name in names if name.split(".")[0] == PACKAGE_NAME and name not in modules]
+    return modules
+
+
+FRONTEND_MODULES = frontend_modules()
+HOST_MODULES = ["loguru"]
+"""Already imported by StreamController itself, so free for the plugin."""
+DEFERRED_MODULES = ["gi", "PIL"]
+"""Top-level packages that must not be imported until first use."""
+
+DEFAULT_BUDGET_MS = 60
+MARKER = "-- import budget start --"
+
+CHILD_SCRIPT = f"""
+import sys
+sys.path.insert(0, {str(Path(__file__).parent)!r})
+from _support import install_plugin_package, install_streamcontroller_stubs
+install_plugin_package()
+install_streamcontroller_stubs(gtk=False)
+for name in {HOST_MODULES!r}:
+    __import__(name)
+sys.stderr.write({MARKER!r} + "\\n")
+sys.stderr.flush()
+for name in {FRONTEND_MODULES!r}:
+    __import__(name)
+"""
+
+
+def measure() -> list[tuple[int, int, str]]:
+    """
+    :returns: (self us, cumulative us, module) per module imported, with the
+        module name indented by nesting depth, as printed by `-X importtime`.
+    """
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", CHILD_SCRIPT], capture_output=True, text=True, check=False
+    )
+    if proc.returncode != 0:
+        sys.exit(f"Import failed:\n{proc.stderr[-2000:]}")
+
+    _, _, output = proc.stderr.partition(MARKER)
+    rows = []
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line.removeprefix("import time:").split("|")
+        try:
+            rows.append((int(fields[0]), int(fields[1]), fields[2].rstrip()))
+        except ValueError:
+            continue  # Header line.
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS, help="maximum total import time")
+    parser.add_argument("--runs", type=int, default=5, help="runs to take the best of")
+    parser.add_argument("--top", type=int, default=15, help="number of slowest modules to list")
+    args = parser.parse_args()
+
+    runs = [measure() for _ in range(args.runs)]
+    best = min(runs, key=lambda rows: sum(row[0] for row in rows))
+    total_ms = sum(row[0] for row in best) / 1000
+
+    print(f"{'self ms':>8} {'cumul ms':>9}  module")
+    for self_us, cumulative_us, name in sorted(best, key=lambda row: row[0], reverse=True)[: args.top]:
+        print(f"{self_us / 1000:>8.2f} {cumulative_us / 1000:>9.2f}  {name.strip()}")
+    print(f"\nTotal: {total_ms:.1f} ms across {len(best)} modules")
+    print(f"Budget: {args.budget_ms:.0f} ms, best of {args.runs} runs")
+
+    failures = []
+    imported = {name.strip().split(".")[0] for _, _, name in best}
+    for module in DEFERRED_MODULES:
+        if module in imported:
+            failures.append(f"{module} was imported at load time; it should be imported on first use")
+    if total_ms > args.budget_ms:
+        failures.append(f"import time {total_ms:.1f} ms is over the {args.budget_ms:.0f} ms budget")
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
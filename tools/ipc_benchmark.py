@@ -0,0 +1,197 @@
+"""
+Compares the RPyC and IPC paths between frontend and backend (see ADR-02).
+
+Starts a stand-in backend in a subprocess that serves both RPyC and the IPC
+socket, backed by a controller that accepts every request without touching a
+network. Then measures, for each path:
+
+  - request latency: one single-request batch per round trip, as a key press
+    sends via `VeadoSC.send_requests`;
+  - event throughput: the backend pushing `SequenceEvent`s to the frontend,
+    which reads a field from each, as the model does. The event type is never
+    coalesced, so every event crosses the channel and is delivered; anything
+    the frontend's inbound queue did coalesce is reported separately and not
+    counted as delivered.
+
+Usage:
+    python tools/ipc_benchmark.py [--requests 2000] [--events 5000]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from _support import install_plugin_package  # noqa: E402
+
+install_plugin_package()
+
+import rpyc  # noqa: E402
+from rpyc.utils.server import ThreadedServer  # noqa: E402
+
+from gg_kekemui_veadosc.controller.types import SequenceEvent, SetActiveStateRequest, serialize_batch  # noqa: E402
+from gg_kekemui_veadosc.ipc import IpcClient, IpcServer  # noqa: E402
+
+RPYC_CONFIG = {"allow_public_attrs": True, "sync_request_timeout": 30}
+BUILD = "benchmark"
+
+
+class AcceptingController:
+    config = None
+
+    def send_requests(self, batch, correlation_id=None, replayable=None) -> tuple[bool, ...]:
+        return (True,) * len(batch)
+
+
+class BackendService(rpyc.Service):
+    def __init__(self, ipc: IpcServer):
+        super().__init__()
+        self.controller = AcceptingController()
+        self.ipc = ipc
+
+    def on_connect(self, conn):
+        self._conn = conn
+
+    def exposed_send_requests(self, batch, correlation_id=None, replayable=None):
+        return self.controller.send_requests(batch, correlation_id, replayable)
+
+    def exposed_push_rpyc_events(self, count: int):
+        # As `VeadoController_.notify` does without IPC.
+        frontend = self._conn.root
+        for i in range(count):
+            frontend.update(SequenceEvent(sequence_id=f"sequence-{i}", running=True))
+
+    def exposed_push_ipc_events(self, count: int):
+        for i in range(count):
+            self.ipc.publish(SequenceEvent(sequence_id=f"sequence-{i}", running=True))
+
+
+def serve(path: str):
+    ipc = IpcServer(AcceptingController(), BUILD, path)
+    server = ThreadedServer(BackendService(ipc), port=0, protocol_config=RPYC_CONFIG)
+    print(server.port, flush=True)
+    server.start()
+
+
+class EventCounter:
+    def __init__(self, expected: int):
+        self.expected = expected
+        self.received = 0
+        self.done = threading.Event()
+
+    def update(self, event):
+        _ = event.sequence_id
+        self.received += 1
+        if self.received >= self.expected:
+            self.done.set()
+
+
+class FrontendService(rpyc.Service):
+    def __init__(self):
+        super().__init__()
+        self.counter: EventCounter | None = None
+
+    def exposed_update(self, event):
+        self.counter.update(event)
+
+
+def latencies(send, count: int) -> list[float]:
+    batch = serialize_batch([SetActiveStateRequest("state-1")])
+    results = []
+    for _ in range(count):
+        start = time.perf_counter()
+        send(batch)
+        results.append(time.perf_counter() - start)
+    return results
+
+
+def report_latency(name: str, samples: list[float]):
+    samples = sorted(samples)
+    print(
+        f"{name:<6} request  mean {statistics.fmean(samples) * 1e6:>8.1f} us   "
+        f"p50 {samples[len(samples) // 2] * 1e6:>8.1f} us   p99 {samples[int(len(samples) * 0.99)] * 1e6:>8.1f} us"
+    )
+
+
+def report_events(name: str, delivered: int, elapsed: float, coalesced: int = 0):
+    print(
+        f"{name:<6} events   {delivered / elapsed:>10.0f} events/s   {elapsed / delivered * 1e6:>8.1f} us/event"
+        f"   {delivered:>6} delivered   {coalesced:>6} coalesced"
+    )
+
+
+def wait_for(predicate, timeout: float) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.0005)
+    return False
+
+
+def run(request_count: int, event_count: int):
+    path = os.path.join(tempfile.gettempdir(), f"veadosc-ipc-benchmark-{os.getpid()}.sock")
+    child = subprocess.Popen(
+        [sys.executable, __file__, "--serve", path], stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True
+    )
+    try:
+        port = int(child.stdout.readline())
+        frontend = FrontendService()
+        conn = rpyc.connect("localhost", port, service=frontend, config=RPYC_CONFIG)
+        rpyc.BgServingThread(conn)
+        counter = EventCounter(event_count)
+        ipc = IpcClient(path, on_event=counter.update)
+        ipc.handshake(BUILD, {})
+
+        # Warm up both paths before measuring.
+        latencies(lambda b: conn.root.send_requests(b, None, (True,)), 100)
+        latencies(lambda b: ipc.send_requests(b, None, (True,)), 100)
+
+        report_latency("rpyc", latencies(lambda b: conn.root.send_requests(b, None, (True,)), request_count))
+        report_latency("ipc", latencies(lambda b: ipc.send_requests(b, None, (True,)), request_count))
+
+        frontend.counter = EventCounter(event_count)
+        start = time.perf_counter()
+        conn.root.push_rpyc_events(event_count)
+        frontend.counter.done.wait(60)
+        report_events("rpyc", frontend.counter.received, time.perf_counter() - start)
+
+        start = time.perf_counter()
+        conn.root.push_ipc_events(event_count)
+        wait_for(lambda: counter.received + ipc.event_stats()["coalesced"] >= event_count, 60)
+        report_events("ipc", counter.received, time.perf_counter() - start, ipc.event_stats()["coalesced"])
+
+        ipc.close()
+        conn.close()
+    finally:
+        child.terminate()
+        child.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000, help="request round trips per path")
+    parser.add_argument("--events", type=int, default=5000, help="events pushed per path")
+    parser.add_argument("--serve", metavar="SOCKET", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    from loguru import logger
+
+    logger.remove()
+    logger.add(sys.stderr, level="ERROR")
+
+    if args.serve:
+        serve(args.serve)
+    else:
+        run(args.requests, args.events)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,229 @@
+"""
+Measures how model event fan-out scales with the number of subscribed actions.
+
+Creates N `SetState`/`ToggleState` actions on top of recording stand-ins for
+StreamController's `ActionBase`, subscribes them to a real `VeadoModel_`, and
+replays event streams through it. For each N, reports per-event fan-out
+latency, render requests and draws per event, and bytes allocated per event.
+
+Every pass starts from an empty snapshot cache in a temporary directory, so
+runs neither warm-start from each other nor touch the plugin's own cache.
+
+Usage:
+    python tools/scale_harness.py [--sizes 1 10 100 1000] [--states 50]
+"""
+
+import argparse
+import base64
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from io import BytesIO
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from _support import (  # noqa: E402
+    PLUGIN_ROOT,
+    RecordingLocaleManager,
+    install_plugin_package,
+    install_streamcontroller_stubs,
+)
+
+install_plugin_package()
+install_streamcontroller_stubs()
+
+from PIL import Image  # noqa: E402
+
+from gg_kekemui_veadosc.actions import SetState, ToggleState  # noqa: E402
+from gg_kekemui_veadosc.controller.pending import REQUEST_TIMEOUT, PendingRequests  # noqa: E402
+from gg_kekemui_veadosc.controller.types import ControllerConnectedEvent, LinkQualityEvent  # noqa: E402
+from gg_kekemui_veadosc.model import ActiveStateEvent, AllStatesEvent, ThumbnailEvent  # noqa: E402
+from gg_kekemui_veadosc.model.impl import VeadoModel_  # noqa: E402
+from gg_kekemui_veadosc.model.snapshot import SnapshotStore  # noqa: E402
+from gg_kekemui_veadosc.model.types import StateDetail  # noqa: E402
+from gg_kekemui_veadosc.observer import Event, Subject  # noqa: E402
+
+DEFAULT_SIZES = [1, 10, 100, 1000]
+
+
+class RecordingController:
+    connected = True
+
+    def __init__(self):
+        self.requests = 0
+
+    def send_request(self, request) -> bool:
+        self.requests += 1
+        return True
+
+    def send_requests(self, batch, correlation_id=None, replayable=None) -> tuple[bool, ...]:
+        self.requests += len(batch)
+        return (True,) * len(batch)
+
+
+class RecordingScheduler:
+    """
+    Synchronous stand-in for `RenderScheduler`; the harness flushes explicitly
+    after every event so that draws can be attributed to the event.
+    """
+
+    def __init__(self):
+        self.dirty = {}
+        self.marks = 0
+
+    def mark_dirty(self, action):
+        self.marks += 1
+        self.dirty[action.observer_id] = action
+
+    def discard(self, action):
+        self.dirty.pop(action.observer_id, None)
+
+    def flush(self) -> int:
+        dirty, self.dirty = list(self.dirty.values()), {}
+        for action in dirty:
+            action.draw()
+        for action in dirty:
+            action.get_input().update()
+        return len(dirty)
+
+
+class HarnessFrontend(Subject):
+    def __init__(self):
+        super().__init__()
+        self.locale_manager = RecordingLocaleManager()
+        self.controller = RecordingController()
+        self.pending = PendingRequests()
+        self.render_scheduler = RecordingScheduler()
+        self.cache = tempfile.TemporaryDirectory(prefix="veadosc-harness-")
+        self.model = VeadoModel_(self, self.controller, str(PLUGIN_ROOT), SnapshotStore(self.cache.name))
+
+    def close(self):
+        # A pending snapshot would otherwise recreate the cache directory once it's gone.
+        if timer := self.model._snapshot_timer:
+            timer.cancel()
+        self.pending.close()
+        self.cache.cleanup()
+
+    def send_request_async(self, request, callback=None):
+        if callback:
+            callback(self.controller.send_request(request))
+
+    def request_batch(self, batch, timeout=REQUEST_TIMEOUT):
+        return self.pending.send(batch, self.controller.send_requests, timeout)
+
+    def notify(self, event: Event):
+        super().notify(event)
+        self.pending.resolve(event)
+
+
+def make_thumbnail_b64() -> str:
+    buffer = BytesIO()
+    Image.new("RGBA", (64, 64), (255, 0, 255, 255)).save(buffer, format="PNG")
+    return base64.b64encode(buffer.getvalue()).decode()
+
+
+def make_streams(state_count: int) -> dict[str, list[Event]]:
+    state_ids = [f"state-{i}" for i in range(state_count)]
+    details = [StateDetail({"id": s, "name": s, "thumbHash": f"hash-{s}"}) for s in state_ids]
+    thumb = make_thumbnail_b64()
+
+    return {
+        "bootstrap": [
+            ControllerConnectedEvent(True),
+            AllStatesEvent(states=details),
+            ActiveStateEvent(state_id=state_ids[0]),
+            *[ThumbnailEvent(state_id=s, thumb_hash=f"hash-{s}", thumb_b64_str=thumb) for s in state_ids],
+        ],
+        "presses": [ActiveStateEvent(state_id=state_ids[i % state_count]) for i in range(200)],
+        "flapping": [ControllerConnectedEvent(i % 2 == 1) for i in range(20)],
+        # Periodic samples; only the two where `degraded` flips change how states are drawn.
+        "link": [LinkQualityEvent(10.0, 1.0, 100.0, degraded=10 <= i < 15) for i in range(20)],
+    }
+
+
+def make_actions(frontend: HarnessFrontend, count: int, state_count: int) -> list:
+    actions = []
+    for i in range(count):
+        clazz = SetState if i % 2 == 0 else ToggleState
+        action = clazz(plugin_base=frontend)
+        action.settings = {"state_id": f"state-{i % state_count}"}
+        action.on_ready_called = True
+        action.on_ready()
+        actions.append(action)
+    frontend.render_scheduler.flush()
+    return actions
+
+
+def replay(frontend: HarnessFrontend, events: list[Event], trace_allocations: bool) -> dict[str, float]:
+    scheduler = frontend.render_scheduler
+    latencies = []
+    draws = 0
+    marks_before = scheduler.marks
+
+    if trace_allocations:
+        tracemalloc.start()
+        tracemalloc.reset_peak()
+    for event in events:
+        start = time.perf_counter()
+        frontend.notify(event)
+        latencies.append(time.perf_counter() - start)
+        draws += scheduler.flush()
+    if trace_allocations:
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    result = {
+        "mean_us": statistics.fmean(latencies) * 1e6,
+        "p95_us": sorted(latencies)[int(len(latencies) * 0.95)] * 1e6,
+        "renders": (scheduler.marks - marks_before) / len(events),
+        "draws": draws / len(events),
+    }
+    if trace_allocations:
+        result["peak_kib"] = peak / 1024
+    return result
+
+
+def run(sizes: list[int], state_count: int):
+    streams = make_streams(state_count)
+
+    print(f"{'N':>6} {'stream':<10} {'mean us':>10} {'p95 us':>10} {'renders/ev':>11} {'draws/ev':>9} {'peak KiB':>9}")
+    for size in sizes:
+        for name, events in streams.items():
+            # Timing and allocation tracing are separate passes, as tracemalloc
+            # skews timing considerably.
+            frontend = HarnessFrontend()
+            make_actions(frontend, size, state_count)
+            timing = replay(frontend, events, trace_allocations=False)
+            frontend.close()
+
+            frontend = HarnessFrontend()
+            make_actions(frontend, size, state_count)
+            allocations = replay(frontend, events, trace_allocations=True)
+            frontend.close()
+
+            print(
+                f"{size:>6} {name:<10} {timing['mean_us']:>10.1f} {timing['p95_us']:>10.1f} "
+                f"{timing['renders']:>11.2f} {timing['draws']:>9.2f} {allocations['peak_kib']:>9.1f}"
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="action counts to simulate")
+    parser.add_argument("--states", type=int, default=50, help="number of veadotube states")
+    args = parser.parse_args()
+
+    # Keep the per-event warnings from drowning out the report.
+    from loguru import logger
+
+    logger.remove()
+    logger.add(sys.stderr, level="ERROR")
+
+    run(args.sizes, args.states)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,291 @@
+"""
+Soak test for thread, file descriptor and memory leaks in the backend controller.
+
+Starts a fake veadotube server in a subprocess, then drives a real
+`VeadoController_` through thousands of connection lifecycles against it,
+round-robin:
+
+  - config: switch between two equivalent direct-connect configs, which
+    restarts the connection via a handover;
+  - edits: several config switches back to back, as when editing settings;
+  - reconnect: terminate the connection, then propose it again;
+  - drop: cut the socket under the connection (as `LinkMonitor` does for a
+    stale link) and let it reconnect;
+  - smart: every `--smart-every` cycles, switch to smart connect against an
+    instance file, which starts the watchdog poller and probes.
+
+After each cycle it waits for the controller to reconnect. Threads, open file
+descriptors and RSS are sampled as it goes; once warmed up, each must stay
+within a fixed allowance of its baseline. Threads are only counted once the
+connection has settled: no probes or handovers in flight, and no retired
+websocket threads still winding down. Finally the controller is shut down
+and the thread and fd counts must return to where they were before it started.
+
+Linux only (reads /proc). Exits non-zero if anything grew out of bounds.
+
+Usage:
+    python tools/soak.py [--cycles 2000] [--smart-every 100] [--sample-every 100]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from _support import install_plugin_package  # noqa: E402
+
+install_plugin_package()
+
+from gg_kekemui_veadosc.controller.impl import (  # noqa: E402
+    HANDOVER_THREAD_NAME,
+    REPROBE_THREAD_NAME,
+    WS_THREAD_NAME,
+    VeadoController_,
+)
+from gg_kekemui_veadosc.controller.probe import PROBE_THREAD_NAME  # noqa: E402
+from gg_kekemui_veadosc.controller.watchdog import FS_THREAD_NAME  # noqa: E402
+from gg_kekemui_veadosc.data import VeadoSCConnectionConfig  # noqa: E402
+
+TRANSIENT_THREAD_NAMES = (PROBE_THREAD_NAME, HANDOVER_THREAD_NAME, REPROBE_THREAD_NAME)
+"""Threads that only run while a connection is being (re)established."""
+THREAD_ALLOWANCE = 1
+"""
+Threads above baseline tolerated once settled: the smart connect cycle's
+filesystem poller, which may or may not be running at the baseline.
+"""
+FD_ALLOWANCE = 12
+RSS_ALLOWANCE_MIB = 16
+WARMUP_FRACTION = 0.1
+EDIT_BURST = 3
+CONNECT_TIMEOUT = 15
+SETTLE_TIMEOUT = 10
+
+FAKE_VEADOTUBE = """
+import json, sys
+from websockets.sync.server import serve
+
+STATES = [{"id": f"s{i}", "name": f"S{i}", "thumbHash": f"h{i}"} for i in range(3)]
+
+
+def wrap(payload):
+    return "nodes:" + json.dumps(
+        {"event": "payload", "type": "stateEvents", "id": "mini", "name": "avatar state", "payload": payload}
+    )
+
+
+def handler(ws):
+    for message in ws:
+        payload = json.loads(message.split(":", 1)[1])["payload"]
+        if payload["event"] == "list":
+            ws.send(wrap({"event": "list", "states": STATES}))
+        elif payload["event"] == "peek":
+            ws.send(wrap({"event": "peek", "state": "s0"}))
+
+
+with serve(handler, "localhost", 0) as server:
+    print(server.socket.getsockname()[1], flush=True)
+    server.serve_forever()
+"""
+
+
+class NullFrontend:
+    def __init__(self):
+        self.events = Counter()
+
+    def update(self, event):
+        self.events[type(event).__name__] += 1
+
+
+def thread_names() -> Counter:
+    return Counter(t.name for t in threading.enumerate())
+
+
+def open_fds() -> int:
+    return len(os.listdir("/proc/self/fd"))
+
+
+def rss_mib() -> float:
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+
+
+def sample() -> dict:
+    return {"threads": threading.active_count(), "fds": open_fds(), "rss_mib": round(rss_mib(), 1)}
+
+
+def settled() -> bool:
+    names = thread_names()
+    if any(names[name] for name in TRANSIENT_THREAD_NAMES):
+        return False
+    return names[WS_THREAD_NAME] <= 1 and names[FS_THREAD_NAME] <= 1
+
+
+def wait_for(predicate, timeout: float) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.005)
+    return False
+
+
+class Soak:
+    def __init__(self, port: int, instances_dir: Path):
+        self.direct = [
+            VeadoSCConnectionConfig(smart_connect=False, hostname=host, port=port)
+            for host in ("localhost", "127.0.0.1")
+        ]
+        self.smart = VeadoSCConnectionConfig(smart_connect=True, instances_dir=instances_dir)
+        self.controller = VeadoController_(NullFrontend())
+        self.config_index = 0
+        self.failures = Counter()
+
+    def _use(self, config: VeadoSCConnectionConfig):
+        self.controller.set_config(config)
+
+    def _current_direct(self) -> VeadoSCConnectionConfig:
+        return self.direct[self.config_index % len(self.direct)]
+
+    def config(self):
+        self.config_index += 1
+        self._use(self._current_direct())
+
+    def edits(self):
+        for _ in range(EDIT_BURST):
+            self.config()
+
+    def reconnect(self):
+        controller = self.controller
+        if controller.config.smart_connect:
+            self._use(self._current_direct())
+            return
+        instance = controller._direct_instance()
+        controller.terminate_connection(instance)
+        controller.propose_connection(instance)
+
+    def drop(self):
+        conn = self.controller._conn
+        if conn:
+            conn.force_reconnect()
+            # Wait for the drop to land, so the reconnect below is a real one.
+            wait_for(lambda: not conn.connected, SETTLE_TIMEOUT)
+
+    def smart_connect(self):
+        self._use(self.smart)
+
+    def run_cycle(self, name: str):
+        getattr(self, name)()
+        if not wait_for(lambda: self.controller.connected, CONNECT_TIMEOUT):
+            self.failures[name] += 1
+
+
+def check(name: str, value: float, limit: float) -> bool:
+    ok = value <= limit
+    print(f"  {'ok  ' if ok else 'FAIL'} {name:<22} {value:>8} (limit {limit})")
+    return ok
+
+
+def run(cycles: int, smart_every: int, sample_every: int) -> bool:
+    server = subprocess.Popen(
+        [sys.executable, "-c", FAKE_VEADOTUBE], stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True
+    )
+    try:
+        port = int(server.stdout.readline())
+        with tempfile.TemporaryDirectory() as tmp:
+            instances_dir = Path(tmp) / "instances"
+            instances_dir.mkdir()
+            (instances_dir / "mini-soak").write_text(json.dumps({"id": "soak", "server": f"localhost:{port}"}))
+            return _soak(port, instances_dir, cycles, smart_every, sample_every)
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def _soak(port: int, instances_dir: Path, cycles: int, smart_every: int, sample_every: int) -> bool:
+    before = sample()
+    before_names = thread_names()
+
+    soak = Soak(port, instances_dir)
+    soak.config()
+    if not wait_for(lambda: soak.controller.connected, CONNECT_TIMEOUT):
+        print("Unable to connect to the fake veadotube server")
+        return False
+
+    routine = ["config", "edits", "reconnect", "drop"]
+    warmup = max(1, int(cycles * WARMUP_FRACTION))
+    baseline: dict | None = None
+    peak = {"threads": 0, "fds": 0, "rss_mib": 0.0}
+
+    print(f"{'cycle':>7} {'threads':>8} {'fds':>6} {'rss MiB':>8} {'elapsed s':>10}")
+    start = time.monotonic()
+    for cycle in range(1, cycles + 1):
+        if smart_every and cycle % smart_every == 0:
+            soak.run_cycle("smart_connect")
+        else:
+            soak.run_cycle(routine[cycle % len(routine)])
+
+        if cycle == warmup:
+            wait_for(settled, SETTLE_TIMEOUT)
+            baseline = sample()
+        if cycle % sample_every == 0 or cycle == cycles:
+            # Anything that hasn't wound down by now is counted as a leak.
+            wait_for(settled, SETTLE_TIMEOUT)
+            now = sample()
+            print(
+                f"{cycle:>7} {now['threads']:>8} {now['fds']:>6} {now['rss_mib']:>8} {time.monotonic() - start:>10.1f}"
+            )
+            if baseline:
+                peak = {k: max(peak[k], now[k]) for k in peak}
+
+    baseline = baseline or sample()
+    print(f"\nFailed reconnects: {dict(soak.failures) or 'none'}")
+    print(f"Events delivered: {dict(soak.controller.frontend.events)}")
+
+    print(f"\nAfter warm-up (baseline {baseline}):")
+    ok = all(
+        [
+            check("threads", peak["threads"], baseline["threads"] + THREAD_ALLOWANCE),
+            check("fds", peak["fds"], baseline["fds"] + FD_ALLOWANCE),
+            check("rss MiB", peak["rss_mib"], round(baseline["rss_mib"] + RSS_ALLOWANCE_MIB, 1)),
+            check("failed reconnects", sum(soak.failures.values()), cycles // 100),
+        ]
+    )
+
+    soak.controller.shutdown()
+    wait_for(lambda: threading.active_count() <= before["threads"], SETTLE_TIMEOUT)
+    after = sample()
+    print(f"\nAfter shutdown (before start {before}):")
+    ok = check("threads", after["threads"], before["threads"]) and ok
+    ok = check("fds", after["fds"], before["fds"]) and ok
+
+    leftover = thread_names() - before_names
+    if leftover:
+        print(f"  Threads still running: {dict(leftover)}")
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cycles", type=int, default=2000, help="connection lifecycles to run")
+    parser.add_argument("--smart-every", type=int, default=100, help="run a smart connect cycle this often (0: never)")
+    parser.add_argument("--sample-every", type=int, default=100, help="print resource usage this often")
+    args = parser.parse_args()
+
+    from loguru import logger
+
+    logger.remove()
+    logger.add(sys.stderr, level="ERROR")
+
+    sys.exit(0 if run(args.cycles, args.smart_every, args.sample_every) else 1)
+
+
+if __name__ == "__main__":
+    main()